@@ -0,0 +1,167 @@
+#* ===== REAJUSTE CERRADO DE LA CAPA DE SALIDA (ESTILO ELM) =====
+#* Cuando cambia el dataset (tiempo.py regenera recursos.csv) o llega un lote
+#* de correcciones, re-entrenar con backprop todas las capas es lento.
+#* Este reajuste congela las capas ocultas y calcula la capa de salida de una
+#* sola vez, sin épocas:
+#*   - H: activaciones de la última capa oculta para todo el dataset (N x h),
+#*     con una columna de unos para el sesgo
+#*   - T: logits objetivo, la inversa de la activación de salida aplicada a Y
+#*     (recortada a [eps, 1 - eps]: un one-hot exacto daría logits infinitos)
+#*   - Mínimos cuadrados regularizados (ridge) sobre los logits:
+#*       (HᵀH + λI) β = HᵀT,   W = βᵀ sin la última fila,  b = última fila
+#*     El sesgo no se regulariza.
+#* El sistema es de (h+1) x (h+1): con NumPy se resuelve con linalg.solve;
+#* sin NumPy con eliminación gaussiana en Python (h es pequeño).
+#* Sirve igual con el buffer de aprendizaje_online: reajustar_salida(mlp, buffer.X, buffer.Y)
+#*
+#* Ejecutar: python ajuste_cerrado.py [modelo] [regularizacion]
+
+import os
+import sys
+import math
+import time
+from activaciones import activar
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def activaciones_ocultas(mlp, X):
+    #! Salida de la última capa oculta para cada muestra de X
+    #! Con el backend numpy retorna una matriz (N x h); si no, listas
+    if mlp.backend == "numpy":
+        return mlp._propagar_np(np.asarray(X, dtype=float))[-2]
+    H = []
+    for x in X:
+        entrada = x
+        for W, b, nombre in zip(mlp.pesos[:-1], mlp.sesgos[:-1], mlp.activaciones[:-1]):
+            z = [sum(w * xi for w, xi in zip(fila, entrada)) + bi for fila, bi in zip(W, b)]
+            entrada = activar(nombre, z)
+        H.append(entrada)
+    return H
+
+
+def _logit_objetivo(nombre, y, eps):
+    #! Valor que debe tener el logit para que la activación `nombre` dé `y`
+    if nombre == 'softmax':
+        #! softmax(log p) = p normalizada; el desplazamiento común lo absorbe el sesgo
+        return math.log(max(y, eps))
+    if nombre == 'sigmoid':
+        p = min(max(y, eps), 1 - eps)
+        return math.log(p / (1 - p))
+    if nombre == 'tanh':
+        return math.atanh(min(max(y, -1 + eps), 1 - eps))
+    return y
+
+
+def logits_objetivo(Y, activacion, eps=0.01):
+    #! Logits objetivo (listas) para las salidas deseadas Y
+    return [[_logit_objetivo(activacion, y, eps) for y in fila] for fila in Y]
+
+
+def _resolver(A, B):
+    #! Resuelve A·X = B (A: n x n, B: n x m) por eliminación gaussiana con pivoteo parcial
+    #! Trabaja sobre copias; retorna X como lista de filas
+    n = len(A)
+    M = [list(fila_a) + list(fila_b) for fila_a, fila_b in zip(A, B)]
+    for c in range(n):
+        pivote = max(range(c, n), key=lambda f: abs(M[f][c]))
+        M[c], M[pivote] = M[pivote], M[c]
+        fila_c = M[c]
+        inverso = 1.0 / fila_c[c]
+        for f in range(c + 1, n):
+            factor = M[f][c] * inverso
+            if factor != 0.0:
+                M[f] = [v - factor * u for v, u in zip(M[f], fila_c)]
+    X = [None] * n
+    for c in range(n - 1, -1, -1):
+        fila_c = M[c]
+        X[c] = [(fila_c[n + j] - sum(fila_c[k] * X[k][j] for k in range(c + 1, n))) / fila_c[c]
+                for j in range(len(fila_c) - n)]
+    return X
+
+
+def _ridge_python(H, T, regularizacion):
+    h = len(H[0])
+    Ha = [list(fila) + [1.0] for fila in H]
+    columnas = list(zip(*Ha))
+    #! HᵀH es simétrica: se calcula media matriz y se copia la otra
+    A = [[0.0] * (h + 1) for _ in range(h + 1)]
+    for i in range(h + 1):
+        for j in range(i, h + 1):
+            A[i][j] = A[j][i] = sum(u * v for u, v in zip(columnas[i], columnas[j]))
+        if i < h:
+            A[i][i] += regularizacion
+    columnas_t = list(zip(*T))
+    B = [[sum(u * v for u, v in zip(columnas[i], t)) for t in columnas_t] for i in range(h + 1)]
+    beta = _resolver(A, B)
+    W = [list(fila) for fila in zip(*beta[:h])]
+    return W, beta[h]
+
+
+def _ridge_np(H, T, regularizacion):
+    Ha = np.hstack([H, np.ones((len(H), 1))])
+    A = Ha.T @ Ha
+    diagonal = np.full(A.shape[0], float(regularizacion))
+    diagonal[-1] = 0.0
+    A[np.diag_indices_from(A)] += diagonal
+    beta = np.linalg.solve(A, Ha.T @ T)
+    return beta[:-1].T.copy(), beta[-1].copy()
+
+
+def reajustar_salida(mlp, X, Y, regularizacion=1e-3, eps=0.01):
+    #! Recalcula en el sitio los pesos y sesgos de la capa de salida de `mlp`
+    #! a partir de X, Y (salidas deseadas, p. ej. one-hot); las capas ocultas no cambian
+    #! regularizacion: λ de ridge (más alto = pesos más pequeños, menos sobreajuste)
+    #! Retorna el error cuadrático medio del ajuste de los logits
+    T = logits_objetivo(Y, mlp.activaciones[-1], eps)
+    H = activaciones_ocultas(mlp, X)
+    if mlp.backend == "numpy":
+        T = np.asarray(T, dtype=float)
+        W, b = _ridge_np(H, T, regularizacion)
+        error = float(np.mean((H @ W.T + b - T) ** 2))
+    else:
+        W, b = _ridge_python(H, T, regularizacion)
+        error = sum((sum(w * v for w, v in zip(fila, h)) + bi - t) ** 2
+                    for h, fila_t in zip(H, T)
+                    for fila, bi, t in zip(W, b, fila_t)) / (len(T) * len(b))
+    mlp.pesos[-1], mlp.sesgos[-1] = W, b
+    return error
+
+
+if __name__ == "__main__":
+    #! Uso: python ajuste_cerrado.py [modelo] [regularizacion]
+    #! Reajusta la capa de salida del modelo de producción con el recursos.csv actual
+    from mlp import MLP, BACKEND_PREFERIDO
+    from entrenamiento_combinado import load_data_combinado, parametros_normalizacion, one_hot
+    from entrenador import accuracy
+
+    modelo = sys.argv[1] if len(sys.argv) > 1 else ("modelo_mlp.mlpb" if os.path.exists("modelo_mlp.mlpb")
+                                                    else "modelo_mlp.json")
+    regularizacion = float(sys.argv[2]) if len(sys.argv) > 2 else 1e-3
+
+    X, Y_idx = load_data_combinado()
+    Y = [one_hot(i, 4) for i in Y_idx]
+
+    mlp = MLP.cargar(modelo, backend=BACKEND_PREFERIDO)
+    if mlp is None:
+        #! MLP.cargar ya mostró el motivo (archivo inexistente, corrupto, un ensemble...)
+        print(f"No se pudo cargar el modelo '{modelo}'; entrénalo primero con main.py")
+        sys.exit(1)
+    #! La capa de salida se ajusta en la misma escala con la que el modelo predice:
+    #! la normalización guardada, no la del recursos.csv regenerado
+    #! (los modelos anteriores a guardarla la toman del CSV actual, como main.py)
+    if mlp.normalizacion is None:
+        mlp.normalizacion = parametros_normalizacion(X)
+    X = [mlp.normalizar_entrada(x) for x in X]
+    print(f"\nAccuracy antes del reajuste: {accuracy(mlp, X, Y):.2%}")
+    inicio = time.perf_counter()
+    error = reajustar_salida(mlp, X, Y, regularizacion)
+    tiempo = time.perf_counter() - inicio
+    print(f"Reajuste de la capa de salida ({' -> '.join(map(str, mlp.capas[-2:]))}) en {tiempo * 1000:.1f} ms "
+          f"| error de los logits {error:.4f}")
+    print(f"Accuracy después del reajuste: {accuracy(mlp, X, Y):.2%}")
+    mlp.guardar(modelo)
+    print(f"Modelo guardado en '{modelo}'")
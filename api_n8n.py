@@ -10,39 +10,77 @@ como N8N puedan analizar algoritmos sin necesidad de Python
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from analizador import analizar_codigo
-from entrenamiento import load_data, normalize, one_hot, mapeo
-from mlp import MLP
+from entrenamiento_combinado import load_data_combinado, normalize, parametros_normalizacion, one_hot, mapeo, mapeo_inv
+from mlp import MLP, BACKEND_PREFERIDO
+from modelo_compartido import ModeloCompartido
+from entrenador import entrenar_con_parada_temprana
+from planificadores_lr import buscar_lr, CosenoLR
+from aprendizaje_online import BufferRepeticion, CorrectorOnline
 
 app = Flask(__name__)
 CORS(app)
 
 #* Variable global para almacenar la red neuronal entrenada
 #* Se carga una sola vez al iniciar la aplicación
+#* Es un ModeloCompartido: muchas peticiones pueden predecir a la vez
+#* mientras una corrección se entrena en segundo plano sobre una copia
 mlp_global = None
+#* Corrector online: mezcla cada corrección con muestras pasadas del buffer
+#* Solo lo usa el hilo de actualizaciones de ModeloCompartido (uno a la vez)
+corrector_global = None
 
 
 def entrenar_mlp():
     #! Función de inicialización: entrena el MLP una sola vez
     #! Esto evita entrenar en cada request (muy lento)
-    global mlp_global
+    global mlp_global, corrector_global
     print("Cargando y normalizando datos...")
-    X, Y_idx = load_data()
+    #! Mismas características extraídas del código que usa /analizar
+    X, Y_idx = load_data_combinado()
+    normalizacion = parametros_normalizacion(X)
     X = normalize(X)
     n_outputs = len(set(Y_idx))
     Y = [one_hot(i, n_outputs) for i in Y_idx]
     
     print("Entrenando MLP...")
-    mlp_global = MLP(n_inputs=8, n_hidden=16, n_outputs=n_outputs, lr=0.1)
-    epochs = 5000
-    
-    for e in range(epochs):
-        loss = mlp_global.train_epoch(X, Y)
-        if e % 500 == 0:
-            print(f"  Epoch {e:5d} - Loss {loss:.8f}")
+    mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=n_outputs, lr=0.05, backend=BACKEND_PREFERIDO,
+              optimizador="adam", perdida="entropia_cruzada")
+    mlp.etiquetas = [mapeo_inv[i] for i in range(n_outputs)]
+    #! Viaja con el modelo: /analizar y /corregir normalizan igual que el entrenamiento
+    mlp.normalizacion = normalizacion
+    mlp.lr = buscar_lr(mlp, X, Y)[0]
+    print(f"  Learning rate sugerido: {mlp.lr:.4f}")
+    resultado = entrenar_con_parada_temprana(
+        mlp, X, Y,
+        max_epochs=2000,
+        batch_size=16,
+        shuffle=True,
+        paciencia=20,
+        min_delta=1e-5,
+        tiempo_max=60,
+        planificador=CosenoLR(mlp.lr, epocas=300, lr_min=mlp.lr / 100)
+    )
+    print(f"  {resultado['epocas']} épocas ({resultado['motivo']}) - Loss {resultado['loss']:.8f}")
     
+    mlp_global = ModeloCompartido(mlp)
+    buffer = BufferRepeticion(capacidad=1000)
+    buffer.agregar_lote(X, Y)
+    corrector_global = CorrectorOnline(buffer, max_pasos=50, margen=0.2, tamano_lote=16)
     print(" MLP entrenado correctamente\n")
 
 
+def corregir_muestra(caracteristicas, idx_correcto):
+    #! Retorna la función de entrenamiento que aplica una corrección
+    #! ModeloCompartido la ejecuta sobre una copia, nunca sobre el modelo en uso
+    #! `caracteristicas` llegan crudas: se normalizan como el buffer y el entrenamiento
+    y_correcto = one_hot(idx_correcto, mlp_global.mlp.n_outputs)
+    
+    def entrenar(mlp):
+        corrector_global.corregir(mlp, mlp.normalizar_entrada(caracteristicas), y_correcto)
+    
+    return entrenar
+
+
 @app.route('/', methods=['GET'])
 def inicio():
     #! Endpoint raíz: retorna información sobre el API
@@ -54,7 +92,8 @@ def inicio():
         'endpoints': {
             'GET /': 'Esta información',
             'GET /salud': 'Health check',
-            'POST /analizar': 'Analizar complejidad de código'
+            'POST /analizar': 'Analizar complejidad de código',
+            'POST /corregir': 'Corregir la MLP con la complejidad correcta (en segundo plano)'
         }
     }), 200
 
@@ -66,7 +105,8 @@ def salud():
     return jsonify({
         'estado': 'OK',
         'servicio': 'Analizador de Complejidad',
-        'mlp_cargado': mlp_global is not None
+        'mlp_cargado': mlp_global is not None,
+        'version_modelo': mlp_global.version if mlp_global is not None else None
     }), 200
 
 
@@ -92,6 +132,14 @@ def analizar():
         #! Ejecutar análisis estático del código
         resultado = analizar_codigo(codigo)
         
+        #! Predicción de la MLP: inferencia sin estado, segura entre hilos
+        #! (ModeloCompartido normaliza las características crudas)
+        prediccion_mlp = None
+        confianza_mlp = None
+        if mlp_global is not None:
+            idx, confianza_mlp = mlp_global.predict_confianza(resultado['caracteristicas_mlp'])
+            prediccion_mlp = mapeo_inv[idx]
+        
         #! Retornar respuesta exitosa con los resultados
         return jsonify({
             'exito': True,
@@ -100,6 +148,8 @@ def analizar():
             'recursion': resultado['recursion'],
             'operaciones': resultado['operaciones'],
             'complejidad': resultado['complejidad'],
+            'prediccion_mlp': prediccion_mlp,
+            'confianza_mlp': confianza_mlp,
             'mensaje': f"La complejidad es {resultado['complejidad']}"
         }), 200
     
@@ -112,6 +162,49 @@ def analizar():
         }), 500
 
 
+@app.route('/corregir', methods=['POST'])
+def corregir():
+    #! Endpoint de corrección: re-entrena la MLP con la complejidad correcta
+    #! Responde de inmediato; el entrenamiento corre en segundo plano
+    #* Request esperado: {"codigo": "<código Python>", "complejidad": "O(n)"}
+    try:
+        data = request.json
+        codigo = data.get('codigo', '').strip()
+        complejidad = data.get('complejidad', '').strip()
+        if not codigo or complejidad not in mapeo:
+            return jsonify({
+                'exito': False,
+                'error': 'Datos inválidos',
+                'mensaje': f"Se requiere 'codigo' y 'complejidad' en {list(mapeo)}"
+            }), 400
+        
+        if mlp_global is None:
+            return jsonify({
+                'exito': False,
+                'error': 'MLP no cargado',
+                'mensaje': 'El modelo aún no está disponible'
+            }), 503
+        
+        if codigo.startswith('\ufeff'):
+            codigo = codigo[1:]
+        
+        caracteristicas = analizar_codigo(codigo)['caracteristicas_mlp']
+        mlp_global.actualizar_en_segundo_plano(corregir_muestra(caracteristicas, mapeo[complejidad]))
+        
+        return jsonify({
+            'exito': True,
+            'version_actual': mlp_global.version,
+            'mensaje': 'Corrección en curso; las predicciones usan el modelo actual hasta que termine'
+        }), 202
+    
+    except Exception as e:
+        return jsonify({
+            'exito': False,
+            'error': str(e),
+            'mensaje': 'Error al corregir el modelo'
+        }), 500
+
+
 if __name__ == '__main__':
     print("\n" + "="*70)
     print("ANALIZADOR DE COMPLEJIDAD - API REST")
@@ -125,6 +218,8 @@ if __name__ == '__main__':
     print("   - GET  /           (información)")
     print("   - GET  /salud      (health check)")
     print("   - POST /analizar   (analizar código)")
+    print("   - POST /corregir   (corregir la MLP)")
     print("\n Presiona Ctrl+C para detener\n")
     
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    #! threaded=True: cada petición en su hilo, todas comparten el mismo modelo
+    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
@@ -0,0 +1,131 @@
+#* ===== APRENDIZAJE ONLINE CON BUFFER DE REPETICIÓN =====
+#* Corregir la red entrenando cientos de épocas sobre una sola muestra la
+#* sobreajusta a ese vector y le hace olvidar lo aprendido del dataset.
+#* En su lugar:
+#*   - Un buffer acotado guarda muestras pasadas elegidas por muestreo de
+#*     reservorio: cada muestra vista tiene la misma probabilidad de estar
+#*     en él, sin importar cuántas se hayan visto
+#*   - Cada corrección da unos pocos pasos de mini-batch que mezclan la
+#*     muestra corregida con muestras del buffer, para recordar el resto
+#*   - Se detiene en cuanto la muestra queda bien clasificada con un margen
+#*     y un grupo de control del buffer no ha perdido accuracy, con un máximo de pasos
+
+import random
+import time
+
+
+#*==================== BUFFER DE REPETICIÓN ===================
+
+class BufferRepeticion:
+    #! Guarda como máximo `capacidad` pares (x, y)
+    #! Muestreo de reservorio (algoritmo R): la muestra n-ésima entra con
+    #! probabilidad capacidad / n reemplazando a una al azar
+
+    def __init__(self, capacidad=1000, seed=42):
+        self.capacidad = capacidad
+        self.X = []
+        self.Y = []
+        #! Total de muestras ofrecidas al buffer (no solo las guardadas)
+        self.vistas = 0
+        self.rng = random.Random(seed)
+
+    def __len__(self):
+        return len(self.X)
+
+    def agregar(self, x, y):
+        self.vistas += 1
+        if len(self.X) < self.capacidad:
+            self.X.append(x)
+            self.Y.append(y)
+            return
+        k = self.rng.randrange(self.vistas)
+        if k < self.capacidad:
+            self.X[k] = x
+            self.Y[k] = y
+
+    def agregar_lote(self, X, Y):
+        for x, y in zip(X, Y):
+            self.agregar(x, y)
+
+    def muestrear(self, n):
+        #! Hasta n muestras distintas al azar, como (X, Y)
+        indices = self.rng.sample(range(len(self.X)), min(n, len(self.X)))
+        return [self.X[k] for k in indices], [self.Y[k] for k in indices]
+
+
+#*==================== CORRECCIÓN ONLINE ===================
+
+class CorrectorOnline:
+    #! Aplica correcciones puntuales sin olvidar lo aprendido
+    #! Args:
+    #!   buffer: BufferRepeticion con muestras pasadas (ej. el dataset de entrenamiento)
+    #!   max_pasos: número máximo de pasos de mini-batch por corrección
+    #!   margen: la corrección termina cuando la clase correcta supera a la siguiente
+    #!           por al menos este margen de probabilidad (None = dar siempre max_pasos)
+    #!   tamano_lote: muestras por paso
+    #!   copias_correccion: veces que aparece la muestra corregida en cada lote
+    #!   n_control: muestras del buffer que no deben perder accuracy antes de parar
+    #!   lr: learning rate de las correcciones (None = el de la red)
+
+    def __init__(self, buffer, max_pasos=20, margen=0.2, tamano_lote=16, copias_correccion=4,
+                 n_control=64, lr=None):
+        self.buffer = buffer
+        self.max_pasos = max_pasos
+        self.margen = margen
+        self.tamano_lote = tamano_lote
+        self.copias_correccion = copias_correccion
+        self.n_control = n_control
+        self.lr = lr
+
+    def clasificada(self, mlp, x, y, margen=0.0):
+        #! True si `mlp` predice la clase de `y` superando a las demás por `margen`
+        probas = list(mlp.predict_proba([x])[0])
+        clase = y.index(max(y))
+        otras = probas[:clase] + probas[clase + 1:]
+        return probas[clase] - max(otras) >= margen
+
+    def _aciertos(self, mlp, X, Y):
+        #! Cuántas muestras de (X, Y) clasifica bien `mlp`
+        if not X:
+            return 0
+        indices, _ = mlp.predict_batch(X)
+        return sum(1 for pred, y in zip(indices, Y) if y[pred] == max(y))
+
+    def corregir(self, mlp, x, y):
+        #! Entrena `mlp` para que aprenda (x, y) y luego guarda la muestra en el buffer
+        #! Retorna un diccionario con los pasos dados, si quedó corregida,
+        #! el loss medio del último lote y el tiempo
+        inicio = time.perf_counter()
+        lr_original = mlp.lr
+        if self.lr is not None:
+            mlp.lr = self.lr
+
+        loss = 0.0
+        pasos = 0
+        adaptativo = self.margen is not None
+        if adaptativo:
+            X_control, Y_control = self.buffer.muestrear(self.n_control)
+            aciertos_previos = self._aciertos(mlp, X_control, Y_control)
+        corregida = adaptativo and self.clasificada(mlp, x, y, self.margen)
+        while not corregida and pasos < self.max_pasos:
+            X_lote, Y_lote = self.buffer.muestrear(self.tamano_lote - self.copias_correccion)
+            X_lote = X_lote + [x] * self.copias_correccion
+            Y_lote = Y_lote + [y] * self.copias_correccion
+            gradientes, loss = mlp.gradientes_lote(X_lote, Y_lote)
+            mlp.aplicar_gradientes(gradientes)
+            loss /= len(X_lote)
+            pasos += 1
+            if adaptativo:
+                corregida = (self.clasificada(mlp, x, y, self.margen) and
+                             self._aciertos(mlp, X_control, Y_control) >= aciertos_previos)
+        if not adaptativo:
+            corregida = self.clasificada(mlp, x, y)
+
+        mlp.lr = lr_original
+        self.buffer.agregar(x, y)
+        return {
+            'pasos': pasos,
+            'corregida': corregida,
+            'loss': loss,
+            'tiempo': time.perf_counter() - inicio
+        }
@@ -0,0 +1,713 @@
+#* ===== BENCHMARKS DE LA RED NEURONAL =====
+#* Mide el rendimiento de la MLP sobre el dataset real (recursos.csv)
+#* Ejecutar: python benchmark_mlp.py
+
+import os
+import sys
+import math
+import importlib.util
+import cProfile
+import pstats
+import tracemalloc
+import random
+import time
+from mlp import MLP, NUMPY_DISPONIBLE, BACKEND_PREFERIDO
+from activaciones import sigmoid, sigmoid_np
+from aprendizaje_online import BufferRepeticion, CorrectorOnline
+from entrenador import accuracy, entrenar_con_parada_temprana
+from cuantizacion import cuantizar, evaluar_cuantizacion, bytes_pesos
+from ensemble import entrenar_ensemble
+from entrenamiento_paralelo import entrenar_paralelo
+from exportar_predictor import exportar_predictor
+from kernel_python import KernelMLP
+from crecimiento import ensanchar, profundizar, diferencia_salidas
+from ajuste_cerrado import reajustar_salida
+from poda import podar, dispersar, evaluar_poda
+
+if NUMPY_DISPONIBLE:
+    import numpy as np
+from entrenamiento_combinado import load_data_combinado, normalize, one_hot
+
+
+#*===== UTILIDADES =====
+
+def cargar_dataset():
+    #! Carga y normaliza el dataset combinado una sola vez para todos los benchmarks
+    X, Y_idx = load_data_combinado()
+    X = normalize(X)
+    Y = [one_hot(i, 4) for i in Y_idx]
+    return X, Y, Y_idx
+
+
+def medir_epocas(mlp, X, Y, epochs, **opciones):
+    #! Entrena `epochs` épocas y retorna (épocas por segundo, loss final)
+    #! `opciones` se pasan tal cual a train_epoch (batch_size, shuffle, ...)
+    inicio = time.perf_counter()
+    loss = 0.0
+    for _ in range(epochs):
+        loss = mlp.train_epoch(X, Y, **opciones)
+    duracion = time.perf_counter() - inicio
+    return epochs / duracion, loss
+
+
+#*===== BENCHMARK: BACKEND PYTHON VS NUMPY =====
+
+def benchmark_backends(X, Y, epochs=200):
+    #! Compara épocas/segundo entre backends partiendo de los mismos pesos
+    #! Verifica además que ambos lleguen a las mismas predicciones
+    print("\n" + "="*70)
+    print("BACKEND PYTHON VS NUMPY".center(70))
+    print("="*70)
+
+    if not NUMPY_DISPONIBLE:
+        print("\n NumPy no está instalado, se omite la comparación")
+        return None
+
+    mlp_py = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.1, backend="python")
+    mlp_np = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.1, backend="numpy")
+
+    eps_py, loss_py = medir_epocas(mlp_py, X, Y, epochs)
+    eps_np, loss_np = medir_epocas(mlp_np, X, Y, epochs)
+
+    #! Diferencia máxima entre salidas de ambos backends
+    dif_max = max(
+        abs(a - b)
+        for x in X
+        for a, b in zip(mlp_py.forward(x), mlp_np.forward(x))
+    )
+    iguales = sum(1 for x in X if mlp_py.predict(x) == mlp_np.predict(x))
+
+    print(f"\n  Épocas: {epochs}")
+    print(f"  python: {eps_py:8.1f} épocas/s | Loss: {loss_py:.8f}")
+    print(f"  numpy : {eps_np:8.1f} épocas/s | Loss: {loss_np:.8f}")
+    print(f"  Aceleración: {eps_np / eps_py:.2f}x")
+    print(f"  Diferencia máxima en salidas: {dif_max:.2e}")
+    print(f"  Predicciones iguales: {iguales}/{len(X)}")
+
+    return eps_np / eps_py
+
+
+#*===== BENCHMARK: MINI-BATCH =====
+
+def benchmark_minibatch(X, Y, epochs=200, tamanos=(1, 8, 16, 32)):
+    #! Compara épocas/segundo y loss alcanzado para varios tamaños de lote
+    #! Con batch_size=1 se reproduce el SGD clásico muestra a muestra
+    print("\n" + "="*70)
+    print("MINI-BATCH CON BARAJADO".center(70))
+    print("="*70)
+
+    backend = BACKEND_PREFERIDO
+    print(f"\n  Backend: {backend} | Épocas: {epochs}")
+
+    resultados = {}
+    for batch_size in tamanos:
+        mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.1, backend=backend)
+        eps, loss = medir_epocas(mlp, X, Y, epochs, batch_size=batch_size, shuffle=batch_size > 1)
+        resultados[batch_size] = (eps, loss)
+        print(f"  batch_size={batch_size:3d}: {eps:8.1f} épocas/s | Loss: {loss:.8f}")
+
+    return resultados
+
+
+#*===== BENCHMARK: INFERENCIA =====
+
+def benchmark_inferencia(X, repeticiones=200):
+    #! Compara el patrón anterior (predict + forward por vector) con
+    #! predict_confianza (una pasada) y predict_batch (todo el lote junto)
+    print("\n" + "="*70)
+    print("INFERENCIA: POR VECTOR VS LOTE".center(70))
+    print("="*70)
+
+    mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.1, backend=BACKEND_PREFERIDO)
+    n = repeticiones * len(X)
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for x in X:
+            idx = mlp.predict(x)
+            confianza = mlp.forward(x)[idx]
+    t_doble = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for x in X:
+            idx, confianza = mlp.predict_confianza(x)
+    t_simple = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        indices, probas = mlp.predict_batch(X)
+    t_lote = time.perf_counter() - inicio
+
+    print(f"\n  Backend: {BACKEND_PREFERIDO} | Vectores evaluados: {n}")
+    print(f"  predict + forward : {n / t_doble:10.0f} vectores/s")
+    print(f"  predict_confianza : {n / t_simple:10.0f} vectores/s")
+    print(f"  predict_batch     : {n / t_lote:10.0f} vectores/s")
+
+    return n / t_doble, n / t_simple, n / t_lote
+
+
+#*===== BENCHMARK: ARQUITECTURAS =====
+
+def benchmark_arquitecturas(X, Y, Y_idx, epochs=300, repeticiones=200,
+                            ocultas=(16, 8, [16, 8], [8, 8])):
+    #! Entrena varias profundidades/anchos y compara accuracy e inferencia por lote
+    print("\n" + "="*70)
+    print("ARQUITECTURAS: PROFUNDIDAD Y ANCHO".center(70))
+    print("="*70)
+    print(f"\n  Backend: {BACKEND_PREFERIDO} | Épocas: {epochs} (batch_size=16)")
+
+    resultados = {}
+    for n_hidden in ocultas:
+        mlp = MLP(n_inputs=8, n_hidden=n_hidden, n_outputs=4, lr=0.1, backend=BACKEND_PREFERIDO)
+        _, loss = medir_epocas(mlp, X, Y, epochs, batch_size=16, shuffle=True)
+
+        indices, _ = mlp.predict_batch(X)
+        acc = sum(1 for pred, yi in zip(indices, Y_idx) if pred == yi) / len(X)
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            mlp.predict_batch(X)
+        latencia = (time.perf_counter() - inicio) / repeticiones
+
+        resultados[str(n_hidden)] = (loss, acc, latencia)
+        print(f"  {str(mlp.capas):16s} Loss: {loss:.6f} | Acc: {acc:7.2%} | "
+              f"Lote de {len(X)}: {latencia * 1e6:8.1f} µs")
+
+    return resultados
+
+
+#*===== BENCHMARK: CONVERGENCIA DE OPTIMIZADORES =====
+
+def benchmark_optimizadores(X, Y, loss_objetivo=0.002, max_epochs=5000,
+                            configuraciones=(('sgd', 0.1), ('momentum', 0.05), ('nesterov', 0.05),
+                                             ('rmsprop', 0.01), ('adam', 0.01), ('adam', 0.05))):
+    #! Tiempo real y épocas necesarias para llegar a `loss_objetivo` con cada optimizador
+    print("\n" + "="*70)
+    print("CONVERGENCIA DE OPTIMIZADORES".center(70))
+    print("="*70)
+    print(f"\n  Backend: {BACKEND_PREFERIDO} | Loss objetivo: {loss_objetivo} | batch_size=16")
+
+    resultados = {}
+    for nombre, lr in configuraciones:
+        mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=lr, backend=BACKEND_PREFERIDO, optimizador=nombre)
+        inicio = time.perf_counter()
+        loss = float("inf")
+        epoca = 0
+        while epoca < max_epochs and loss > loss_objetivo:
+            loss = mlp.train_epoch(X, Y, batch_size=16, shuffle=True)
+            epoca += 1
+        duracion = time.perf_counter() - inicio
+
+        alcanzado = "sí" if loss <= loss_objetivo else "no"
+        resultados[(nombre, lr)] = (epoca, duracion, loss)
+        print(f"  {nombre:9s} lr={lr:<5} | Épocas: {epoca:5d} | Tiempo: {duracion:7.3f}s | "
+              f"Loss: {loss:.6f} | Alcanzado: {alcanzado}")
+
+    return resultados
+
+
+#*===== BENCHMARK: MSE VS ENTROPÍA CRUZADA =====
+
+def benchmark_perdidas(X, Y, Y_idx, confianza_objetivo=0.95, max_epochs=2000,
+                       configuraciones=(('sgd', 0.1), ('adam', 0.05))):
+    #! Épocas hasta que TODAS las muestras se clasifican bien con al menos
+    #! `confianza_objetivo` en su clase, para cada pérdida y optimizador
+    #! También muestra cuánto suman las salidas (softmax suma exactamente 1)
+    print("\n" + "="*70)
+    print("SIGMOID + MSE VS SOFTMAX + ENTROPÍA CRUZADA".center(70))
+    print("="*70)
+    print(f"\n  Backend: {BACKEND_PREFERIDO} | Confianza objetivo: {confianza_objetivo:.0%} | batch_size=16")
+
+    resultados = {}
+    for nombre, lr in configuraciones:
+        for perdida in ("mse", "entropia_cruzada"):
+            mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=lr, backend=BACKEND_PREFERIDO,
+                      optimizador=nombre, perdida=perdida)
+            inicio = time.perf_counter()
+            epoca = 0
+            confianza_min = 0.0
+            while epoca < max_epochs and confianza_min < confianza_objetivo:
+                mlp.train_epoch(X, Y, batch_size=16, shuffle=True)
+                epoca += 1
+                _, probas = mlp.predict_batch(X)
+                confianza_min = min(float(p[yi]) for p, yi in zip(probas, Y_idx))
+            duracion = time.perf_counter() - inicio
+
+            suma = sum(float(v) for v in probas[0])
+            resultados[(nombre, perdida)] = (epoca, duracion, confianza_min)
+            print(f"  {nombre:5s} lr={lr:<5} {perdida:17s} | Épocas: {epoca:5d} | Tiempo: {duracion:6.3f}s | "
+                  f"Conf. mínima: {confianza_min:.3f} | Suma salidas: {suma:.3f}")
+
+    return resultados
+
+
+#*===== MICRO-BENCHMARK: ACTIVACIONES =====
+
+def _sigmoid_original(x):
+    #! Fórmula anterior de mlp.sigmoid (desborda con x muy negativos)
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+def benchmark_activaciones(n=200000):
+    #! Compara la sigmoid original con la estable (escalar y vectorizada)
+    #! Entradas en [-30, 30]
+    print("\n" + "="*70)
+    print("MICRO-BENCHMARK: SIGMOID".center(70))
+    print("="*70)
+
+    rng = random.Random(0)
+    valores = [rng.uniform(-30, 30) for _ in range(n)]
+
+    print(f"\n  Escalar ({n} evaluaciones):")
+    for nombre, f in (("original", _sigmoid_original), ("estable", sigmoid)):
+        inicio = time.perf_counter()
+        for x in valores:
+            f(x)
+        duracion = time.perf_counter() - inicio
+        print(f"    {nombre:9s}: {n / duracion / 1e6:6.2f} M evaluaciones/s")
+
+    try:
+        _sigmoid_original(-1000.0)
+    except OverflowError:
+        print(f"    original(-1000): OverflowError | estable(-1000): {sigmoid(-1000.0):.1e}")
+
+    if not NUMPY_DISPONIBLE:
+        return
+
+    X = np.array(valores)
+    print(f"\n  Vectorizada (arreglo de {n}):")
+    repeticiones = 20
+    with np.errstate(over="ignore"):
+        for nombre, f in (("original", lambda x: 1.0 / (1.0 + np.exp(-x))), ("estable", sigmoid_np)):
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                f(X)
+            duracion = time.perf_counter() - inicio
+            print(f"    {nombre:9s}: {n * repeticiones / duracion / 1e6:7.1f} M evaluaciones/s")
+
+
+#*===== BENCHMARK: FORMATO JSON VS BINARIO =====
+
+def benchmark_formatos(anchos=(16, 256, 1024), repeticiones=3):
+    #! Tiempo de guardado y de carga en frío (JSON vs .mlpb) al crecer el modelo
+    #! Red 8 -> [ancho, ancho] -> 4 con el backend más rápido disponible
+    print("\n" + "="*70)
+    print("BENCHMARK: FORMATO JSON VS BINARIO".center(70))
+    print("="*70)
+
+    archivos = {"json": "_benchmark_modelo.json", "binario": "_benchmark_modelo.mlpb"}
+    resultados = {}
+    for ancho in anchos:
+        mlp = MLP(n_inputs=8, n_hidden=[ancho, ancho], n_outputs=4, backend=BACKEND_PREFERIDO)
+        n_parametros = sum((a + 1) * b for a, b in zip(mlp.capas[:-1], mlp.capas[1:]))
+        print(f"\n  Ancho {ancho} ({n_parametros} parámetros):")
+        for formato, archivo in archivos.items():
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                mlp.guardar(archivo)
+            t_guardar = (time.perf_counter() - inicio) / repeticiones
+
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                MLP.cargar(archivo, backend=BACKEND_PREFERIDO)
+            t_cargar = (time.perf_counter() - inicio) / repeticiones
+
+            tamano = os.path.getsize(archivo)
+            resultados[(ancho, formato)] = (t_guardar, t_cargar, tamano)
+            print(f"    {formato:8s}: Guardar {t_guardar * 1000:8.2f} ms | Cargar {t_cargar * 1000:8.2f} ms | "
+                  f"Tamaño {tamano / 1024:9.1f} KiB")
+
+    for archivo in archivos.values():
+        os.remove(archivo)
+    return resultados
+
+
+#*===== BENCHMARK: CORRECCIÓN ONLINE =====
+
+def benchmark_correccion(X, Y, epochs=300):
+    #! Corrige una muestra hacia cada clase con el método anterior
+    #! (500 épocas sobre la muestra sola) y con el buffer de repetición,
+    #! que se detiene en cuanto la muestra queda corregida
+    #! Mide latencia, si la corrección se aprendió y la accuracy que queda en el dataset
+    print("\n" + "="*70)
+    print("BENCHMARK: CORRECCIÓN ONLINE".center(70))
+    print("="*70)
+
+    base = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.05, backend=BACKEND_PREFERIDO,
+               optimizador="adam", perdida="entropia_cruzada")
+    medir_epocas(base, X, Y, epochs, batch_size=16, shuffle=True)
+    print(f"\n  Modelo base: accuracy {accuracy(base, X, Y):.2%}")
+
+    #! Muestra a corregir: un doble bucle, con las características de analizar_codigo
+    x = [2 / 3, 0.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+    resultados = {}
+    for clase in range(4):
+        y = one_hot(clase, 4)
+
+        anterior = base.copiar()
+        inicio = time.perf_counter()
+        for _ in range(500):
+            anterior.train_epoch([x], [y])
+        t_anterior = time.perf_counter() - inicio
+
+        buffer = BufferRepeticion()
+        buffer.agregar_lote(X, Y)
+        nuevo = base.copiar()
+        correccion = CorrectorOnline(buffer, max_pasos=50, margen=0.2).corregir(nuevo, x, y)
+
+        resultados[clase] = {}
+        for nombre, mlp, pasos, duracion in (("500 épocas", anterior, 500, t_anterior),
+                                             ("buffer", nuevo, correccion['pasos'], correccion['tiempo'])):
+            aprendida = mlp.predict_confianza(x)[0] == clase
+            acc = accuracy(mlp, X, Y)
+            resultados[clase][nombre] = (pasos, duracion, aprendida, acc)
+            print(f"  Clase {clase} | {nombre:10s} | {pasos:3d} pasos | {duracion * 1000:7.1f} ms | "
+                  f"Aprendida: {'sí' if aprendida else 'no'} | Accuracy dataset: {acc:.2%}")
+
+    return resultados
+
+
+#*===== BENCHMARK: CUANTIZACIÓN INT8 =====
+
+def benchmark_cuantizacion(X, Y, epochs=300, n_lote=100000):
+    #! Accuracy en recursos.csv antes y después de cuantizar, memoria de los pesos
+    #! y velocidad de clasificación de un lote grande, en cada backend disponible
+    print("\n" + "="*70)
+    print("BENCHMARK: CUANTIZACIÓN INT8".center(70))
+    print("="*70)
+
+    backends = ["python", "numpy"] if NUMPY_DISPONIBLE else ["python"]
+    resultados = {}
+    for backend in backends:
+        #! La red grande solo con NumPy: en Python puro tarda minutos en entrenarse
+        for ocultas in ((16, [256, 256]) if backend == "numpy" else (16,)):
+            mlp = MLP(n_inputs=8, n_hidden=ocultas, n_outputs=4, lr=0.01, backend=backend,
+                      optimizador="adam", perdida="entropia_cruzada")
+            medir_epocas(mlp, X, Y, epochs if ocultas == 16 else epochs // 10, batch_size=16, shuffle=True)
+            cuantizada = cuantizar(mlp)
+            r = evaluar_cuantizacion(mlp, X, Y, cuantizada)
+
+            #! Lote grande: el dataset repetido hasta n_lote filas (menos en Python puro)
+            n = n_lote if backend == "numpy" else n_lote // 100
+            lote = (X * (n // len(X) + 1))[:n]
+            if backend == "numpy":
+                lote = np.array(lote)
+            tiempos = []
+            for modelo in (mlp, cuantizada):
+                inicio = time.perf_counter()
+                modelo.predict_batch(lote)
+                tiempos.append(n / (time.perf_counter() - inicio))
+
+            resultados[(backend, str(ocultas))] = dict(r, velocidades=tiempos)
+            print(f"\n  {backend} | 8 -> {ocultas} -> 4")
+            print(f"    Accuracy: {r['accuracy_original']:.2%} -> {r['accuracy_cuantizada']:.2%} "
+                  f"(delta {r['delta_accuracy']:+.2%}) | Predicciones iguales: {r['coincidencia']:.2%} | "
+                  f"Error máx. salida: {r['error_max_salida']:.1e}")
+            print(f"    Memoria de pesos: {r['bytes_original'] / 1024:8.1f} KiB -> "
+                  f"{r['bytes_cuantizada'] / 1024:8.1f} KiB ({r['bytes_original'] / r['bytes_cuantizada']:.1f}x)")
+            print(f"    Clasificación ({n} filas): {tiempos[0]:12,.0f} -> {tiempos[1]:12,.0f} filas/s")
+
+    return resultados
+
+
+#*===== BENCHMARK: ENSEMBLE =====
+
+def benchmark_ensemble(X, Y, n_miembros=4, epochs=200, n_lote=20000):
+    #! Tiempo de entrenar el ensemble en serie y en el pool de procesos,
+    #! dispersión entre semillas e inferencia apilada vs miembro a miembro
+    print("\n" + "="*70)
+    print("BENCHMARK: ENSEMBLE".center(70))
+    print("="*70)
+
+    configuracion = dict(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.01, backend=BACKEND_PREFERIDO,
+                         optimizador="adam", perdida="entropia_cruzada")
+    opciones = dict(max_epochs=epochs, batch_size=16, shuffle=True, paciencia=None)
+
+    print(f"\n  Entrenamiento de {n_miembros} miembros ({os.cpu_count()} núcleos):")
+    tiempos = {}
+    for procesos in (1, None):
+        inicio = time.perf_counter()
+        ensemble, _ = entrenar_ensemble(X, Y, n_miembros, procesos=procesos,
+                                        configuracion=configuracion, **opciones)
+        tiempos[procesos] = time.perf_counter() - inicio
+        print(f"    {'en serie' if procesos == 1 else 'pool':8s}: {tiempos[procesos]:6.2f}s")
+
+    #! Cuánto cambia la salida de una red a otra según la semilla
+    print("\n  Estabilidad entre semillas:")
+    for mlp, semilla in zip(ensemble.miembros, ensemble.semillas):
+        print(f"    semilla {semilla}: accuracy {accuracy(mlp, X, Y):.2%}")
+    print(f"    ensemble  : accuracy {accuracy(ensemble, X, Y):.2%}")
+    if NUMPY_DISPONIBLE:
+        salidas = np.array([np.asarray(mlp.predict_proba(X)) for mlp in ensemble.miembros])
+        print(f"    Desviación media de las salidas entre semillas: {salidas.std(axis=0).mean():.4f}")
+
+    lote = (X * (n_lote // len(X) + 1))[:n_lote]
+    inicio = time.perf_counter()
+    for mlp in ensemble.miembros:
+        mlp.predict_proba(lote)
+    t_separados = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    ensemble.predict_proba(lote)
+    t_apilado = time.perf_counter() - inicio
+    print(f"\n  Inferencia de {n_lote} filas: miembro a miembro {t_separados * 1000:.1f} ms | "
+          f"ensemble {t_apilado * 1000:.1f} ms")
+
+    return tiempos, t_separados, t_apilado
+
+
+def benchmark_entrenamiento_paralelo(X, Y, n_muestras=20000, epochs=3, batch_size=64):
+    #! Tiempo por época de train_epoch frente al entrenamiento en paralelo de datos
+    #! (síncrono y Hogwild) con 1, 2, ... núcleos, sobre el dataset ampliado con ruido
+    print("\n" + "="*70)
+    print("BENCHMARK: ENTRENAMIENTO EN PARALELO DE DATOS".center(70))
+    print("="*70)
+
+    rng = random.Random(0)
+    X_grande = [[v + rng.gauss(0, 0.01) for v in X[k % len(X)]] for k in range(n_muestras)]
+    Y_grande = [Y[k % len(Y)] for k in range(n_muestras)]
+
+    def nueva_red(optimizador):
+        return MLP(n_inputs=8, n_hidden=[64, 64], n_outputs=4, lr=0.01, backend=BACKEND_PREFERIDO,
+                   optimizador=optimizador, perdida="entropia_cruzada")
+
+    print(f"\n  {n_muestras} muestras, {epochs} épocas, lote {batch_size}, "
+          f"backend {BACKEND_PREFERIDO}, {os.cpu_count()} núcleos")
+    mlp = nueva_red("sgd")
+    epocas_por_segundo, loss = medir_epocas(mlp, X_grande, Y_grande, epochs, batch_size=batch_size, shuffle=True)
+    t_secuencial = 1 / epocas_por_segundo
+    print(f"  {'train_epoch':22s}: {t_secuencial * 1000:8.1f} ms/época | loss final {loss:.4f}")
+
+    tiempos = {}
+    procesos_probados = sorted({1, 2, os.cpu_count() or 1})
+    for modo in ("sincrono", "hogwild"):
+        for procesos in procesos_probados:
+            mlp = nueva_red("sgd")
+            resultado = entrenar_paralelo(mlp, X_grande, Y_grande, epochs=epochs, batch_size=batch_size,
+                                          procesos=procesos, modo=modo)
+            tiempos[(modo, procesos)] = resultado['tiempo'] / epochs
+            print(f"  {modo + f' ({procesos} procesos)':22s}: {tiempos[(modo, procesos)] * 1000:8.1f} ms/época "
+                  f"(x{t_secuencial / tiempos[(modo, procesos)]:.2f}) | loss final {resultado['historial'][-1]:.4f}")
+
+    return t_secuencial, tiempos
+
+
+#*===== BENCHMARK: PREDICTOR COMPILADO =====
+
+def benchmark_predictor_compilado(X, Y, epochs=300, repeticiones=50):
+    #! MLP.predict (ambos backends) frente al módulo generado por exportar_predictor,
+    #! vector a vector, y tiempo de importar el módulo frente a importar mlp.py y cargar el modelo
+    print("\n" + "="*70)
+    print("BENCHMARK: PREDICTOR COMPILADO".center(70))
+    print("="*70)
+
+    mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.01, optimizador="adam", perdida="entropia_cruzada")
+    for _ in range(epochs):
+        mlp.train_epoch(X, Y, batch_size=16, shuffle=True)
+    archivo_modelo, archivo_predictor = "_benchmark_modelo.mlpb", "_benchmark_predictor.py"
+    mlp.guardar(archivo_modelo)
+    exportar_predictor(mlp, archivo_predictor)
+
+    inicio = time.perf_counter()
+    predictor = importlib.import_module("_benchmark_predictor")
+    t_import = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    MLP.cargar(archivo_modelo)
+    t_cargar = time.perf_counter() - inicio
+    print(f"\n  Importar el predictor: {t_import * 1e6:8.0f} µs | cargar el modelo .mlpb: {t_cargar * 1e6:8.0f} µs")
+
+    def medir(predict):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            for x in X:
+                predict(x)
+        return (time.perf_counter() - inicio) / (repeticiones * len(X))
+
+    t_compilado = medir(predictor.predict)
+    tiempos = {"compilado": t_compilado}
+    for backend in ("python", "numpy") if NUMPY_DISPONIBLE else ("python",):
+        modelo = MLP.cargar(archivo_modelo, backend=backend)
+        tiempos[backend] = medir(modelo.predict)
+        print(f"  MLP.predict ({backend:6s}): {tiempos[backend] * 1e6:6.2f} µs/vector")
+    print(f"  Predictor compilado : {t_compilado * 1e6:6.2f} µs/vector "
+          f"(x{tiempos['python'] / t_compilado:.1f} frente al backend python)")
+    coinciden = sum(1 for x in X if predictor.predict(x) == mlp.predict(x))
+    print(f"  Predicciones idénticas: {coinciden}/{len(X)}")
+
+    del sys.modules["_benchmark_predictor"]
+    os.remove(archivo_modelo)
+    os.remove(archivo_predictor)
+    os.remove(importlib.util.cache_from_source(archivo_predictor))
+    return t_import, tiempos
+
+
+#*===== BENCHMARK: NÚCLEO PURO PYTHON =====
+
+def benchmark_kernel_python(X, Y, epochs=20, configuraciones=((8, 16, 4), (8, 64, 4))):
+    #! Backend "python" de MLP frente a KernelMLP (SGD, muestra a muestra y por lotes):
+    #! muestras por segundo, llamadas a funciones por muestra (cada generador y cada
+    #! comprensión es una), memoria temporal máxima de una época y memoria de los pesos
+    #! El pico de KernelMLP incluye las formas dispersas de la época; los índices
+    #! se muestran aparte porque se reservan al crear el núcleo
+    print("\n" + "="*70)
+    print("BENCHMARK: NÚCLEO PURO PYTHON (KernelMLP)".center(70))
+    print("="*70)
+
+    def medir(entrenar):
+        inicio = time.perf_counter()
+        for _ in range(epochs):
+            entrenar()
+        muestras_s = epochs * len(X) / (time.perf_counter() - inicio)
+
+        perfil = cProfile.Profile()
+        perfil.runcall(entrenar)
+        llamadas = pstats.Stats(perfil).total_calls / len(X)
+
+        tracemalloc.start()
+        entrenar()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return muestras_s, llamadas, pico
+
+    resultados = {}
+    for n_inputs, n_hidden, n_outputs in configuraciones:
+        print(f"\n  Red {n_inputs}-{n_hidden}-{n_outputs}:")
+        for batch_size in (1, 16):
+            mlp = MLP(n_inputs, n_hidden, n_outputs, lr=0.05, backend="python")
+            kernel = KernelMLP(MLP(n_inputs, n_hidden, n_outputs, lr=0.05, backend="python"))
+            for nombre, modelo in (("MLP", mlp), ("KernelMLP", kernel)):
+                muestras_s, llamadas, pico = medir(lambda: modelo.train_epoch(X, Y, batch_size=batch_size))
+                resultados[(n_hidden, batch_size, nombre)] = (muestras_s, llamadas, pico)
+                print(f"    lote {batch_size:2d} {nombre:9s}: {muestras_s:8.0f} muestras/s | "
+                      f"{llamadas:6.1f} llamadas/muestra | pico temporal {pico / 1024:6.1f} KiB")
+        print(f"    Memoria de los pesos: listas de MLP {bytes_pesos(mlp) / 1024:.1f} KiB | "
+              f"KernelMLP.a_array() {sys.getsizeof(kernel.a_array()) / 1024:.1f} KiB")
+        #! Los índices de las filas no cuentan en el pico de la época: son memoria fija
+        print(f"    KernelMLP, memoria fija de los índices: {kernel.memoria_indices() / 1024:.1f} KiB")
+
+    #! Mismas operaciones en el mismo orden: mismos pesos que el backend python
+    a = MLP(8, 16, 4, lr=0.05, backend="python")
+    kernel = KernelMLP(MLP(8, 16, 4, lr=0.05, backend="python"))
+    for _ in range(5):
+        a.train_epoch(X, Y, shuffle=True)
+        kernel.train_epoch(X, Y, shuffle=True)
+    b = kernel.copiar_pesos_a(MLP(8, 16, 4, backend="python"))
+    print(f"\n  Pesos idénticos a MLP tras 5 épocas: {'sí' if (a.pesos, a.sesgos) == (b.pesos, b.sesgos) else 'no'}")
+    return resultados
+
+
+def benchmark_crecimiento(X, Y, ancho=32):
+    #! Pasar de 16 a `ancho` neuronas ocultas: entrenar la red grande desde cero
+    #! frente a ensanchar la red ya entrenada (Net2Net) y afinarla
+    #! Misma configuración y misma parada temprana que main.py
+    print("\n" + "="*70)
+    print("BENCHMARK: CRECER UNA RED ENTRENADA (NET2NET)".center(70))
+    print("="*70)
+    opciones = dict(max_epochs=5000, batch_size=16, shuffle=True, paciencia=20, min_delta=1e-5)
+
+    def nueva(n_hidden):
+        return MLP(8, n_hidden, 4, lr=0.05, backend=BACKEND_PREFERIDO, optimizador="adam",
+                   perdida="entropia_cruzada")
+
+    base = nueva(16)
+    entrenar_con_parada_temprana(base, X, Y, **opciones)
+
+    resultados = {}
+    inicio = time.perf_counter()
+    desde_cero = nueva(ancho)
+    r = entrenar_con_parada_temprana(desde_cero, X, Y, **opciones)
+    resultados['desde cero'] = (r['epocas'], time.perf_counter() - inicio, r['loss'], accuracy(desde_cero, X, Y))
+
+    inicio = time.perf_counter()
+    ancha = ensanchar(base, ancho)
+    diferencia = diferencia_salidas(base, ancha, X)
+    r = entrenar_con_parada_temprana(ancha, X, Y, **opciones)
+    resultados['ensanchar + ajuste'] = (r['epocas'], time.perf_counter() - inicio, r['loss'], accuracy(ancha, X, Y))
+
+    print(f"\n  Red 8-16-4 entrenada  =>  8-{ancho}-4")
+    print(f"  Mayor diferencia en las salidas al ensanchar: {diferencia:.2e} "
+          f"(al profundizar: {diferencia_salidas(base, profundizar(base), X):.2e})")
+    for nombre, (epocas, segundos, loss, acc) in resultados.items():
+        print(f"  {nombre:20s}: {epocas:5d} épocas | {segundos:6.2f}s | loss {loss:.6f} | accuracy {acc:.2%}")
+    print(f"  Aceleración: {resultados['desde cero'][1] / resultados['ensanchar + ajuste'][1]:.1f}x")
+    return resultados
+
+
+def benchmark_ajuste_cerrado(X, Y, fraccion_inicial=0.6, regularizacion=1e-3):
+    #! El dataset crece (modelo entrenado con una parte, llegan las demás muestras):
+    #! re-entrenar todo con backprop frente a reajustar solo la capa de salida
+    print("\n" + "="*70)
+    print("BENCHMARK: REAJUSTE CERRADO DE LA CAPA DE SALIDA".center(70))
+    print("="*70)
+    opciones = dict(max_epochs=5000, batch_size=16, shuffle=True, paciencia=20, min_delta=1e-5)
+    indices = list(range(len(X)))
+    random.Random(0).shuffle(indices)
+    iniciales = indices[:int(len(X) * fraccion_inicial)]
+
+    resultados = {}
+    for backend in ([BACKEND_PREFERIDO, "python"] if BACKEND_PREFERIDO != "python" else ["python"]):
+        base = MLP(8, 16, 4, lr=0.05, backend=backend, optimizador="adam", perdida="entropia_cruzada")
+        entrenar_con_parada_temprana(base, [X[k] for k in iniciales], [Y[k] for k in iniciales], **opciones)
+        print(f"\n  Backend {backend}: modelo entrenado con {len(iniciales)}/{len(X)} muestras "
+              f"(accuracy sobre todas: {accuracy(base, X, Y):.2%})")
+
+        reajustado = base.copiar()
+        inicio = time.perf_counter()
+        reajustar_salida(reajustado, X, Y, regularizacion)
+        resultados[(backend, 'reajuste cerrado')] = (time.perf_counter() - inicio, accuracy(reajustado, X, Y))
+
+        reentrenado = base.copiar()
+        inicio = time.perf_counter()
+        entrenar_con_parada_temprana(reentrenado, X, Y, **opciones)
+        resultados[(backend, 're-entrenar')] = (time.perf_counter() - inicio, accuracy(reentrenado, X, Y))
+
+        for nombre in ('reajuste cerrado', 're-entrenar'):
+            segundos, acc = resultados[(backend, nombre)]
+            print(f"    {nombre:16s}: {segundos * 1000:9.1f} ms | accuracy {acc:.2%}")
+    return resultados
+
+
+def benchmark_poda(X, Y, epochs=300, fracciones=(0.5, 0.75, 0.9), epochs_ajuste=50):
+    #! Red densa frente a su versión podada dispersa (con y sin ajuste fino):
+    #! arquitectura tras eliminar neuronas muertas, pesos, accuracy y latencia
+    print("\n" + "="*70)
+    print("BENCHMARK: PODA POR MAGNITUD E INFERENCIA DISPERSA".center(70))
+    print("="*70)
+
+    backends = ["python", "numpy"] if NUMPY_DISPONIBLE else ["python"]
+    resultados = {}
+    for backend in backends:
+        mlp = MLP(8, 16, 4, lr=0.05, backend=backend, optimizador="adam", perdida="entropia_cruzada")
+        medir_epocas(mlp, X, Y, epochs, batch_size=16, shuffle=True)
+        print(f"\n  Backend {backend}:")
+        for fraccion in fracciones:
+            for ajuste in (0, epochs_ajuste):
+                r = evaluar_poda(mlp, dispersar(podar(mlp, fraccion, X, Y, ajuste)), X, Y)
+                resultados[(backend, fraccion, ajuste)] = r
+                print(f"    poda {fraccion:.0%} ajuste {ajuste:2d} épocas: "
+                      f"{' -> '.join(map(str, r['capas_dispersa'])):>12} | "
+                      f"pesos {r['pesos_dispersa']:3d}/{r['pesos_densa']} | "
+                      f"accuracy {r['accuracy_densa']:.2%} -> {r['accuracy_dispersa']:.2%} | "
+                      f"{r['latencia_densa']:5.1f} -> {r['latencia_dispersa']:5.1f} µs/predicción")
+    return resultados
+
+
+if __name__ == "__main__":
+    X, Y, Y_idx = cargar_dataset()
+    benchmark_backends(X, Y)
+    benchmark_minibatch(X, Y)
+    benchmark_inferencia(X)
+    benchmark_arquitecturas(X, Y, Y_idx)
+    benchmark_optimizadores(X, Y)
+    benchmark_perdidas(X, Y, Y_idx)
+    benchmark_activaciones()
+    benchmark_formatos()
+    benchmark_correccion(X, Y)
+    benchmark_cuantizacion(X, Y)
+    benchmark_ensemble(X, Y)
+    benchmark_entrenamiento_paralelo(X, Y)
+    benchmark_predictor_compilado(X, Y)
+    benchmark_kernel_python(X, Y)
+    benchmark_crecimiento(X, Y)
+    benchmark_ajuste_cerrado(X, Y)
+    benchmark_poda(X, Y)
@@ -0,0 +1,253 @@
+#* ===== BÚSQUEDA DE HIPERPARÁMETROS =====
+#* En lugar de fijar a mano n_hidden, lr y el número de épocas, prueba muchas
+#* configuraciones y se queda con la mejor según un conjunto de validación.
+#*   - Configuraciones en rejilla (todas las combinaciones) o aleatorias
+#*   - Las pruebas se reparten entre los núcleos con concurrent.futures
+#*   - Poda por "successive halving": todas entrenan pocas épocas, solo el
+#*     mejor 1/eta sigue entrenando (eta veces más), y así sucesivamente.
+#*     Las configuraciones malas se descartan tras unas pocas épocas.
+#*   - Solo compiten por el primer puesto las pruebas que completaron su
+#*     presupuesto: una podada tras pocas épocas no es comparable con ellas
+#*   - Escribe una tabla CSV con todas las pruebas y guarda la mejor
+#*     configuración, re-entrenada con todo el dataset y todo su presupuesto
+#*     de épocas, como modelo de producción
+#*
+#* Ejecutar: python busqueda_hiperparametros.py
+
+import os
+import csv
+import json
+import math
+import random
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from mlp import MLP, BACKEND_PREFERIDO
+
+#! Claves del espacio que no son argumentos de MLP
+#! max_epochs: presupuesto máximo de épocas de la prueba
+#! batch_size: tamaño del mini-batch en train_epoch
+CLAVES_ENTRENAMIENTO = ('max_epochs', 'batch_size')
+
+
+#*==================== GENERACIÓN DE CONFIGURACIONES ===================
+
+def configuraciones_rejilla(espacio):
+    #! Todas las combinaciones de un espacio {parámetro: [valores]}
+    claves = list(espacio)
+    return [dict(zip(claves, valores)) for valores in itertools.product(*(espacio[c] for c in claves))]
+
+
+def configuraciones_aleatorias(espacio, n, seed=0):
+    #! `n` configuraciones al azar de un espacio donde cada parámetro es:
+    #!   - una lista: se elige uno de sus valores
+    #!   - una tupla (mínimo, máximo) de enteros: entero uniforme en el rango
+    #!   - una tupla (mínimo, máximo) de reales: log-uniforme (adecuado para lr)
+    rng = random.Random(seed)
+    configuraciones = []
+    for _ in range(n):
+        configuracion = {}
+        for clave, valores in espacio.items():
+            if isinstance(valores, tuple):
+                minimo, maximo = valores
+                if isinstance(minimo, int) and isinstance(maximo, int):
+                    configuracion[clave] = rng.randint(minimo, maximo)
+                else:
+                    configuracion[clave] = math.exp(rng.uniform(math.log(minimo), math.log(maximo)))
+            else:
+                configuracion[clave] = rng.choice(valores)
+        configuraciones.append(configuracion)
+    return configuraciones
+
+
+def dividir_validacion(X, Y, fraccion=0.25, seed=0):
+    #! Separa al azar una fracción del dataset para validar
+    #! Retorna (X_entrenamiento, Y_entrenamiento, X_validacion, Y_validacion)
+    indices = list(range(len(X)))
+    random.Random(seed).shuffle(indices)
+    n_val = max(1, int(len(X) * fraccion))
+    val, ent = indices[:n_val], indices[n_val:]
+    return [X[k] for k in ent], [Y[k] for k in ent], [X[k] for k in val], [Y[k] for k in val]
+
+
+#*==================== EJECUCIÓN DE UNA PRUEBA ===================
+#* Cada proceso del pool recibe los datos una sola vez (inicializador)
+#* y luego solo intercambia configuraciones y modelos
+
+_datos = None
+
+
+def _inicializar_datos(X_ent, Y_ent, X_val, Y_val):
+    global _datos
+    _datos = (X_ent, Y_ent, X_val, Y_val)
+
+
+def _crear_mlp(configuracion, base):
+    argumentos = dict(base)
+    argumentos.update({c: v for c, v in configuracion.items() if c not in CLAVES_ENTRENAMIENTO})
+    return MLP(**argumentos)
+
+
+def _ejecutar_prueba(prueba):
+    #! Continúa una prueba hasta `objetivo` épocas acumuladas y la evalúa en validación
+    #! `prueba` es un diccionario con configuracion, base, mlp (None al empezar), epocas y objetivo
+    X_ent, Y_ent, X_val, Y_val = _datos
+    mlp = prueba['mlp'] or _crear_mlp(prueba['configuracion'], prueba['base'])
+    batch_size = prueba['configuracion'].get('batch_size', 16)
+
+    inicio = time.perf_counter()
+    loss = 0.0
+    for _ in range(prueba['objetivo'] - prueba['epocas']):
+        loss = mlp.train_epoch(X_ent, Y_ent, batch_size=batch_size, shuffle=True)
+        if not math.isfinite(loss):
+            break
+
+    #! Solo propagación hacia adelante: validar no necesita gradientes
+    loss_val = mlp.perdida_lote(X_val, Y_val) / len(X_val)
+    indices, _ = mlp.predict_batch(X_val)
+    acc_val = sum(1 for pred, y in zip(indices, Y_val) if y[pred] == max(y)) / len(X_val)
+
+    return dict(prueba, mlp=mlp, epocas=prueba['objetivo'],
+                loss_entrenamiento=loss,
+                loss_validacion=loss_val if math.isfinite(loss_val) else float("inf"),
+                accuracy_validacion=acc_val,
+                tiempo=prueba.get('tiempo', 0.0) + time.perf_counter() - inicio)
+
+
+#*==================== BÚSQUEDA CON PODA ===================
+
+def buscar_hiperparametros(X, Y, espacio, modo="rejilla", n_pruebas=20, base=None,
+                           epocas_iniciales=25, eta=3, max_epochs=675, fraccion_validacion=0.25,
+                           procesos=None, seed=0, archivo_resultados="resultados_busqueda.csv"):
+    #! Busca la mejor configuración de `espacio`
+    #! Args:
+    #!   espacio: {parámetro: valores}; parámetros de MLP (n_hidden, lr, optimizador, ...)
+    #!            más max_epochs y batch_size
+    #!   modo: "rejilla" o "aleatorio" (n_pruebas configuraciones)
+    #!   base: argumentos fijos de MLP (n_inputs, n_outputs, backend, perdida...)
+    #!   epocas_iniciales, eta: ronda 1 entrena epocas_iniciales épocas; cada ronda
+    #!                         conserva el mejor 1/eta y multiplica las épocas por eta
+    #!   max_epochs: presupuesto de las configuraciones que no traen el suyo
+    #!   procesos: tamaño del pool (por defecto uno por núcleo)
+    #!   archivo_resultados: CSV con una fila por prueba (None para no escribirlo)
+    #! Retorna (mejor prueba, lista de todas las pruebas), ordenadas de mejor a peor:
+    #! primero las completas y después las podadas, de la última ronda a la primera
+    if modo == "rejilla":
+        configuraciones = configuraciones_rejilla(espacio)
+    elif modo == "aleatorio":
+        configuraciones = configuraciones_aleatorias(espacio, n_pruebas, seed)
+    else:
+        raise ValueError(f"Modo desconocido: {modo!r} (opciones: 'rejilla', 'aleatorio')")
+
+    datos = dividir_validacion(X, Y, fraccion_validacion, seed)
+    base = dict(base or {})
+    pruebas = [{'id': k, 'configuracion': c, 'base': base, 'mlp': None, 'epocas': 0,
+                'max_epochs': c.get('max_epochs', max_epochs), 'estado': 'completa'}
+               for k, c in enumerate(configuraciones)]
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+
+    pool = None
+    if procesos > 1:
+        pool = ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_datos, initargs=datos)
+    else:
+        _inicializar_datos(*datos)
+
+    try:
+        vivas = pruebas
+        presupuesto = epocas_iniciales
+        ronda = 1
+        while vivas:
+            #! Cada prueba avanza hasta el presupuesto de la ronda, sin pasar su max_epochs
+            for prueba in vivas:
+                prueba['objetivo'] = min(presupuesto, prueba['max_epochs'])
+            resultados = list(pool.map(_ejecutar_prueba, vivas)) if pool else [_ejecutar_prueba(p) for p in vivas]
+            for resultado in resultados:
+                pruebas[resultado['id']] = resultado
+
+            #! Las que ya agotaron su max_epochs terminan; del resto sigue el mejor 1/eta
+            #! (la última que quede sigue sola hasta su max_epochs)
+            pendientes = [r for r in resultados if r['epocas'] < r['max_epochs']]
+            pendientes.sort(key=_clave_orden)
+            n_siguen = max(1, len(pendientes) // eta) if pendientes else 0
+            for podada in pendientes[n_siguen:]:
+                podada['estado'] = f"podada (ronda {ronda})"
+            vivas = pendientes[:n_siguen]
+            presupuesto *= eta
+            ronda += 1
+    finally:
+        if pool:
+            pool.shutdown()
+
+    pruebas.sort(key=_clave_ranking)
+    if archivo_resultados:
+        escribir_resultados(pruebas, archivo_resultados)
+    return pruebas[0], pruebas
+
+
+def _clave_orden(prueba):
+    #! Mejor = mayor accuracy de validación; a igualdad, menor loss de validación
+    return (-prueba['accuracy_validacion'], prueba['loss_validacion'])
+
+
+def _clave_ranking(prueba):
+    #! Orden final: las completas entre sí por _clave_orden; las podadas detrás,
+    #! las que llegaron más lejos primero (sus métricas son de menos épocas)
+    podada = prueba['epocas'] < prueba['max_epochs']
+    return (podada, -prueba['epocas'] if podada else 0) + _clave_orden(prueba)
+
+
+def escribir_resultados(pruebas, archivo):
+    #! Tabla CSV: una fila por prueba con su configuración y métricas
+    claves = sorted({c for p in pruebas for c in p['configuracion']})
+    with open(archivo, 'w', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(['id'] + claves + ['epocas', 'loss_validacion', 'accuracy_validacion',
+                                             'loss_entrenamiento', 'tiempo', 'estado'])
+        for p in pruebas:
+            escritor.writerow([p['id']] + [p['configuracion'].get(c) for c in claves] +
+                              [p['epocas'], f"{p['loss_validacion']:.6f}", f"{p['accuracy_validacion']:.4f}",
+                               f"{p['loss_entrenamiento']:.6f}", f"{p['tiempo']:.3f}", p['estado']])
+
+
+def entrenar_configuracion(configuracion, X, Y, base=None, epocas=None):
+    #! Entrena desde cero una configuración con todo el dataset (modelo de producción)
+    #! `epocas`: por defecto el presupuesto completo de la configuración (su max_epochs)
+    mlp = _crear_mlp(configuracion, base or {})
+    epocas = epocas or configuracion.get('max_epochs', 100)
+    for _ in range(epocas):
+        mlp.train_epoch(X, Y, batch_size=configuracion.get('batch_size', 16), shuffle=True)
+    return mlp
+
+
+if __name__ == "__main__":
+    from entrenamiento_combinado import load_data_combinado, normalize, one_hot, mapeo_inv
+
+    X, Y_idx = load_data_combinado()
+    X = normalize(X)
+    Y = [one_hot(i, 4) for i in Y_idx]
+
+    #! Los valores que estaban fijos en main.py, entrenamiento.py y api_n8n.py, y alrededores
+    espacio = {
+        'n_hidden': [8, 16, 32, [16, 16]],
+        'lr': [0.005, 0.01, 0.05, 0.1],
+        'optimizador': ['sgd', 'adam'],
+        'max_epochs': [225, 675],
+    }
+    base = dict(n_inputs=8, n_outputs=4, backend=BACKEND_PREFERIDO, perdida="entropia_cruzada")
+
+    print(f"Probando {len(configuraciones_rejilla(espacio))} configuraciones en {os.cpu_count()} núcleos...")
+    inicio = time.time()
+    mejor, pruebas = buscar_hiperparametros(X, Y, espacio, base=base)
+    print(f"Búsqueda completada en {time.time() - inicio:.1f}s; tabla en resultados_busqueda.csv")
+    print(f"Mejor configuración: {mejor['configuracion']}")
+    print(f"  Validación: accuracy {mejor['accuracy_validacion']:.2%} | loss {mejor['loss_validacion']:.6f}")
+
+    #! Modelo de producción: la mejor configuración entrenada con todo el dataset
+    #! y todo su presupuesto de épocas
+    mlp = entrenar_configuracion(mejor['configuracion'], X, Y, base=base, epocas=mejor['max_epochs'])
+    mlp.etiquetas = [mapeo_inv[i] for i in range(4)]
+    mlp.guardar("modelo_mlp.mlpb")
+    with open("mejor_configuracion.json", 'w') as f:
+        json.dump(mejor['configuracion'], f, indent=2)
+    print("Modelo de producción guardado en modelo_mlp.mlpb (configuración en mejor_configuracion.json)")
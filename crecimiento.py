@@ -0,0 +1,159 @@
+#* ===== CRECER UNA RED ENTRENADA (NET2NET) =====
+#* Cambiar n_hidden obligaba a borrar el modelo y re-entrenar desde cero.
+#* Estas operaciones agrandan una red ya entrenada SIN cambiar lo que calcula,
+#* así que basta un ajuste fino corto para aprovechar la capacidad nueva:
+#*   - ensanchar: añade neuronas a una capa oculta copiando neuronas existentes
+#*     (mismos pesos de entrada) y repartiendo sus pesos de salida entre el
+#*     original y sus copias. La suma que recibe la capa siguiente no cambia.
+#*     El reparto es aleatorio (no a partes iguales) para que las copias
+#*     reciban gradientes distintos y dejen de ser idénticas al entrenar.
+#*   - profundizar: inserta una capa oculta ReLU con pesos identidad detrás de
+#*     una capa cuya salida es no negativa (sigmoid o ReLU): relu(h) = h.
+#* La red original no se modifica; el estado del optimizador se reinicia
+#* porque las formas de los parámetros cambian.
+#*
+#* Ejecutar: python crecimiento.py ancho [modelo]
+
+import os
+import sys
+import time
+import random
+from mlp import MLP
+from optimizadores import optimizador_desde_diccionario
+from entrenador import entrenar_con_parada_temprana, accuracy
+
+#! Activaciones cuya salida nunca es negativa: admiten una capa identidad ReLU detrás
+ACTIVACIONES_NO_NEGATIVAS = ('sigmoid', 'relu')
+
+
+def _ocultas(mlp):
+    return list(mlp.n_hidden) if isinstance(mlp.n_hidden, (list, tuple)) else [mlp.n_hidden]
+
+
+def _validar_capa(mlp, capa):
+    n_ocultas = len(mlp.capas) - 2
+    if not 0 <= capa < n_ocultas:
+        raise ValueError(f"Capa oculta inválida: {capa} (la red tiene {n_ocultas})")
+
+
+def red_con_pesos(mlp, ocultas, activaciones, pesos, sesgos):
+    #! Nueva MLP con la arquitectura y los pesos (listas) dados y el resto de la configuración
+    #! de `mlp` (backend, pérdida, lr, etiquetas, normalización, barajado); el optimizador
+    #! empieza sin estado
+    n_hidden = ocultas[0] if len(ocultas) == 1 and not isinstance(mlp.n_hidden, (list, tuple)) else ocultas
+    optimizador = optimizador_desde_diccionario({'nombre': mlp.optimizador.nombre,
+                                                 'hiperparametros': mlp.optimizador.hiperparametros()})
+    nueva = MLP(n_inputs=mlp.n_inputs, n_hidden=n_hidden, n_outputs=mlp.n_outputs, lr=mlp.lr,
+                backend=mlp.backend, activaciones=activaciones, optimizador=optimizador,
+                perdida=mlp.perdida, inicializar_pesos=False)
+    nueva.cargar_pesos({'capas': [{'w': W, 'b': b} for W, b in zip(pesos, sesgos)]})
+    nueva.etiquetas = mlp.etiquetas
+    nueva.normalizacion = mlp.normalizacion
+    nueva.rng_datos.setstate(mlp.rng_datos.getstate())
+    return nueva
+
+
+def copiar_pesos(mlp):
+    #! Copia de pesos y sesgos como listas, sea cual sea el backend
+    capas = mlp.pesos_como_listas()['capas']
+    return [[list(fila) for fila in c['w']] for c in capas], [list(c['b']) for c in capas]
+
+
+def ensanchar(mlp, nuevo_ancho, capa=0, seed=0):
+    #! Retorna una red con `nuevo_ancho` neuronas en la capa oculta `capa` (0 = la primera)
+    #! que produce las mismas salidas que `mlp` (salvo redondeo, ~1e-15)
+    _validar_capa(mlp, capa)
+    ancho = mlp.capas[capa + 1]
+    if nuevo_ancho < ancho:
+        raise ValueError(f"El nuevo ancho ({nuevo_ancho}) es menor que el actual ({ancho})")
+    rng = random.Random(seed)
+    pesos, sesgos = copiar_pesos(mlp)
+
+    #! Neurona original de cada neurona de la capa ensanchada
+    origen = list(range(ancho)) + [rng.randrange(ancho) for _ in range(nuevo_ancho - ancho)]
+
+    #! Fracción de los pesos de salida de cada neurona: las copias de una
+    #! misma neurona (incluida ella) se reparten su peso con fracciones que suman 1
+    fracciones = [1.0] * nuevo_ancho
+    for j in set(origen[ancho:]):
+        copias = [k for k, o in enumerate(origen) if o == j]
+        partes = [rng.uniform(0.5, 1.5) for _ in copias]
+        total = sum(partes)
+        for k, parte in zip(copias, partes):
+            fracciones[k] = parte / total
+
+    W, b, W_sig = pesos[capa], sesgos[capa], pesos[capa + 1]
+    pesos[capa] = [list(W[o]) for o in origen]
+    sesgos[capa] = [b[o] for o in origen]
+    pesos[capa + 1] = [[fila[o] * f for o, f in zip(origen, fracciones)] for fila in W_sig]
+
+    ocultas = _ocultas(mlp)
+    ocultas[capa] = nuevo_ancho
+    return red_con_pesos(mlp, ocultas, mlp.activaciones, pesos, sesgos)
+
+
+def profundizar(mlp, capa=0):
+    #! Retorna una red con una capa oculta ReLU nueva justo después de la capa oculta `capa`,
+    #! del mismo ancho y con pesos identidad: produce exactamente las mismas salidas
+    _validar_capa(mlp, capa)
+    if mlp.activaciones[capa] not in ACTIVACIONES_NO_NEGATIVAS:
+        raise ValueError(f"No se puede insertar una capa identidad detrás de '{mlp.activaciones[capa]}': "
+                         f"su salida puede ser negativa (opciones: {ACTIVACIONES_NO_NEGATIVAS})")
+    ancho = mlp.capas[capa + 1]
+    pesos, sesgos = copiar_pesos(mlp)
+    pesos.insert(capa + 1, [[1.0 if i == j else 0.0 for j in range(ancho)] for i in range(ancho)])
+    sesgos.insert(capa + 1, [0.0] * ancho)
+
+    ocultas = _ocultas(mlp)
+    ocultas.insert(capa + 1, ancho)
+    activaciones = list(mlp.activaciones)
+    activaciones.insert(capa + 1, 'relu')
+    return red_con_pesos(mlp, ocultas, activaciones, pesos, sesgos)
+
+
+def diferencia_salidas(a, b, X):
+    #! Mayor diferencia absoluta entre las salidas de dos redes sobre X
+    return max(abs(float(u) - float(v))
+               for fila_a, fila_b in zip(a.predict_proba(X), b.predict_proba(X))
+               for u, v in zip(fila_a, fila_b))
+
+
+if __name__ == "__main__":
+    #! Uso: python crecimiento.py ancho [modelo]
+    #! Ensancha la capa oculta del modelo de producción, lo afina y lo guarda en el mismo archivo
+    from entrenamiento_combinado import load_data_combinado, parametros_normalizacion, one_hot
+    from mlp import BACKEND_PREFERIDO
+
+    if len(sys.argv) < 2:
+        print("Uso: python crecimiento.py ancho [modelo]")
+        sys.exit(1)
+    nuevo_ancho = int(sys.argv[1])
+    modelo = sys.argv[2] if len(sys.argv) > 2 else ("modelo_mlp.mlpb" if os.path.exists("modelo_mlp.mlpb")
+                                                    else "modelo_mlp.json")
+
+    X, Y_idx = load_data_combinado()
+    Y = [one_hot(i, 4) for i in Y_idx]
+
+    inicio = time.perf_counter()
+    mlp = MLP.cargar(modelo, backend=BACKEND_PREFERIDO)
+    if mlp is None:
+        #! MLP.cargar ya mostró el motivo (archivo inexistente, corrupto, un ensemble...)
+        print(f"No se pudo cargar el modelo '{modelo}'; entrénalo primero con main.py")
+        sys.exit(1)
+    #! Se afina con la normalización guardada en el modelo, la misma con la que predice;
+    #! los modelos anteriores a guardarla la toman del recursos.csv actual (como main.py)
+    if mlp.normalizacion is None:
+        mlp.normalizacion = parametros_normalizacion(X)
+    X = [mlp.normalizar_entrada(x) for x in X]
+    ancha = ensanchar(mlp, nuevo_ancho)
+    print(f"\n{' -> '.join(map(str, mlp.capas))}  =>  {' -> '.join(map(str, ancha.capas))}")
+    print(f"  Mayor diferencia en las salidas: {diferencia_salidas(mlp, ancha, X):.2e}")
+    print(f"  Accuracy antes del ajuste: {accuracy(ancha, X, Y):.2%}")
+
+    #! Ajuste fino corto: mismas opciones que el entrenamiento de main.py, con pocas épocas
+    resultado = entrenar_con_parada_temprana(ancha, X, Y, max_epochs=300, batch_size=16, shuffle=True,
+                                             paciencia=20, min_delta=1e-5)
+    ancha.guardar(modelo)
+    print(f"  Ajuste fino: {resultado['epocas']} épocas ({resultado['motivo']}), "
+          f"loss {resultado['loss']:.6f}, accuracy {accuracy(ancha, X, Y):.2%}")
+    print(f"  Modelo guardado en '{modelo}' en {time.perf_counter() - inicio:.2f}s")
@@ -0,0 +1,146 @@
+#* ===== INFERENCIA CUANTIZADA A INT8 =====
+#* Cuantización posterior al entrenamiento para clasificar lotes grandes
+#* con menos memoria por proceso:
+#*   - Cada fila de pesos se guarda como enteros int8 con su propia escala:
+#*       W[i] ~ escala[i] * Q[i],  escala[i] = max|W[i]| / 127
+#*   - Los sesgos (pocos) y las activaciones siguen en coma flotante
+#* Con NumPy el producto se hace en float32 convirtiendo Q al vuelo: NumPy no
+#* usa BLAS para enteros y un producto int32 resulta 15-40 veces más lento.
+#* Sin NumPy las filas son array('b') (1 byte por peso en vez de un float de Python).
+
+import sys
+from array import array
+from activaciones import activar, activar_np
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+#! Mayor entero representable simétricamente en int8
+MAX_INT8 = 127
+
+
+def _escala(fila):
+    #! Escala de una fila: su mayor valor absoluto pasa a ser ±127
+    #! Una fila de ceros usa escala 1 para no dividir por cero
+    maximo = max(abs(w) for w in fila)
+    return maximo / MAX_INT8 if maximo > 0 else 1.0
+
+
+class MLPCuantizada:
+    #! Versión de solo inferencia de una MLP entrenada, con pesos int8 por fila
+    #! Ofrece la misma interfaz de predicción sin estado que MLP
+    #! (predict, predict_proba, predict_batch, predict_confianza)
+
+    def __init__(self, mlp):
+        self.backend = mlp.backend
+        self.capas = list(mlp.capas)
+        self.n_outputs = mlp.n_outputs
+        self.activaciones = list(mlp.activaciones)
+        self.etiquetas = mlp.etiquetas
+        self.pesos_q = []
+        self.escalas = []
+        self.sesgos = []
+
+        for W, b in zip(mlp.pesos, mlp.sesgos):
+            if self.backend == "numpy":
+                maximos = np.abs(W).max(axis=1)
+                escalas = np.where(maximos > 0, maximos / MAX_INT8, 1.0)
+                self.pesos_q.append(np.round(W / escalas[:, None]).astype(np.int8))
+                self.escalas.append(escalas.astype(np.float32))
+                self.sesgos.append(np.asarray(b, dtype=np.float32))
+            else:
+                escalas = [_escala(fila) for fila in W]
+                self.pesos_q.append([array('b', [round(w / s) for w in fila]) for fila, s in zip(W, escalas)])
+                self.escalas.append(escalas)
+                self.sesgos.append(list(b))
+
+    def predict_proba(self, X):
+        #! Propaga una matriz de N vectores y retorna sus N vectores de salida
+        if self.backend == "numpy":
+            salida = np.asarray(X, dtype=np.float32)
+            for Q, escalas, b, nombre in zip(self.pesos_q, self.escalas, self.sesgos, self.activaciones):
+                z = (salida @ Q.T.astype(np.float32)) * escalas + b
+                salida = activar_np(nombre, z)
+            return salida
+
+        salidas = []
+        for x in X:
+            entrada = x
+            for Q, escalas, b, nombre in zip(self.pesos_q, self.escalas, self.sesgos, self.activaciones):
+                z = [s * sum(q * xi for q, xi in zip(fila, entrada)) + bi
+                     for fila, s, bi in zip(Q, escalas, b)]
+                entrada = activar(nombre, z)
+            salidas.append(entrada)
+        return salidas
+
+    def predict_batch(self, X):
+        #! Retorna (índices de clase, salidas de la red) para todo el lote
+        probas = self.predict_proba(X)
+        if self.backend == "numpy":
+            return np.argmax(probas, axis=1).tolist(), probas
+        indices = [max(range(len(o)), key=lambda i: o[i]) for o in probas]
+        return indices, probas
+
+    def predict_confianza(self, x):
+        indices, probas = self.predict_batch([x])
+        idx = indices[0]
+        return idx, float(probas[0][idx])
+
+    def predict(self, x):
+        return self.predict_confianza(x)[0]
+
+
+def cuantizar(mlp):
+    #! Cuantiza una MLP entrenada; el modelo original no se modifica
+    return MLPCuantizada(mlp)
+
+
+#*==================== MEDICIONES ===================
+
+def _bytes(valor):
+    #! Memoria ocupada por una matriz o vector (arreglo, array o listas anidadas)
+    if np is not None and isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, array):
+        return sys.getsizeof(valor)
+    if isinstance(valor, list):
+        return sys.getsizeof(valor) + sum(_bytes(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def bytes_pesos(modelo):
+    #! Memoria de los parámetros de una MLP o de una MLPCuantizada
+    if isinstance(modelo, MLPCuantizada):
+        partes = modelo.pesos_q + modelo.escalas + modelo.sesgos
+    else:
+        partes = modelo.pesos + modelo.sesgos
+    return sum(_bytes(p) for p in partes)
+
+
+def evaluar_cuantizacion(mlp, X, Y, cuantizada=None):
+    #! Compara la red original con su versión int8 sobre (X, Y) en one-hot
+    #! Retorna accuracy de ambas, su diferencia, la proporción de predicciones
+    #! idénticas, la mayor diferencia en las salidas y la memoria de los pesos
+    if cuantizada is None:
+        cuantizada = cuantizar(mlp)
+    indices_o, probas_o = mlp.predict_batch(X)
+    indices_q, probas_q = cuantizada.predict_batch(X)
+
+    def acc(indices):
+        return sum(1 for pred, y in zip(indices, Y) if y[pred] == max(y)) / len(X)
+
+    acc_original = acc(indices_o)
+    acc_cuantizada = acc(indices_q)
+    return {
+        'accuracy_original': acc_original,
+        'accuracy_cuantizada': acc_cuantizada,
+        'delta_accuracy': acc_cuantizada - acc_original,
+        'coincidencia': sum(1 for a, b in zip(indices_o, indices_q) if a == b) / len(X),
+        'error_max_salida': max(abs(float(a) - float(b))
+                                for fila_o, fila_q in zip(probas_o, probas_q)
+                                for a, b in zip(fila_o, fila_q)),
+        'bytes_original': bytes_pesos(mlp),
+        'bytes_cuantizada': bytes_pesos(cuantizada)
+    }
@@ -0,0 +1,157 @@
+#* ===== ENSEMBLE DE MLPs =====
+#* Con una sola red, la semilla de inicialización decide en parte cuán buena sale.
+#* Un ensemble entrena K redes iguales con semillas distintas y promedia sus
+#* probabilidades: predicciones más estables a cambio de K entrenamientos.
+#*   - Los K entrenamientos corren en paralelo en un pool de procesos
+#*     (uno por núcleo), así el tiempo de reloj no se multiplica por K
+#*   - Con NumPy la inferencia apila los pesos de los K miembros y hace una
+#*     sola propagación por lotes: (K x N x entrada) @ (K x entrada x salida)
+#*   - Se guarda como un único archivo .mlpb
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from mlp import MLP
+from entrenador import entrenar_con_parada_temprana
+from activaciones import activar_np
+import formato_binario
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+#*==================== ENTRENAMIENTO EN PARALELO ===================
+
+def _entrenar_miembro(semilla, X, Y, configuracion, opciones):
+    #! Se ejecuta en un proceso del pool: crea y entrena una red con su semilla
+    #! Debe estar a nivel de módulo para poder enviarse a otro proceso
+    mlp = MLP(seed=semilla, **configuracion)
+    resultado = entrenar_con_parada_temprana(mlp, X, Y, **opciones)
+    resultado.pop('historial')
+    return mlp, resultado
+
+
+def entrenar_ensemble(X, Y, n_miembros=5, semillas=None, procesos=None, configuracion=None, **opciones):
+    #! Entrena `n_miembros` redes con semillas distintas en paralelo
+    #! Args:
+    #!   X, Y: dataset (Y en one-hot)
+    #!   semillas: una por miembro (por defecto 42, 43, ...)
+    #!   procesos: tamaño del pool (por defecto, uno por núcleo y como máximo uno por miembro)
+    #!   configuracion: argumentos de MLP (n_inputs, n_hidden, n_outputs, backend, ...)
+    #!   opciones: se pasan a entrenar_con_parada_temprana (max_epochs, paciencia, ...)
+    #! Retorna (Ensemble, lista con el resultado del entrenamiento de cada miembro)
+    if semillas is None:
+        semillas = [42 + k for k in range(n_miembros)]
+    if procesos is None:
+        procesos = min(len(semillas), os.cpu_count() or 1)
+    configuracion = dict(configuracion or {})
+
+    if procesos <= 1:
+        entrenados = [_entrenar_miembro(s, X, Y, configuracion, opciones) for s in semillas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [pool.submit(_entrenar_miembro, s, X, Y, configuracion, opciones) for s in semillas]
+            entrenados = [f.result() for f in futuros]
+
+    miembros = [mlp for mlp, _ in entrenados]
+    return Ensemble(miembros, semillas), [resultado for _, resultado in entrenados]
+
+
+#*==================== INFERENCIA PROMEDIADA ===================
+
+class Ensemble:
+    #! Conjunto de MLPs con la misma arquitectura cuya salida es el promedio
+    #! de las salidas de cada miembro
+    #! Ofrece la interfaz de predicción sin estado de MLP (normalizar_entrada incluida)
+
+    def __init__(self, miembros, semillas=None):
+        if not miembros:
+            raise ValueError("El ensemble necesita al menos un miembro")
+        base = miembros[0]
+        for mlp in miembros[1:]:
+            if mlp.capas != base.capas or mlp.activaciones != base.activaciones:
+                raise ValueError("Todos los miembros del ensemble deben tener la misma arquitectura")
+        self.miembros = list(miembros)
+        self.semillas = list(semillas) if semillas is not None else None
+        self.backend = base.backend
+        self.n_outputs = base.n_outputs
+        self.etiquetas = base.etiquetas
+
+        #! Pesos apilados: una matriz (K x salida x entrada) y un sesgo (K x 1 x salida) por capa
+        if self.backend == "numpy":
+            self.pesos_apilados = [np.stack([mlp.pesos[l].T for mlp in miembros])
+                                   for l in range(len(base.pesos))]
+            self.sesgos_apilados = [np.stack([mlp.sesgos[l] for mlp in miembros])[:, None, :]
+                                    for l in range(len(base.sesgos))]
+
+    def __len__(self):
+        return len(self.miembros)
+
+    def predict_proba(self, X):
+        #! Promedio de las salidas de los K miembros para N vectores
+        if self.backend == "numpy":
+            #! Una sola propagación para todos los miembros: la entrada se comparte (broadcast)
+            salida = np.asarray(X, dtype=float)[None, :, :]
+            for W, b, nombre in zip(self.pesos_apilados, self.sesgos_apilados, self.miembros[0].activaciones):
+                salida = activar_np(nombre, salida @ W + b)
+            return salida.mean(axis=0)
+
+        todas = [mlp.predict_proba(X) for mlp in self.miembros]
+        k = len(todas)
+        return [[sum(valores) / k for valores in zip(*filas)] for filas in zip(*todas)]
+
+    def predict_batch(self, X):
+        #! Retorna (índices de clase, salidas promediadas) para todo el lote
+        probas = self.predict_proba(X)
+        if self.backend == "numpy":
+            return np.argmax(probas, axis=1).tolist(), probas
+        indices = [max(range(len(o)), key=lambda i: o[i]) for o in probas]
+        return indices, probas
+
+    def predict_confianza(self, x):
+        indices, probas = self.predict_batch([x])
+        idx = indices[0]
+        return idx, float(probas[0][idx])
+
+    def predict(self, x):
+        return self.predict_confianza(x)[0]
+
+    def normalizar_entrada(self, x):
+        #! Todos los miembros comparten la normalización del primero (la que se guarda)
+        return self.miembros[0].normalizar_entrada(x)
+
+    #*==================== PERSISTENCIA ===================
+    #* Un solo .mlpb: el primer miembro ocupa el lugar del modelo y el resto
+    #* van como bloques adicionales. Es un artefacto de inferencia: solo se
+    #* guarda el estado del optimizador del primer miembro. La cabecera lleva
+    #* tipo "ensemble": MLP.cargar rechaza el archivo en vez de leer solo un miembro.
+
+    def guardar(self, archivo="ensemble.mlpb", dtype="float64"):
+        extras = {}
+        for k, mlp in enumerate(self.miembros[1:], start=1):
+            for l, (W, b) in enumerate(zip(mlp.pesos, mlp.sesgos)):
+                extras[f"miembro{k}.w{l}"] = W
+                extras[f"miembro{k}.b{l}"] = b
+        metadatos = {'ensemble': {'n_miembros': len(self.miembros), 'semillas': self.semillas}}
+        formato_binario.guardar_binario(self.miembros[0], archivo, dtype=dtype,
+                                        metadatos=metadatos, extras=extras, tipo="ensemble")
+
+    @classmethod
+    def cargar(cls, archivo="ensemble.mlpb", backend="python"):
+        #! Lanza ValueError si el archivo no contiene un ensemble
+        base, metadatos, extras = formato_binario.leer_binario(archivo, backend=backend, tipo="ensemble")
+        info = metadatos['ensemble']
+
+        miembros = [base]
+        n_capas = len(base.capas) - 1
+        for k in range(1, info['n_miembros']):
+            mlp = MLP(n_inputs=base.n_inputs, n_hidden=base.n_hidden, n_outputs=base.n_outputs,
+                      lr=base.lr, backend=backend, activaciones=base.activaciones,
+                      perdida=base.perdida, inicializar_pesos=False)
+            mlp.pesos = [extras[f"miembro{k}.w{l}"] for l in range(n_capas)]
+            mlp.sesgos = [extras[f"miembro{k}.b{l}"] for l in range(n_capas)]
+            mlp.etiquetas = base.etiquetas
+            mlp.normalizacion = base.normalizacion
+            miembros.append(mlp)
+        return cls(miembros, info['semillas'])
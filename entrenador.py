@@ -0,0 +1,201 @@
+#* ===== BUCLE DE ENTRENAMIENTO CON PARADA TEMPRANA =====
+#* En lugar de entrenar un número fijo de épocas "a ciegas", este módulo
+#* detiene el entrenamiento cuando:
+#*   - la métrica monitorizada deja de mejorar durante `paciencia` épocas
+#*   - se alcanza la accuracy objetivo
+#*   - se agota el presupuesto de tiempo real (segundos)
+#*   - se llega al máximo de épocas
+#* Al terminar puede restaurar los mejores pesos vistos durante el entrenamiento.
+#*
+#* Con `checkpoint` guarda periódicamente todo el estado del entrenamiento
+#* (pesos, optimizador, época, generador de barajado, mejor métrica y mejores
+#* pesos) en un archivo .mlpb. Si el proceso se interrumpe, volver a llamar
+#* con el mismo checkpoint continúa exactamente donde se quedó.
+
+import os
+import copy
+import time
+import formato_binario
+
+
+def accuracy(mlp, X, Y):
+    #! Proporción de muestras cuya clase predicha coincide con el one-hot esperado
+    indices, _ = mlp.predict_batch(X)
+    correctas = sum(1 for pred, y in zip(indices, Y) if y[pred] == max(y))
+    return correctas / len(X)
+
+
+def _foto_pesos(mlp):
+    #! Copia independiente de pesos y sesgos (sin el resto del modelo)
+    return copy.deepcopy((mlp.pesos, mlp.sesgos))
+
+
+#*==================== CHECKPOINTS ===================
+
+def guardar_checkpoint(mlp, archivo, estado, mejores_pesos=None):
+    #! Escribe el estado de un entrenamiento en curso
+    #! `estado`: contadores del bucle (época, mejor métrica, historial...), serializables a JSON
+    #! La escritura es atómica (temporal + renombrado): un corte nunca deja el archivo a medias
+    extras = {}
+    if mejores_pesos is not None:
+        for l, (W, b) in enumerate(zip(*mejores_pesos)):
+            extras[f"mejor.w{l}"] = W
+            extras[f"mejor.b{l}"] = b
+    version, interno, gauss = mlp.rng_datos.getstate()
+    metadatos = dict(estado, rng_datos=[version, list(interno), gauss])
+    formato_binario.guardar_binario(mlp, archivo, metadatos=metadatos, extras=extras)
+
+
+def cargar_checkpoint(archivo, backend="python"):
+    #! Lee un checkpoint escrito por guardar_checkpoint
+    #! Retorna (mlp, estado, mejores_pesos); el mlp queda con su lr original
+    #! (sin el del planificador) y con el generador de barajado restaurado
+    mlp, estado, extras = formato_binario.leer_binario(archivo, backend=backend)
+    version, interno, gauss = estado.pop('rng_datos')
+    mlp.rng_datos.setstate((version, tuple(interno), gauss))
+    mlp.lr = estado['lr_original']
+
+    mejores_pesos = None
+    if extras:
+        n_capas = len(mlp.capas) - 1
+        mejores_pesos = ([extras[f"mejor.w{l}"] for l in range(n_capas)],
+                         [extras[f"mejor.b{l}"] for l in range(n_capas)])
+    return mlp, estado, mejores_pesos
+
+
+def reanudar_entrenamiento(archivo, X, Y, backend="python", **opciones):
+    #! Continúa un entrenamiento interrumpido solo con el checkpoint
+    #! `opciones` deben ser las mismas de la llamada original (max_epochs, paciencia, planificador...)
+    #! Retorna (mlp, resultado de entrenar_con_parada_temprana)
+    mlp = cargar_checkpoint(archivo, backend)[0]
+    return mlp, entrenar_con_parada_temprana(mlp, X, Y, checkpoint=archivo, **opciones)
+
+
+def entrenar_con_parada_temprana(mlp, X, Y, max_epochs=5000, batch_size=1, shuffle=False,
+                                 monitor="loss", paciencia=50, min_delta=0.0,
+                                 accuracy_objetivo=None, tiempo_max=None,
+                                 restaurar_mejor=True, mostrar_cada=None, planificador=None,
+                                 checkpoint=None, checkpoint_cada=10):
+    #! Entrena `mlp` hasta que se cumpla alguno de los criterios de parada
+    #! Args:
+    #!   X, Y: dataset (Y en one-hot)
+    #!   max_epochs: tope de épocas
+    #!   batch_size, shuffle: se pasan a train_epoch
+    #!   monitor: "loss" (menor es mejor) o "accuracy" (mayor es mejor)
+    #!   paciencia: épocas sin mejora (mayor a min_delta) antes de parar; None la desactiva
+    #!   accuracy_objetivo: para en cuanto la accuracy llega a este valor
+    #!   tiempo_max: presupuesto en segundos de reloj
+    #!   restaurar_mejor: deja en la red los pesos de la mejor época
+    #!   mostrar_cada: imprime el progreso cada N épocas (None = silencioso)
+    #!   planificador: función época -> lr (ver planificadores_lr); al terminar se restaura el lr original
+    #!   checkpoint: archivo .mlpb donde guardar el progreso cada `checkpoint_cada` épocas;
+    #!               si ya existe, se reanuda desde él (sobre `mlp`) y se borra al terminar
+    #! Retorna un diccionario con épocas, mejor época, métricas, motivo de parada e historial
+
+    if monitor not in ("loss", "accuracy"):
+        raise ValueError(f"Monitor desconocido: {monitor!r} (opciones: 'loss', 'accuracy')")
+
+    necesita_accuracy = monitor == "accuracy" or accuracy_objetivo is not None or mostrar_cada
+
+    mejor_valor = None
+    mejor_epoca = 0
+    mejores_pesos = None
+    sin_mejora = 0
+    historial = []
+    motivo = "max_epochs"
+
+    lr_original = mlp.lr
+    epoca_inicial = 0
+    tiempo_previo = 0.0
+
+    if checkpoint is not None and os.path.exists(checkpoint):
+        guardado, estado, mejores_pesos = cargar_checkpoint(checkpoint, mlp.backend)
+        if guardado.capas != mlp.capas:
+            raise ValueError(f"El checkpoint '{checkpoint}' es de otra arquitectura: {guardado.capas}")
+        mlp.pesos, mlp.sesgos = guardado.pesos, guardado.sesgos
+        mlp.optimizador = guardado.optimizador
+        mlp.rng_datos = guardado.rng_datos
+        mlp.lr = lr_original = guardado.lr
+        epoca_inicial = estado['epoca']
+        tiempo_previo = estado['tiempo']
+        mejor_valor = estado['mejor_valor']
+        mejor_epoca = estado['mejor_epoca']
+        sin_mejora = estado['sin_mejora']
+        historial = estado['historial']
+        if mostrar_cada:
+            print(f"  Reanudando desde el checkpoint '{checkpoint}' (época {epoca_inicial})")
+
+    tiempo_inicio = time.time() - tiempo_previo
+    epoca = epoca_inicial
+    for epoca in range(epoca_inicial + 1, max_epochs + 1):
+        if planificador is not None:
+            mlp.lr = planificador(epoca - 1)
+        loss = mlp.train_epoch(X, Y, batch_size=batch_size, shuffle=shuffle)
+        acc = accuracy(mlp, X, Y) if necesita_accuracy else None
+        historial.append({'epoca': epoca, 'loss': loss, 'accuracy': acc})
+
+        #! ¿Mejoró la métrica monitorizada?
+        valor = loss if monitor == "loss" else acc
+        if mejor_valor is None:
+            mejoro = True
+        elif monitor == "loss":
+            mejoro = valor < mejor_valor - min_delta
+        else:
+            mejoro = valor > mejor_valor + min_delta
+
+        if mejoro:
+            mejor_valor = valor
+            mejor_epoca = epoca
+            sin_mejora = 0
+            if restaurar_mejor:
+                mejores_pesos = _foto_pesos(mlp)
+        else:
+            sin_mejora += 1
+
+        transcurrido = time.time() - tiempo_inicio
+        if mostrar_cada and (epoca == 1 or epoca % mostrar_cada == 0):
+            print(f"  Época {epoca:5d}/{max_epochs} | Loss: {loss:.8f} | Acc: {acc:.2%} | "
+                  f"lr: {mlp.lr:.5f} | {transcurrido:.2f}s")
+
+        #! Criterios de parada
+        if accuracy_objetivo is not None and acc >= accuracy_objetivo:
+            motivo = "accuracy_objetivo"
+            break
+        if paciencia is not None and sin_mejora >= paciencia:
+            motivo = "paciencia"
+            break
+        if tiempo_max is not None and transcurrido >= tiempo_max:
+            motivo = "tiempo_max"
+            break
+
+        if checkpoint is not None and epoca % checkpoint_cada == 0:
+            estado = {
+                'epoca': epoca,
+                'tiempo': transcurrido,
+                'lr_original': lr_original,
+                'mejor_valor': mejor_valor,
+                'mejor_epoca': mejor_epoca,
+                'sin_mejora': sin_mejora,
+                'historial': historial
+            }
+            guardar_checkpoint(mlp, checkpoint, estado, mejores_pesos)
+
+    mlp.lr = lr_original
+    #! El entrenamiento terminó: el checkpoint ya no hace falta
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    #! Restaurar los mejores pesos vistos (si la última época no fue la mejor)
+    if restaurar_mejor and mejores_pesos is not None and mejor_epoca != epoca:
+        mlp.pesos, mlp.sesgos = mejores_pesos
+
+    mejor = historial[mejor_epoca - 1] if historial else {'loss': None, 'accuracy': None}
+    return {
+        'epocas': epoca,
+        'mejor_epoca': mejor_epoca,
+        'loss': mejor['loss'] if restaurar_mejor else historial[-1]['loss'],
+        'accuracy': mejor['accuracy'] if restaurar_mejor else historial[-1]['accuracy'],
+        'motivo': motivo,
+        'tiempo': time.time() - tiempo_inicio,
+        'historial': historial
+    }
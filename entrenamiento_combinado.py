@@ -5,8 +5,10 @@
 
 import csv
 import math
-from mlp import MLP
+from mlp import MLP, BACKEND_PREFERIDO
 from analizador import extraer_caracteristicas_para_mlp
+from entrenador import entrenar_con_parada_temprana
+from planificadores_lr import buscar_lr, CosenoLR
 
 
 #*===== MAPEOS DE COMPLEJIDAD =====
@@ -115,13 +117,16 @@ def get_codigo_algoritmo(nombre_algoritmo):
 
 #*===== CARGA DE DATOS =====
 
-def load_data_combinado(path="recursos.csv"):
+def load_data_combinado(path="recursos.csv", con_nombres=False):
     #! Carga datos de recursos.csv
     #! En lugar de usar características de ejecución, extrae características DEL CÓDIGO
     #! Esto permite que la MLP aprenda patrones de código, no solo resultados de ejecución
+    #! con_nombres: retorna además el nombre del algoritmo de cada muestra
+    #!              (para agrupar pliegues en validacion_cruzada.py)
     
     X = []
     Y_idx = []
+    nombres = []
     
     #! Cache para evitar recalcular características de algoritmos repetidos
     cache_features = {}
@@ -150,16 +155,35 @@ def load_data_combinado(path="recursos.csv"):
             
             X.append(cache_features[algoritmo])
             Y_idx.append(mapeo[complejidad])
+            nombres.append(algoritmo)
     
     print(f" {len(X)} muestras cargadas")
     print(f"  {len(cache_features)} algoritmos únicos")
     print(f"  Características: {len(X[0])} features extraídas del código")
     
+    if con_nombres:
+        return X, Y_idx, nombres
     return X, Y_idx
 
 
 #*===== NORMALIZACIÓN =====
 
+def parametros_normalizacion(X):
+    #! Mínimo y rango de cada característica, los que usa `normalize`
+    #! Sirven para normalizar vectores nuevos igual que el dataset de entrenamiento
+    #! (ej. exportar_predictor.py los integra en la primera capa)
+    minimos = []
+    rangos = []
+    for feat_idx in range(len(X[0])):
+        values = [x[feat_idx] for x in X]
+        min_val = min(values)
+        max_val = max(values)
+        minimos.append(min_val)
+        #! Evita división por cero
+        rangos.append(max_val - min_val if max_val != min_val else 1)
+    return minimos, rangos
+
+
 def normalize(X):
     #! Normaliza cada característica al rango [0, 1]
     #! Esto mejora el entrenamiento de la red neuronal
@@ -167,24 +191,10 @@ def normalize(X):
     if not X or len(X[0]) == 0:
         return X
     
-    num_features = len(X[0])
-    X_norm = [[0] * num_features for _ in range(len(X))]
-    
-    #! Para cada característica
-    for feat_idx in range(num_features):
-        #! Extrae todos los valores de esa característica
-        values = [x[feat_idx] for x in X]
-        #! Calcula mínimo y máximo
-        min_val = min(values)
-        max_val = max(values)
-        #! Evita división por cero
-        range_val = max_val - min_val if max_val != min_val else 1
-        
-        #! Normaliza usando: (valor - min) / (max - min)
-        for i, x in enumerate(X):
-            X_norm[i][feat_idx] = (x[feat_idx] - min_val) / range_val
+    minimos, rangos = parametros_normalizacion(X)
     
-    return X_norm
+    #! Normaliza usando: (valor - min) / (max - min)
+    return [[(v - min_val) / range_val for v, min_val, range_val in zip(x, minimos, rangos)] for x in X]
 
 
 #*===== ENTRENAMIENTO =====
@@ -219,35 +229,41 @@ def entrenar_mlp_combinado():
     
     #! Crea la red neuronal
     print("\n Creando red neuronal...")
-    mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=n_outputs, lr=0.1)
+    mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=n_outputs, lr=0.05, backend=BACKEND_PREFERIDO,
+              optimizador="adam", perdida="entropia_cruzada")
+    mlp.etiquetas = [mapeo_inv[i] for i in range(n_outputs)]
     
     print(f"   Arquitectura: 8 entradas → 16 ocultas → {n_outputs} salidas")
-    print(f"   Learning rate: 0.1")
+    #! El lr se elige con un LR range test sobre los datos actuales y luego decae con coseno
+    mlp.lr = buscar_lr(mlp, X, Y)[0]
+    print(f"   Learning rate: {mlp.lr:.4f} (sugerido por buscar_lr)")
+    print("   Optimizador: Adam")
+    print("   Salida: softmax + entropía cruzada")
     
-    #! Entrena la red
-    epochs = 5000
-    print(f"\n Entrenando por {epochs} épocas...\n")
+    #! Entrena la red con parada temprana (Adam + mini-batches barajados)
+    print("\n Entrenando hasta converger (máximo 2000 épocas)...\n")
     
-    for e in range(epochs):
-        loss = mlp.train_epoch(X, Y)
-        if e % 500 == 0:
-            #! Calcula accuracy en el dataset de entrenamiento
-            correct = sum(1 for x, yi in zip(X, Y_idx) if mlp.predict(x) == yi)
-            acc = correct / len(X)
-            print(f"  Época {e:5d} | Loss: {loss:.8f} | Acc: {acc:.2%} ({correct}/{len(X)})")
+    resultado = entrenar_con_parada_temprana(
+        mlp, X, Y,
+        max_epochs=2000,
+        batch_size=16,
+        shuffle=True,
+        paciencia=20,
+        min_delta=1e-5,
+        tiempo_max=60,
+        mostrar_cada=20,
+        planificador=CosenoLR(mlp.lr, epocas=300, lr_min=mlp.lr / 100)
+    )
+    print(f"\n Parada en la época {resultado['epocas']} ({resultado['motivo']})")
     
     #! Evaluación final del modelo
     print("\n" + "="*70)
     print("EVALUACIÓN FINAL")
     print("="*70)
     
-    predicciones = []
-    correct = 0
-    for x, yi in zip(X, Y_idx):
-        pred = mlp.predict(x)
-        predicciones.append((yi, pred))
-        if pred == yi:
-            correct += 1
+    indices, _ = mlp.predict_batch(X)
+    predicciones = list(zip(Y_idx, indices))
+    correct = sum(1 for yi, pred in predicciones if pred == yi)
     
     acc = correct / len(X)
     print(f"\n Accuracy global: {acc:.2%} ({correct}/{len(X)})")
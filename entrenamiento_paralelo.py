@@ -0,0 +1,356 @@
+#* ===== ENTRENAMIENTO EN PARALELO DE DATOS (MULTIPROCESO) =====
+#* Con un dataset grande, un solo núcleo ejecutando train_epoch es el cuello
+#* de botella. Aquí el dataset se reparte en fragmentos, uno por proceso:
+#*   - Síncrono: en cada paso cada proceso calcula el gradiente de su parte
+#*     del mini-batch y lo escribe en memoria compartida; el proceso principal
+#*     los suma (all-reduce), aplica el paso del optimizador y publica los
+#*     nuevos parámetros. Equivale a un mini-batch de `batch_size` muestras.
+#*   - Hogwild (asíncrono): cada proceso aplica SGD directamente sobre los
+#*     parámetros compartidos, sin locks ni esperas entre procesos.
+#* Los parámetros y gradientes viven en multiprocessing.RawArray: no se
+#* serializa nada por paso, solo se sincroniza con una barrera.
+
+import os
+import time
+import random
+import threading
+import multiprocessing as mp
+from mlp import MLP
+from optimizadores import SGD
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MODOS = ("sincrono", "hogwild")
+
+
+#*==================== PARÁMETROS EN UN VECTOR PLANO ===================
+#* Orden: por capa, las filas de W y luego el sesgo b
+
+def _formas(capas):
+    #! (n_salida, n_entrada) de cada capa
+    return list(zip(capas[1:], capas[:-1]))
+
+
+def _n_parametros(capas):
+    return sum(n_salida * n_entrada + n_salida for n_salida, n_entrada in _formas(capas))
+
+
+def _aplanar(pesos, sesgos, destino, backend, inicio=0):
+    #! Escribe pesos y sesgos en `destino` (arreglo NumPy, RawArray o lista) desde `inicio`
+    k = inicio
+    for W, b in zip(pesos, sesgos):
+        if backend == "numpy":
+            destino[k:k + W.size] = W.ravel()
+            k += W.size
+            destino[k:k + b.size] = b
+            k += b.size
+            continue
+        for fila in W:
+            destino[k:k + len(fila)] = fila
+            k += len(fila)
+        destino[k:k + len(b)] = b
+        k += len(b)
+
+
+def _desaplanar(origen, capas, backend):
+    #! Pesos y sesgos por capa a partir del vector plano
+    #! Con NumPy son vistas de `origen` (sin copia); sin NumPy, listas nuevas
+    pesos, sesgos = [], []
+    k = 0
+    for n_salida, n_entrada in _formas(capas):
+        if backend == "numpy":
+            pesos.append(origen[k:k + n_salida * n_entrada].reshape(n_salida, n_entrada))
+            k += n_salida * n_entrada
+            sesgos.append(origen[k:k + n_salida])
+        else:
+            pesos.append([list(origen[k + i * n_entrada:k + (i + 1) * n_entrada]) for i in range(n_salida)])
+            k += n_salida * n_entrada
+            sesgos.append(list(origen[k:k + n_salida]))
+        k += n_salida
+    return pesos, sesgos
+
+
+def _arquitectura(mlp):
+    #! Argumentos para reconstruir la red en otro proceso (sin pesos)
+    return dict(n_inputs=mlp.n_inputs, n_hidden=mlp.n_hidden, n_outputs=mlp.n_outputs, lr=mlp.lr,
+                backend=mlp.backend, activaciones=mlp.activaciones, perdida=mlp.perdida)
+
+
+def _fragmentos(n, procesos, seed):
+    #! Reparte los índices 0..n-1 al azar en `procesos` fragmentos de tamaño casi igual
+    indices = list(range(n))
+    random.Random(seed).shuffle(indices)
+    return [indices[w::procesos] for w in range(procesos)]
+
+
+def _preparar_fragmento(X, Y, indices, backend):
+    X = [X[k] for k in indices]
+    Y = [Y[k] for k in indices]
+    if backend == "numpy":
+        #! Una sola conversión: cada lote se toma por indexado
+        return np.asarray(X, dtype=float), np.asarray(Y, dtype=float)
+    return X, Y
+
+
+def _lote(X, Y, indices, backend):
+    if backend == "numpy":
+        return X[indices], Y[indices]
+    return [X[k] for k in indices], [Y[k] for k in indices]
+
+
+#*==================== MODO SÍNCRONO (ALL-REDUCE) ===================
+
+def _trabajador_sincrono(w, arquitectura, X, Y, parametros, gradientes, comando, barrera, lote, seed):
+    #! Bucle de un proceso: espera un paso, calcula el gradiente de su lote y lo
+    #! escribe en su fila de `gradientes` (último valor: el error del lote)
+    #! `comando`: índice del paso dentro de la época, o -1 para terminar
+    try:
+        mlp = MLP(inicializar_pesos=False, **arquitectura)
+        backend = mlp.backend
+        n_par = _n_parametros(mlp.capas)
+        inicio_fila = w * (n_par + 1)
+        if backend == "numpy":
+            #! Vistas de la memoria compartida: siempre ven los parámetros vigentes
+            mlp.pesos, mlp.sesgos = _desaplanar(np.frombuffer(parametros), mlp.capas, backend)
+            fila = np.frombuffer(gradientes)[inicio_fila:inicio_fila + n_par + 1]
+
+        orden = list(range(len(X)))
+        rng = random.Random(seed)
+        while True:
+            barrera.wait()
+            paso = comando.value
+            if paso < 0:
+                return
+            if paso == 0:
+                rng.shuffle(orden)
+            indices = orden[paso * lote:(paso + 1) * lote]
+
+            if not indices:
+                #! Fragmento agotado en este paso: no aporta gradiente
+                if backend == "numpy":
+                    fila[:] = 0.0
+                else:
+                    gradientes[inicio_fila:inicio_fila + n_par + 1] = [0.0] * (n_par + 1)
+            else:
+                if backend != "numpy":
+                    mlp.pesos, mlp.sesgos = _desaplanar(parametros, mlp.capas, backend)
+                (g_pesos, g_sesgos), loss = mlp.gradientes_lote(*_lote(X, Y, indices, backend))
+                if backend == "numpy":
+                    _aplanar(g_pesos, g_sesgos, fila, backend)
+                    fila[n_par] = loss
+                else:
+                    _aplanar(g_pesos, g_sesgos, gradientes, backend, inicio_fila)
+                    gradientes[inicio_fila + n_par] = loss
+            barrera.wait()
+    except threading.BrokenBarrierError:
+        return
+    except BaseException:
+        #! Rompe la barrera para que el proceso principal no espere para siempre
+        barrera.abort()
+        raise
+
+
+class EntrenadorParalelo:
+    #! Entrenamiento síncrono en paralelo de datos de una MLP
+    #! Los procesos se crean una vez y se reutilizan en cada época:
+    #!
+    #!   with EntrenadorParalelo(mlp, X, Y, procesos=4, batch_size=64) as entrenador:
+    #!       for _ in range(100):
+    #!           loss = entrenador.train_epoch()
+    #!
+    #! Cualquier optimizador sirve: el paso se aplica en el proceso principal
+    #! con mlp.aplicar_gradientes, sobre la suma de los gradientes de todos
+    #! Args:
+    #!   batch_size: muestras por actualización, entre todos los procesos
+    #!   procesos: número de procesos (por defecto uno por núcleo)
+    #!   seed: reparto de los fragmentos y orden de barajado de cada proceso
+
+    def __init__(self, mlp, X, Y, procesos=None, batch_size=32, seed=0):
+        self.mlp = mlp
+        self.n = len(X)
+        self.procesos = min(procesos or os.cpu_count() or 1, self.n)
+        #! Muestras por proceso en cada paso (redondeo hacia arriba)
+        self.lote = max(1, -(-batch_size // self.procesos))
+        self.n_par = _n_parametros(mlp.capas)
+
+        fragmentos = _fragmentos(self.n, self.procesos, seed)
+        self.pasos_por_epoca = -(-max(len(f) for f in fragmentos) // self.lote)
+
+        contexto = mp.get_context()
+        self.parametros = contexto.RawArray('d', self.n_par)
+        self.gradientes = contexto.RawArray('d', self.procesos * (self.n_par + 1))
+        self.comando = contexto.RawValue('i', 0)
+        self.barrera = contexto.Barrier(self.procesos + 1)
+        if mlp.backend == "numpy":
+            self._vista_parametros = np.frombuffer(self.parametros)
+            self._vista_gradientes = np.frombuffer(self.gradientes).reshape(self.procesos, self.n_par + 1)
+        else:
+            self._vista_parametros = self.parametros
+        _aplanar(mlp.pesos, mlp.sesgos, self._vista_parametros, mlp.backend)
+
+        arquitectura = _arquitectura(mlp)
+        self.trabajadores = []
+        for w, indices in enumerate(fragmentos):
+            X_w, Y_w = _preparar_fragmento(X, Y, indices, mlp.backend)
+            proceso = contexto.Process(target=_trabajador_sincrono, daemon=True,
+                                       args=(w, arquitectura, X_w, Y_w, self.parametros, self.gradientes,
+                                             self.comando, self.barrera, self.lote, seed + 1 + w))
+            proceso.start()
+            self.trabajadores.append(proceso)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def _esperar(self):
+        try:
+            self.barrera.wait()
+        except threading.BrokenBarrierError:
+            self.cerrar()
+            raise RuntimeError("Un proceso de entrenamiento terminó con error") from None
+
+    def _reducir(self):
+        #! Suma los gradientes y errores de todos los procesos
+        if self.mlp.backend == "numpy":
+            suma = self._vista_gradientes.sum(axis=0)
+        else:
+            filas = [self.gradientes[w * (self.n_par + 1):(w + 1) * (self.n_par + 1)]
+                     for w in range(self.procesos)]
+            suma = [sum(valores) for valores in zip(*filas)]
+        return _desaplanar(suma, self.mlp.capas, self.mlp.backend), float(suma[self.n_par])
+
+    def train_epoch(self):
+        #! Una época sobre todo el dataset; retorna el error promedio
+        if not self.trabajadores:
+            raise RuntimeError("El entrenador ya está cerrado")
+        total_loss = 0.0
+        for paso in range(self.pasos_por_epoca):
+            self.comando.value = paso
+            #! Primera barrera: los procesos leen los parámetros; segunda: gradientes escritos
+            self._esperar()
+            self._esperar()
+            gradientes, loss = self._reducir()
+            self.mlp.aplicar_gradientes(gradientes)
+            _aplanar(self.mlp.pesos, self.mlp.sesgos, self._vista_parametros, self.mlp.backend)
+            total_loss += loss
+        return total_loss / self.n
+
+    def cerrar(self):
+        #! Detiene los procesos (se puede llamar más de una vez)
+        if not self.trabajadores:
+            return
+        self.comando.value = -1
+        try:
+            self.barrera.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        for proceso in self.trabajadores:
+            proceso.join(timeout=5)
+            if proceso.is_alive():
+                proceso.terminate()
+        self.trabajadores = []
+
+
+#*==================== MODO HOGWILD (ASÍNCRONO) ===================
+
+def _restar_gradientes(parametros, g_pesos, g_sesgos, lr):
+    #! parametros -= lr * gradientes, elemento a elemento y sin lock (backend python)
+    k = 0
+    for g_W, g_b in zip(g_pesos, g_sesgos):
+        for fila in g_W + [g_b]:
+            for g in fila:
+                parametros[k] -= lr * g
+                k += 1
+
+
+def _trabajador_hogwild(w, arquitectura, X, Y, parametros, perdidas, epochs, batch_size, seed):
+    #! Entrena `epochs` épocas sobre su fragmento escribiendo directamente en `parametros`
+    #! Deja el error total de cada época en perdidas[w * epochs + época]
+    mlp = MLP(inicializar_pesos=False, **arquitectura)
+    backend = mlp.backend
+    if backend == "numpy":
+        #! Vistas de la memoria compartida: aplicar_gradientes (SGD) resta en el lugar
+        mlp.pesos, mlp.sesgos = _desaplanar(np.frombuffer(parametros), mlp.capas, backend)
+
+    orden = list(range(len(X)))
+    rng = random.Random(seed)
+    for epoca in range(epochs):
+        rng.shuffle(orden)
+        total_loss = 0.0
+        for inicio in range(0, len(orden), batch_size):
+            indices = orden[inicio:inicio + batch_size]
+            if backend != "numpy":
+                mlp.pesos, mlp.sesgos = _desaplanar(parametros, mlp.capas, backend)
+            gradientes, loss = mlp.gradientes_lote(*_lote(X, Y, indices, backend))
+            if backend == "numpy":
+                mlp.aplicar_gradientes(gradientes)
+            else:
+                _restar_gradientes(parametros, *gradientes, mlp.lr)
+            total_loss += loss
+        perdidas[w * epochs + epoca] = total_loss
+
+
+def entrenar_hogwild(mlp, X, Y, epochs=100, batch_size=16, procesos=None, seed=0):
+    #! Entrenamiento asíncrono estilo Hogwild: cada proceso recorre su fragmento
+    #! y actualiza los parámetros compartidos sin coordinarse con los demás
+    #! Solo admite SGD: el estado de otros optimizadores no se puede compartir sin locks
+    #! Actualiza `mlp` al terminar y retorna el error promedio de cada época
+    if not isinstance(mlp.optimizador, SGD):
+        raise ValueError("Hogwild solo admite el optimizador SGD")
+    procesos = min(procesos or os.cpu_count() or 1, len(X))
+
+    contexto = mp.get_context()
+    parametros = contexto.RawArray('d', _n_parametros(mlp.capas))
+    perdidas = contexto.RawArray('d', procesos * epochs)
+    vista = np.frombuffer(parametros) if mlp.backend == "numpy" else parametros
+    _aplanar(mlp.pesos, mlp.sesgos, vista, mlp.backend)
+
+    arquitectura = _arquitectura(mlp)
+    trabajadores = []
+    for w, indices in enumerate(_fragmentos(len(X), procesos, seed)):
+        X_w, Y_w = _preparar_fragmento(X, Y, indices, mlp.backend)
+        proceso = contexto.Process(target=_trabajador_hogwild, daemon=True,
+                                   args=(w, arquitectura, X_w, Y_w, parametros, perdidas,
+                                         epochs, batch_size, seed + 1 + w))
+        proceso.start()
+        trabajadores.append(proceso)
+    for proceso in trabajadores:
+        proceso.join()
+    if any(proceso.exitcode != 0 for proceso in trabajadores):
+        raise RuntimeError("Un proceso de entrenamiento terminó con error")
+
+    pesos, sesgos = _desaplanar(vista, mlp.capas, mlp.backend)
+    if mlp.backend == "numpy":
+        #! Copias: la memoria compartida se libera al salir
+        pesos, sesgos = [W.copy() for W in pesos], [b.copy() for b in sesgos]
+    mlp.pesos, mlp.sesgos = pesos, sesgos
+    return [sum(perdidas[w * epochs + e] for w in range(procesos)) / len(X) for e in range(epochs)]
+
+
+#*==================== INTERFAZ COMÚN ===================
+
+def entrenar_paralelo(mlp, X, Y, epochs=100, batch_size=32, procesos=None, modo="sincrono", seed=0):
+    #! Entrena `mlp` en el lugar durante `epochs` épocas con varios procesos
+    #! modo: "sincrono" (all-reduce de gradientes, cualquier optimizador) o "hogwild" (solo SGD)
+    #! Retorna un diccionario con el historial de error por época, el tiempo y los procesos
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconocido: {modo!r} (opciones: {MODOS})")
+    procesos = min(procesos or os.cpu_count() or 1, len(X))
+
+    inicio = time.perf_counter()
+    if modo == "hogwild":
+        historial = entrenar_hogwild(mlp, X, Y, epochs, batch_size, procesos, seed)
+    else:
+        with EntrenadorParalelo(mlp, X, Y, procesos, batch_size, seed) as entrenador:
+            historial = [entrenador.train_epoch() for _ in range(epochs)]
+    return {
+        'historial': historial,
+        'tiempo': time.perf_counter() - inicio,
+        'procesos': procesos,
+        'modo': modo
+    }
@@ -0,0 +1,180 @@
+#* ===== EXPORTAR UN PREDICTOR INDEPENDIENTE =====
+#* Para desplegar solo la predicción de una MLP entrenada, genera un módulo
+#* Python sin dependencias (ni mlp.py, ni NumPy, ni JSON):
+#*   - Los pesos van escritos como constantes dentro del código
+#*   - Los bucles están desenrollados para la arquitectura concreta
+#*     (una línea por neurona, una variable local por activación)
+#*   - La normalización min-max de las características se integra en la
+#*     primera capa: el módulo recibe las características SIN normalizar
+#*       W·((x - min) / rango) + b  =  (W / rango)·x + (b - W·(min / rango))
+#*   - predict compara los logits de salida sin calcular softmax/sigmoid
+#*     (ambas son crecientes: el argmax es el mismo)
+#*   - exp y tanh se pasan como argumentos por defecto: son variables locales
+#*     y no se buscan en el módulo en cada neurona
+#* El módulo generado ofrece predict, predict_confianza y predict_proba
+#* con la misma semántica que MLP (un vector de entrada cada vez).
+#*
+#* Ejecutar: python exportar_predictor.py [modelo] [salida.py] [--sin-normalizacion]
+
+import os
+import sys
+import py_compile
+from mlp import MLP
+
+#! Expresión de cada activación elemento a elemento sobre la variable `z`
+#! sigmoid como 0.5·tanh(z/2) + 0.5: estable y una sola llamada a C
+EXPRESIONES_ACTIVACION = {
+    'sigmoid': "0.5 * tanh(0.5 * {z}) + 0.5",
+    'tanh': "tanh({z})",
+    'relu': "{z} if {z} > 0.0 else 0.0",
+}
+
+
+def _pesos_como_listas(mlp):
+    #! Pesos y sesgos como listas de floats de Python, sea cual sea el backend
+    pesos = [[[float(w) for w in fila] for fila in W] for W in mlp.pesos]
+    sesgos = [[float(v) for v in b] for b in mlp.sesgos]
+    return pesos, sesgos
+
+
+def integrar_normalizacion(pesos, sesgos, minimos, rangos):
+    #! Retorna la primera capa equivalente a normalizar la entrada antes de ella
+    #! (el resto de capas no cambia)
+    W, b = pesos[0], sesgos[0]
+    W_nueva = [[w / r for w, r in zip(fila, rangos)] for fila in W]
+    b_nuevo = [bi - sum(w * m for w, m in zip(fila, minimos)) for fila, bi in zip(W_nueva, b)]
+    return [W_nueva] + pesos[1:], [b_nuevo] + sesgos[1:]
+
+
+def _combinacion(fila, entradas, sesgo):
+    #! "w0 * x0 - w1 * x1 + ... + b" con los floats exactos (repr); omite pesos nulos
+    codigo = repr(sesgo)
+    for w, x in zip(fila, entradas):
+        if w != 0.0:
+            codigo += f" - {-w!r} * {x}" if w < 0 else f" + {w!r} * {x}"
+    return codigo
+
+
+def _lineas_capas(pesos, sesgos, activaciones):
+    #! Código de todas las capas menos la activación final
+    #! Retorna (líneas, nombres de las variables con los logits de salida)
+    lineas = []
+    entradas = [f"x{j}" for j in range(len(pesos[0][0]))]
+    for l, (W, b) in enumerate(zip(pesos, sesgos)):
+        logits = [f"z{l}_{i}" for i in range(len(W))]
+        for z, fila, bi in zip(logits, W, b):
+            lineas.append(f"{z} = {_combinacion(fila, entradas, bi)}")
+        if l == len(pesos) - 1:
+            return lineas, logits
+        salidas = [f"a{l}_{i}" for i in range(len(W))]
+        expresion = EXPRESIONES_ACTIVACION[activaciones[l]]
+        for a, z in zip(salidas, logits):
+            lineas.append(f"{a} = {expresion.format(z=z)}")
+        entradas = salidas
+
+
+def _lineas_salida(logits, activacion):
+    #! Código que convierte los logits de salida en probabilidades (tupla `p`)
+    if activacion == 'softmax':
+        lineas = [f"m = max({', '.join(logits)})"]
+        lineas += [f"e{i} = exp({z} - m)" for i, z in enumerate(logits)]
+        lineas.append(f"s = {' + '.join(f'e{i}' for i in range(len(logits)))}")
+        lineas.append(f"p = ({', '.join(f'e{i} / s' for i in range(len(logits)))},)")
+        return lineas
+    expresion = EXPRESIONES_ACTIVACION[activacion]
+    return [f"p = ({', '.join(expresion.format(z=z) for z in logits)},)"]
+
+
+def generar_codigo(mlp, normalizacion=None, origen=None):
+    #! Código fuente del módulo predictor de `mlp`
+    #! normalizacion: (mínimos, rangos) por característica, o None si la red
+    #!                recibe las características tal como se le pasan
+    #! origen: nombre del modelo, solo para el comentario de cabecera
+    pesos, sesgos = _pesos_como_listas(mlp)
+    if normalizacion is not None:
+        pesos, sesgos = integrar_normalizacion(pesos, sesgos, *normalizacion)
+    capas, logits = _lineas_capas(pesos, sesgos, mlp.activaciones)
+    n_entradas = mlp.capas[0]
+    entradas = ", ".join(f"x{j}" for j in range(n_entradas))
+
+    def cuerpo(lineas):
+        return "\n".join(f"    {linea}" for linea in lineas)
+
+    arquitectura = " -> ".join(str(n) for n in mlp.capas)
+    return f'''# Predictor generado por exportar_predictor.py{f" desde {origen}" if origen else ""}. No editar.
+# Arquitectura: {arquitectura} ({", ".join(mlp.activaciones)})
+# Entrada: {n_entradas} características {"SIN normalizar (la normalización está integrada)" if normalizacion else "tal como las recibe la red"}
+from math import exp, tanh
+
+N_ENTRADAS = {n_entradas}
+ETIQUETAS = {tuple(mlp.etiquetas) if mlp.etiquetas else None!r}
+
+
+def predict_proba(x, exp=exp, tanh=tanh):
+    # Salidas de la red{" (probabilidades)" if mlp.activaciones[-1] == "softmax" else ""} para un vector
+    {entradas}{"," if n_entradas == 1 else ""} = x
+{cuerpo(capas)}
+{cuerpo(_lineas_salida(logits, mlp.activaciones[-1]))}
+    return p
+
+
+def predict(x, tanh=tanh):
+    # Índice de la clase predicha: argmax de los logits (sin activación final)
+    {entradas}{"," if n_entradas == 1 else ""} = x
+{cuerpo(capas)}
+    z = ({", ".join(logits)},)
+    return z.index(max(z))
+
+
+def predict_confianza(x):
+    # (clase predicha, activación de esa salida)
+    p = predict_proba(x)
+    idx = p.index(max(p))
+    return idx, p[idx]
+
+
+def predict_etiqueta(x):
+    # Nombre de la clase predicha (requiere ETIQUETAS)
+    return ETIQUETAS[predict(x)]
+'''
+
+
+def exportar_predictor(mlp, archivo="predictor_mlp.py", normalizacion=None, origen=None):
+    #! Escribe el módulo predictor de `mlp` en `archivo`
+    #! La escritura es atómica (temporal + renombrado), como en formato_binario
+    #! También deja compilado su .pyc: el primer import no tiene que compilar
+    #! cientos de líneas de expresiones
+    codigo = generar_codigo(mlp, normalizacion, origen)
+    temporal = archivo + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(codigo)
+    os.replace(temporal, archivo)
+    py_compile.compile(archivo, doraise=True)
+    return archivo
+
+
+if __name__ == "__main__":
+    #! Uso: python exportar_predictor.py [modelo] [salida.py] [--sin-normalizacion]
+    #! Por defecto exporta el modelo de main.py con la normalización de recursos.csv
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    sin_normalizacion = "--sin-normalizacion" in sys.argv
+    modelo = argumentos[0] if argumentos else ("modelo_mlp.mlpb" if os.path.exists("modelo_mlp.mlpb")
+                                               else "modelo_mlp.json")
+    destino = argumentos[1] if len(argumentos) > 1 else "predictor_mlp.py"
+
+    from entrenamiento_combinado import load_data_combinado, parametros_normalizacion, mapeo_inv
+
+    mlp = MLP.cargar(modelo)
+    if mlp.etiquetas is None:
+        #! Modelos guardados antes de que se guardaran las etiquetas
+        mlp.etiquetas = [mapeo_inv[i] for i in range(mlp.n_outputs)]
+    normalizacion = None
+    if not sin_normalizacion:
+        #! La normalización guardada con el modelo (la de su entrenamiento); los
+        #! modelos antiguos no la tienen: la de recursos.csv, con la que se entrenan
+        normalizacion = mlp.normalizacion
+        if normalizacion is None:
+            X, _ = load_data_combinado()
+            normalizacion = parametros_normalizacion(X)
+    exportar_predictor(mlp, destino, normalizacion, origen=modelo)
+    print(f"Predictor de '{modelo}' exportado a '{destino}'")
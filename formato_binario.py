@@ -0,0 +1,331 @@
+#* ===== FORMATO BINARIO DEL MODELO (.mlpb) =====
+#* Alternativa compacta a modelo_mlp.json:
+#*   - Cabecera pequeña: número mágico, versión y un JSON con arquitectura,
+#*     tipo de dato, etiquetas de las clases, normalización de las entradas,
+#*     tabla de bloques y checksum
+#*   - A continuación los pesos como bloques contiguos de float32/float64
+#*     (little-endian), alineados a 64 bytes
+#* Al cargar con el backend "numpy" el archivo se mapea en memoria (mmap) y los
+#* pesos son vistas sobre él: no se parsean números ni se copian datos.
+#* El mapeo es copy-on-write, así que entrenar el modelo cargado no modifica el archivo.
+#*
+#* Disposición del archivo:
+#*   [b"MLPB"][versión uint16][largo cabecera uint32][cabecera JSON][relleno][datos]
+
+import os
+import sys
+import json
+import mmap
+import struct
+import zlib
+from array import array
+
+#* NumPy es opcional: sin él se lee igual, pero copiando a listas de Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGICO = b"MLPB"
+VERSION_BINARIA = 1
+EXTENSION_BINARIA = ".mlpb"
+#! Qué contiene el archivo (campo 'tipo' de la cabecera): una MLP o un ensemble de MLPs
+TIPOS = ("mlp", "ensemble")
+ALINEACION = 64
+CABECERA_FIJA = struct.Struct("<4sHI")
+
+#! Tipos de dato soportados: nombre -> (código de array, dtype de NumPy, bytes por valor)
+DTYPES = {
+    'float32': ('f', '<f4', 4),
+    'float64': ('d', '<f8', 8),
+}
+
+
+def _alinear(n):
+    #! Redondea n hacia arriba al siguiente múltiplo de ALINEACION
+    return (n + ALINEACION - 1) // ALINEACION * ALINEACION
+
+
+def es_binario(archivo):
+    #! True si el archivo empieza con el número mágico del formato binario
+    try:
+        with open(archivo, 'rb') as f:
+            return f.read(len(MAGICO)) == MAGICO
+    except OSError:
+        return False
+
+
+#*==================== ESCRITURA ===================
+
+def _a_bytes(valor, dtype):
+    #! Convierte una matriz o vector (lista o arreglo) a (forma, bytes little-endian)
+    codigo, dtype_np, _ = DTYPES[dtype]
+    if np is not None and isinstance(valor, np.ndarray):
+        return list(valor.shape), np.ascontiguousarray(valor, dtype=dtype_np).tobytes()
+
+    if valor and isinstance(valor[0], list):
+        forma = [len(valor), len(valor[0])]
+        plano = [x for fila in valor for x in fila]
+    else:
+        forma = [len(valor)]
+        plano = valor
+    datos = array(codigo, plano)
+    if sys.byteorder == 'big':
+        datos.byteswap()
+    return forma, datos.tobytes()
+
+
+def _bloques_del_modelo(mlp, extras):
+    #! Lista (nombre, valor) de todo lo que va en la zona de datos:
+    #! pesos y sesgos de cada capa, los buffers del optimizador y los extras
+    bloques = []
+    for l, (W, b) in enumerate(zip(mlp.pesos, mlp.sesgos)):
+        bloques.append((f"w{l}", W))
+        bloques.append((f"b{l}", b))
+    for clave, valor in mlp.optimizador.estado.items():
+        if isinstance(valor, list):
+            for k, v in enumerate(valor):
+                bloques.append((f"opt.{clave}.{k}", v))
+    for nombre, valor in (extras or {}).items():
+        bloques.append((f"extra.{nombre}", valor))
+    return bloques
+
+
+def guardar_binario(mlp, archivo, dtype="float64", metadatos=None, extras=None, tipo="mlp"):
+    #! Escribe el modelo en formato binario
+    #! dtype: "float64" (sin pérdida) o "float32" (la mitad de tamaño)
+    #! metadatos: diccionario serializable a JSON que viaja en la cabecera
+    #! extras: {nombre: matriz o vector} guardados como bloques adicionales
+    #!         (ej. los mejores pesos en un checkpoint)
+    #! tipo: "mlp" o "ensemble"; cada cargador rechaza los archivos del otro tipo
+    #! Se escribe en un temporal y se renombra: el archivo nunca queda a medias
+    #! y los modelos que lo tengan mapeado en memoria siguen siendo válidos
+    from mlp import normalizacion_a_diccionario
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype desconocido: {dtype!r} (opciones: {list(DTYPES)})")
+    if tipo not in TIPOS:
+        raise ValueError(f"tipo desconocido: {tipo!r} (opciones: {list(TIPOS)})")
+
+    tabla = []
+    trozos = []
+    crc = 0
+    posicion = 0
+    for nombre, valor in _bloques_del_modelo(mlp, extras):
+        forma, datos = _a_bytes(valor, dtype)
+        tabla.append({'nombre': nombre, 'forma': forma, 'inicio': posicion})
+        trozos.append(datos)
+        crc = zlib.crc32(datos, crc)
+        posicion += len(datos)
+
+    optimizador = mlp.optimizador
+    cabecera = {
+        'tipo': tipo,
+        'arquitectura': {
+            'n_inputs': mlp.n_inputs,
+            'n_hidden': mlp.n_hidden,
+            'n_outputs': mlp.n_outputs,
+            'activaciones': mlp.activaciones,
+            'perdida': mlp.perdida,
+            'lr': mlp.lr
+        },
+        'dtype': dtype,
+        'etiquetas': mlp.etiquetas,
+        'normalizacion': normalizacion_a_diccionario(mlp.normalizacion),
+        'optimizador': {
+            'nombre': optimizador.nombre,
+            'hiperparametros': optimizador.hiperparametros(),
+            #! Contadores como `t` de Adam: van en la cabecera, no en los datos
+            'escalares': {c: v for c, v in optimizador.estado.items() if not isinstance(v, list)}
+        },
+        'metadatos': metadatos,
+        'bloques': tabla,
+        'bytes_datos': posicion,
+        'crc32': crc
+    }
+    texto = json.dumps(cabecera).encode('utf-8')
+    inicio_datos = _alinear(CABECERA_FIJA.size + len(texto))
+    relleno = b" " * (inicio_datos - CABECERA_FIJA.size - len(texto))
+
+    temporal = archivo + ".tmp"
+    with open(temporal, 'wb') as f:
+        f.write(CABECERA_FIJA.pack(MAGICO, VERSION_BINARIA, len(texto)))
+        f.write(texto)
+        f.write(relleno)
+        for datos in trozos:
+            f.write(datos)
+    os.replace(temporal, archivo)
+
+
+#*==================== LECTURA ===================
+
+def _leer_cabecera(buf, archivo):
+    #! Valida la parte fija y retorna (cabecera, inicio de los datos)
+    if len(buf) < CABECERA_FIJA.size:
+        raise ValueError(f"'{archivo}' no es un modelo binario (archivo demasiado corto)")
+    magico, version, largo = CABECERA_FIJA.unpack(bytes(buf[:CABECERA_FIJA.size]))
+    if magico != MAGICO:
+        raise ValueError(f"'{archivo}' no es un modelo binario (número mágico incorrecto)")
+    if version > VERSION_BINARIA:
+        raise ValueError(f"Formato binario v{version} no soportado (máximo v{VERSION_BINARIA})")
+
+    cabecera = json.loads(bytes(buf[CABECERA_FIJA.size:CABECERA_FIJA.size + largo]).decode('utf-8'))
+    inicio_datos = _alinear(CABECERA_FIJA.size + largo)
+    if len(buf) < inicio_datos + cabecera['bytes_datos']:
+        raise ValueError(f"'{archivo}' está truncado")
+    return cabecera, inicio_datos
+
+
+def _verificar(datos, cabecera, archivo):
+    if zlib.crc32(datos) != cabecera['crc32']:
+        raise ValueError(f"'{archivo}' está corrupto (el checksum no coincide)")
+
+
+def _leer_bloques_np(archivo, verificar):
+    #! Mapea el archivo y retorna vistas sin copia, una por bloque
+    buf = np.asarray(np.memmap(archivo, dtype=np.uint8, mode='c'))
+    cabecera, inicio = _leer_cabecera(buf, archivo)
+    datos = buf[inicio:inicio + cabecera['bytes_datos']]
+    if verificar:
+        _verificar(datos, cabecera, archivo)
+
+    datos = datos.view(DTYPES[cabecera['dtype']][1])
+    tamano = DTYPES[cabecera['dtype']][2]
+    bloques = {}
+    for bloque in cabecera['bloques']:
+        desde = bloque['inicio'] // tamano
+        n = 1
+        for d in bloque['forma']:
+            n *= d
+        bloques[bloque['nombre']] = datos[desde:desde + n].reshape(bloque['forma'])
+    return cabecera, bloques
+
+
+def _leer_bloques_python(archivo, verificar):
+    #! Igual que _leer_bloques_np pero convirtiendo cada bloque a listas
+    with open(archivo, 'rb') as f:
+        contenido = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        #! Las vistas se liberan explícitamente: el mmap no se puede cerrar con vistas vivas
+        vista = memoryview(contenido)
+        try:
+            cabecera, inicio = _leer_cabecera(vista, archivo)
+            if verificar:
+                with vista[inicio:inicio + cabecera['bytes_datos']] as datos:
+                    _verificar(datos, cabecera, archivo)
+
+            codigo, _, tamano = DTYPES[cabecera['dtype']]
+            bloques = {}
+            for bloque in cabecera['bloques']:
+                forma = bloque['forma']
+                n = forma[0] * (forma[1] if len(forma) > 1 else 1)
+                desde = inicio + bloque['inicio']
+                valores = array(codigo)
+                with vista[desde:desde + n * tamano] as trozo:
+                    valores.frombytes(trozo)
+                if sys.byteorder == 'big':
+                    valores.byteswap()
+                valores = valores.tolist()
+                if len(forma) > 1:
+                    valores = [valores[i * forma[1]:(i + 1) * forma[1]] for i in range(forma[0])]
+                bloques[bloque['nombre']] = valores
+        finally:
+            vista.release()
+    finally:
+        contenido.close()
+    return cabecera, bloques
+
+
+def cargar_binario(archivo, backend="python", verificar=True):
+    #! Carga un modelo guardado con guardar_binario
+    #! backend "numpy": pesos mapeados en memoria (sin copia)
+    #! backend "python": pesos copiados a listas
+    #! verificar: comprueba el checksum de los datos antes de usarlos
+    #! Lanza ValueError si el archivo no es válido o contiene un ensemble
+    return leer_binario(archivo, backend, verificar, tipo="mlp")[0]
+
+
+def _tipo(cabecera):
+    #! Los archivos anteriores al campo 'tipo' se reconocen por sus metadatos
+    if 'tipo' in cabecera:
+        return cabecera['tipo']
+    return "ensemble" if 'ensemble' in (cabecera.get('metadatos') or {}) else "mlp"
+
+
+def leer_binario(archivo, backend="python", verificar=True, tipo=None):
+    #! Como cargar_binario, pero retorna (mlp, metadatos, extras)
+    #! tipo: si se indica, lanza ValueError cuando el archivo es de otro tipo
+    from mlp import MLP, normalizacion_desde_diccionario
+    from optimizadores import crear_optimizador
+
+    if backend == "numpy" and np is None:
+        raise ImportError("El backend 'numpy' requiere tener NumPy instalado")
+    leer = _leer_bloques_np if backend == "numpy" else _leer_bloques_python
+    cabecera, bloques = leer(archivo, verificar)
+    if tipo is not None and _tipo(cabecera) != tipo:
+        cargador = "Ensemble.cargar" if _tipo(cabecera) == "ensemble" else "MLP.cargar"
+        raise ValueError(f"'{archivo}' contiene un {_tipo(cabecera)}, no un {tipo}: cárgalo con {cargador}")
+
+    arq = cabecera['arquitectura']
+    mlp = MLP(
+        n_inputs=arq['n_inputs'],
+        n_hidden=arq['n_hidden'],
+        n_outputs=arq['n_outputs'],
+        lr=arq['lr'],
+        backend=backend,
+        activaciones=arq['activaciones'],
+        perdida=arq['perdida'],
+        inicializar_pesos=False
+    )
+    n_capas = len(mlp.capas) - 1
+    mlp.pesos = [bloques[f"w{l}"] for l in range(n_capas)]
+    mlp.sesgos = [bloques[f"b{l}"] for l in range(n_capas)]
+    mlp.etiquetas = cabecera.get('etiquetas')
+    mlp.normalizacion = normalizacion_desde_diccionario(cabecera.get('normalizacion'))
+
+    #! Optimizador: hiperparámetros y contadores de la cabecera, buffers de los datos
+    datos_opt = cabecera['optimizador']
+    optimizador = crear_optimizador(datos_opt['nombre'], **datos_opt['hiperparametros'])
+    estado = dict(datos_opt['escalares'])
+    for nombre, valor in bloques.items():
+        if nombre.startswith("opt."):
+            _, clave, k = nombre.split(".")
+            estado.setdefault(clave, []).append((int(k), valor))
+    optimizador.estado = {
+        clave: [v for _, v in sorted(valor)] if isinstance(valor, list) else valor
+        for clave, valor in estado.items()
+    }
+    mlp.optimizador = optimizador
+
+    extras = {nombre[len("extra."):]: valor for nombre, valor in bloques.items() if nombre.startswith("extra.")}
+    return mlp, cabecera.get('metadatos'), extras
+
+
+#*==================== CONVERSIÓN DESDE/HACIA JSON ===================
+
+def convertir_json_a_binario(origen, destino, dtype="float64"):
+    #! Convierte un modelo JSON (formato 1 o 2) al formato binario
+    from mlp import MLP
+    with open(origen, 'r') as f:
+        modelo = json.load(f)
+    guardar_binario(MLP.desde_diccionario(modelo), destino, dtype=dtype)
+
+
+def convertir_binario_a_json(origen, destino):
+    #! Convierte un modelo binario al formato JSON versionado
+    mlp = cargar_binario(origen)
+    with open(destino, 'w') as f:
+        json.dump(mlp.a_diccionario(), f, indent=2)
+
+
+if __name__ == "__main__":
+    #! Uso: python formato_binario.py origen destino [float32|float64]
+    #! La dirección de la conversión se deduce del archivo de origen
+    if len(sys.argv) < 3:
+        print("Uso: python formato_binario.py origen destino [float32|float64]")
+        sys.exit(1)
+    origen, destino = sys.argv[1], sys.argv[2]
+    if es_binario(origen):
+        convertir_binario_a_json(origen, destino)
+    else:
+        convertir_json_a_binario(origen, destino, *sys.argv[3:4])
+    print(f"'{origen}' convertido a '{destino}'")
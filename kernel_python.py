@@ -0,0 +1,316 @@
+#* ===== NÚCLEO PURO PYTHON CON BUFFERS RESERVADOS =====
+#* Para los procesos que no pueden instalar NumPy. El backend "python" de MLP
+#* crea por cada muestra listas nuevas (copia de la entrada, salida de cada
+#* capa, deltas, generadores y zips de las sumas). Este núcleo:
+#*   - Guarda todos los pesos y sesgos en un único buffer plano
+#*     (por capa: las filas de W y luego b, el mismo orden que entrenamiento_paralelo)
+#*   - Reserva una sola vez los buffers de trabajo (entrada, salidas, logits,
+#*     deltas, gradientes acumulados) y los reutiliza en cada muestra
+#*   - Construye una sola vez los índices de los pesos de cada fila (tramos de
+#*     una única tupla 0..n-1): los enteros mayores que 256 no están en caché en
+#*     CPython y calcular `base + j` creaba uno nuevo por peso
+#*   - Los buffers son listas planas y no array('d'): leer de un array('d')
+#*     crea un float nuevo en cada acceso y escribir lo desempaqueta; con listas
+#*     la lectura devuelve el float ya existente. Medido: array('d') es hasta
+#*     2 veces más lento en estos bucles (ocupa 4 veces menos memoria, ver a_array)
+#*   - Al entrenar, la primera capa solo recorre las entradas distintas de cero
+#*     (pares índice-valor): la mitad de las características del dataset valen 0.
+#*     La forma dispersa se calcula al empezar cada época (coste O(N * n_inputs),
+#*     despreciable frente a la época): así ve las filas modificadas en el lugar,
+#*     como las que reemplaza BufferRepeticion
+#*   - Usa __slots__: sin diccionario por instancia y atributos más rápidos
+#* Lo que sigue asignándose en cada muestra es inevitable en CPython: los float
+#* de cada operación y el iterador de cada bucle; en cada época, además, las
+#* formas dispersas de X (~10 KiB con recursos.csv). A cambio, los índices ocupan
+#* memoria fija (algo más que los pesos guardados como listas, ver memoria_indices).
+#* Hace exactamente las mismas operaciones, en el mismo orden, que el backend
+#* "python" con SGD: con la misma red y el mismo barajado da los mismos pesos.
+
+import sys
+import math
+import random
+import itertools
+from array import array
+from optimizadores import SGD
+
+#! Código de cada activación para no buscar funciones en el bucle interno
+SIGMOID, TANH, RELU, SOFTMAX = range(4)
+CODIGOS_ACTIVACION = {'sigmoid': SIGMOID, 'tanh': TANH, 'relu': RELU, 'softmax': SOFTMAX}
+
+
+class KernelMLP:
+    #! Copia de una MLP entrenable con SGD sobre buffers planos
+    #! `forward` y `train_epoch` tienen la misma semántica que en MLP;
+    #! `copiar_pesos_a` devuelve los pesos a una MLP (para guardarla, etc.)
+
+    __slots__ = ('capas', 'n_capas', 'info', 'perdida', 'lr', 'rng', 'parametros', 'gradientes',
+                 'ceros', 'salidas', 'logits', 'deltas', 'indices', 'orden', 'todos', 'neuronas',
+                 'posiciones')
+
+    def __init__(self, mlp):
+        if not isinstance(mlp.optimizador, SGD):
+            raise ValueError("KernelMLP solo admite el optimizador SGD")
+        for nombre in mlp.activaciones:
+            if nombre not in CODIGOS_ACTIVACION:
+                raise ValueError(f"Activación no soportada por KernelMLP: {nombre!r}")
+
+        self.capas = list(mlp.capas)
+        self.n_capas = len(self.capas) - 1
+        self.perdida = mlp.perdida
+        self.lr = mlp.lr
+        #! Mismo estado que el generador de barajado de la red: mismo orden de muestras
+        self.rng = random.Random()
+        self.rng.setstate(mlp.rng_datos.getstate())
+
+        #! Por capa: (inicio de W, inicio de b, n_entrada, n_salida, código de activación)
+        info = []
+        parametros = []
+        for W, b, n_entrada, n_salida, nombre in zip(mlp.pesos, mlp.sesgos, self.capas[:-1],
+                                                     self.capas[1:], mlp.activaciones):
+            inicio_w = len(parametros)
+            for fila in W:
+                parametros.extend(float(w) for w in fila)
+            inicio_b = len(parametros)
+            parametros.extend(float(v) for v in b)
+            info.append((inicio_w, inicio_b, n_entrada, n_salida, CODIGOS_ACTIVACION[nombre]))
+        self.info = tuple(info)
+        self.parametros = parametros
+
+        #! Índices de los bucles internos, construidos una sola vez
+        #! todos[k] es el entero k: los demás índices reutilizan esos mismos objetos
+        todos = tuple(range(len(parametros)))
+        self.todos = todos
+        #! posiciones[n] = (0, ..., n - 1) para los bucles sobre una capa de n neuronas
+        self.posiciones = {n: tuple(range(n)) for n in self.capas}
+        #! neuronas[l]: por neurona i, (i, fila, índice del sesgo); fila[j] es el índice de W[i][j]
+        self.neuronas = tuple(
+            tuple((i, todos[inicio_w + i * n_entrada:inicio_w + (i + 1) * n_entrada], todos[inicio_b + i])
+                  for i in range(n_salida))
+            for inicio_w, inicio_b, n_entrada, n_salida, _ in self.info)
+
+        #! Buffers de trabajo, reservados una sola vez
+        self.gradientes = [0.0] * len(parametros)
+        self.ceros = [0.0] * len(parametros)
+        #! salidas[0]: copia de la entrada en `forward` (al entrenar la entrada
+        #! llega como pares dispersos y no se copia); salidas[l + 1]: capa l
+        self.salidas = [[0.0] * n for n in self.capas]
+        self.logits = [0.0] * self.capas[-1]
+        self.deltas = [[0.0] * n for n in self.capas[1:]]
+        #! Orden de las muestras de la época (se reutiliza entre épocas) y orden inicial
+        self.indices = []
+        self.orden = ()
+
+    def memoria_indices(self):
+        #! Bytes que ocupan los índices precalculados (tuplas y enteros propios)
+        vistos = set()
+        pendientes = [self.todos, self.neuronas, self.posiciones]
+        total = 0
+        while pendientes:
+            objeto = pendientes.pop()
+            if id(objeto) in vistos:
+                continue
+            vistos.add(id(objeto))
+            total += sys.getsizeof(objeto)
+            if isinstance(objeto, dict):
+                pendientes.extend(objeto.values())
+            elif isinstance(objeto, tuple):
+                pendientes.extend(objeto)
+        return total
+
+    #*==================== PROPAGACIÓN ===================
+
+    @staticmethod
+    def dispersa(x):
+        #! Pares (índice, valor) de las entradas distintas de cero de `x`
+        #! La primera capa solo recorre estos pares (w * 0 no cambia la suma)
+        return tuple((j, v) for j, v in enumerate(x) if v != 0)
+
+    def forward(self, x):
+        #! Propaga `x` y retorna el buffer de salida (se sobrescribe en la siguiente llamada)
+        #! La entrada se copia en un buffer reservado y la primera capa se recorre densa
+        self.salidas[0][:] = x
+        return self._propagar(None)
+
+    def _propagar(self, pares):
+        #! `pares`: forma dispersa de la entrada, o None para usar self.salidas[0]
+        P = self.parametros
+        ultima = self.n_capas - 1
+        for l in range(self.n_capas):
+            entrada = self.salidas[l]
+            salida = self.salidas[l + 1]
+            z = self.logits if l == ultima else salida
+            posiciones = self.posiciones[self.capas[l]]
+            for i, fila, b in self.neuronas[l]:
+                suma = 0.0
+                if l == 0 and pares is not None:
+                    for j, xj in pares:
+                        suma += P[fila[j]] * xj
+                else:
+                    for j in posiciones:
+                        suma += P[fila[j]] * entrada[j]
+                z[i] = suma + P[b]
+            self._activar(self.info[l][4], z, salida, self.posiciones[self.capas[l + 1]])
+        return salida
+
+    @staticmethod
+    def _activar(codigo, z, salida, posiciones):
+        #! Escribe en `salida` la activación de `z` (pueden ser el mismo buffer)
+        #! Mismas fórmulas que activaciones.py (sigmoid con camino rápido, softmax con log-sum-exp)
+        if codigo == SIGMOID:
+            for i in posiciones:
+                try:
+                    salida[i] = 1.0 / (1.0 + math.exp(-z[i]))
+                except OverflowError:
+                    salida[i] = math.exp(z[i])
+        elif codigo == TANH:
+            for i in posiciones:
+                salida[i] = math.tanh(z[i])
+        elif codigo == RELU:
+            for i in posiciones:
+                v = z[i]
+                salida[i] = v if v > 0 else 0.0
+        else:
+            lse = KernelMLP._logsumexp(z, posiciones)
+            for i in posiciones:
+                salida[i] = math.exp(z[i] - lse)
+
+    @staticmethod
+    def _logsumexp(z, posiciones):
+        m = max(z)
+        suma = 0.0
+        for i in posiciones:
+            suma += math.exp(z[i] - m)
+        return m + math.log(suma)
+
+    def _perdida_muestra(self, y):
+        #! Error de la muestra recién propagada (como MLP._perdida_muestra)
+        posiciones = self.posiciones[self.capas[-1]]
+        total = 0.0
+        if self.perdida == "entropia_cruzada":
+            z = self.logits
+            lse = self._logsumexp(z, posiciones)
+            for i in posiciones:
+                total += y[i] * (lse - z[i])
+            return total
+        o = self.salidas[-1]
+        for i in posiciones:
+            total += (y[i] - o[i]) ** 2
+        return total
+
+    #*==================== RETROPROPAGACIÓN ===================
+
+    def _calcular_deltas(self, y):
+        #! Deltas de todas las capas en self.deltas (mismas fórmulas que MLP._deltas)
+        P = self.parametros
+        ultima = self.n_capas - 1
+        o = self.salidas[-1]
+        delta = self.deltas[ultima]
+        codigo = self.info[ultima][4]
+        for i in self.posiciones[self.capas[-1]]:
+            error = y[i] - o[i]
+            if codigo == SOFTMAX:
+                delta[i] = error
+            elif codigo == SIGMOID:
+                delta[i] = error * (o[i] * (1 - o[i]))
+            elif codigo == TANH:
+                delta[i] = error * (1 - o[i] * o[i])
+            else:
+                delta[i] = error * (1.0 if o[i] > 0 else 0.0)
+
+        for l in range(ultima, 0, -1):
+            delta_sig = self.deltas[l]
+            delta = self.deltas[l - 1]
+            h = self.salidas[l]
+            codigo = self.info[l - 1][4]
+            neuronas = self.neuronas[l]
+            for j in self.posiciones[self.capas[l]]:
+                suma = 0.0
+                for i, fila, _ in neuronas:
+                    suma += delta_sig[i] * P[fila[j]]
+                v = h[j]
+                if codigo == SIGMOID:
+                    delta[j] = suma * (v * (1 - v))
+                elif codigo == TANH:
+                    delta[j] = suma * (1 - v * v)
+                else:
+                    delta[j] = suma * (1.0 if v > 0 else 0.0)
+
+    def _recorrer_gradiente(self, pares, destino, factor):
+        #! destino[k] += factor * delta * entrada para cada parámetro (sesgos: entrada = 1)
+        #! Con destino = parámetros y factor = lr es el paso de SGD de una muestra;
+        #! con destino = gradientes y factor = -1 acumula el gradiente del lote
+        #! Las capas se recorren de la última a la primera, como MLP.backward
+        for l in range(self.n_capas - 1, -1, -1):
+            delta = self.deltas[l]
+            entrada = self.salidas[l]
+            posiciones = self.posiciones[self.capas[l]]
+            for i, fila, b in self.neuronas[l]:
+                g = factor * delta[i]
+                if l == 0:
+                    for j, xj in pares:
+                        destino[fila[j]] += g * xj
+                else:
+                    for j in posiciones:
+                        destino[fila[j]] += g * entrada[j]
+                destino[b] += g
+
+    #*==================== ENTRENAMIENTO ===================
+
+    def train_epoch(self, X, Y, batch_size=1, shuffle=False):
+        #! Una época de SGD (muestra a muestra o por mini-batch); retorna el error promedio
+        #! Cada muestra se convierte a su forma dispersa una vez por época
+        dispersas = [self.dispersa(x) for x in X]
+        if len(self.orden) != len(X):
+            self.orden = tuple(range(len(X)))
+            self.indices = list(self.orden)
+        else:
+            self.indices[:] = self.orden
+        if shuffle:
+            self.rng.shuffle(self.indices)
+
+        total_loss = 0.0
+        if batch_size <= 1:
+            for k in self.indices:
+                self._propagar(dispersas[k])
+                total_loss += self._perdida_muestra(Y[k])
+                self._calcular_deltas(Y[k])
+                self._recorrer_gradiente(dispersas[k], self.parametros, self.lr)
+            return total_loss / len(X)
+
+        P, G = self.parametros, self.gradientes
+        for inicio in range(0, len(self.indices), batch_size):
+            G[:] = self.ceros
+            loss_lote = 0.0
+            for k in itertools.islice(self.indices, inicio, inicio + batch_size):
+                self._propagar(dispersas[k])
+                loss_lote += self._perdida_muestra(Y[k])
+                self._calcular_deltas(Y[k])
+                self._recorrer_gradiente(dispersas[k], G, -1.0)
+            for k in self.todos:
+                P[k] -= self.lr * G[k]
+            total_loss += loss_lote
+        return total_loss / len(X)
+
+    def predict(self, x):
+        salida = self.forward(x)
+        return max(self.posiciones[self.capas[-1]], key=salida.__getitem__)
+
+    #*==================== INTERCAMBIO CON MLP ===================
+
+    def copiar_pesos_a(self, mlp):
+        #! Escribe los pesos del núcleo en `mlp` (listas o arreglos según su backend)
+        #! y sincroniza su generador de barajado
+        P = self.parametros
+        pesos, sesgos = [], []
+        for inicio_w, inicio_b, n_entrada, n_salida, _ in self.info:
+            pesos.append([P[inicio_w + i * n_entrada:inicio_w + (i + 1) * n_entrada]
+                          for i in range(n_salida)])
+            sesgos.append(P[inicio_b:inicio_b + n_salida])
+        mlp.cargar_pesos({'capas': [{'w': W, 'b': b} for W, b in zip(pesos, sesgos)]})
+        mlp.rng_datos.setstate(self.rng.getstate())
+        return mlp
+
+    def a_array(self):
+        #! Copia compacta de los parámetros (8 bytes por valor) en el orden plano,
+        #! para guardarlos o enviarlos a otro proceso
+        return array('d', self.parametros)
@@ -1,65 +1,56 @@
 import os #* para manejo de archivos
-import json #* para guardar y cargar modelo
-from mlp import MLP #* clase MLP "red neuronal multicapa"
-from entrenamiento_combinado import load_data_combinado, normalize, one_hot, mapeo_inv #* funciones de carga y preprocesamiento
+from mlp import MLP, BACKEND_PREFERIDO #* clase MLP "red neuronal multicapa"
+from formato_binario import convertir_json_a_binario #* migración del modelo JSON antiguo
+from entrenamiento_combinado import load_data_combinado, normalize, parametros_normalizacion, one_hot, mapeo_inv #* funciones de carga y preprocesamiento
 from analizador import analizar_codigo #* función de análisis estático
 
 
 #*==================== PERSISTENCIA DEL MODELO ===================
 #* Funciones para guardar y cargar modelos entrenados
 #* Esto permite reutilizar modelos sin necesidad de re-entrenar
+#* Se usa el formato binario (.mlpb): carga mapeada en memoria, sin parsear texto
 
+MODELO_FILE = "modelo_mlp.mlpb"
+#! Modelo guardado por versiones anteriores; se convierte al binario la primera vez
+MODELO_JSON_ANTIGUO = "modelo_mlp.json"
 
-def guardar_modelo(mlp, archivo="modelo_mlp.json"):
-    #! Serializa la red neuronal en formato JSON
-    #! Guarda arquitectura y todos los pesos aprendidos
-    
-    modelo = {
-        'arquitectura': {
-            'n_inputs': mlp.n_inputs,
-            'n_hidden': mlp.n_hidden,
-            'n_outputs': mlp.n_outputs,
-            'lr': mlp.lr
-        },
-        'pesos': {
-            'w1': mlp.w1,
-            'b1': mlp.b1,
-            'w2': mlp.w2,
-            'b2': mlp.b2
-        }
-    }
+
+def guardar_modelo(mlp, archivo=MODELO_FILE):
+    #! Serializa la red neuronal en formato binario
+    #! Guarda arquitectura, etiquetas, pesos aprendidos y estado del optimizador
     
-    with open(archivo, 'w') as f:
-        json.dump(modelo, f)
+    mlp.guardar(archivo)
 
-def cargar_modelo(archivo="modelo_mlp.json"):
+def cargar_modelo(archivo=MODELO_FILE):
     #! Deserializa un modelo guardado previamente
     #! Retorna instancia de MLP lista para usar
+    #! Si solo existe el modelo JSON antiguo, lo convierte antes al formato binario
+    #! Los modelos guardados sin normalización se entrenaron con la de recursos.csv
     
     try:
-        with open(archivo, 'r') as f:
-            modelo = json.load(f)
-        
-        arq = modelo['arquitectura']
-        mlp = MLP(
-            n_inputs=arq['n_inputs'],
-            n_hidden=arq['n_hidden'],
-            n_outputs=arq['n_outputs'],
-            lr=arq['lr']
-        )
-        
-        pesos = modelo['pesos']
-        mlp.w1 = pesos['w1']
-        mlp.b1 = pesos['b1']
-        mlp.w2 = pesos['w2']
-        mlp.b2 = pesos['b2']
+        if not os.path.exists(archivo):
+            if not os.path.exists(MODELO_JSON_ANTIGUO):
+                return None
+            convertir_json_a_binario(MODELO_JSON_ANTIGUO, archivo)
         
+        mlp = MLP.cargar(archivo, backend=BACKEND_PREFERIDO)
+        if mlp is not None and mlp.normalizacion is None:
+            mlp.normalizacion = parametros_normalizacion(load_data_combinado()[0])
         return mlp
     except:
         return None
 #*===== ENTRENAMIENTO =====
 
 import time
+from entrenador import entrenar_con_parada_temprana, cargar_checkpoint
+from planificadores_lr import buscar_lr, CosenoLR
+
+#! Límites del entrenamiento inicial: la parada temprana suele cortar mucho antes
+MAX_EPOCHS = 2000
+TIEMPO_MAX_ENTRENAMIENTO = 60
+#! Progreso del entrenamiento en curso: si se interrumpe, la siguiente ejecución sigue desde aquí
+CHECKPOINT_FILE = "modelo_mlp.checkpoint.mlpb"
+CHECKPOINT_CADA = 20
 
 def entrenar_mlp_inicial():
     #! Entrena la MLP desde cero usando el dataset combinado
@@ -74,49 +65,63 @@ def entrenar_mlp_inicial():
     X, Y_idx = load_data_combinado()
     
     print("\nNormalizando características...")
+    #! Mínimos y rangos del entrenamiento: se guardan con el modelo para normalizar
+    #! igual los vectores de analizar_codigo al predecir y al corregir
+    normalizacion = parametros_normalizacion(X)
     X = normalize(X)
     Y = [one_hot(i, 4) for i in Y_idx]
     
-    print("\nCreando red neuronal...")
-    mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.1)
-    print(f"   Arquitectura: 8 entradas → 16 ocultas → 4 salidas")
-    print(f"   Learning rate: 0.1")
+    if os.path.exists(CHECKPOINT_FILE):
+        #! Entrenamiento interrumpido: se recupera la red con su lr ya elegido
+        print(f"\nRecuperando el entrenamiento interrumpido ({CHECKPOINT_FILE})...")
+        mlp = cargar_checkpoint(CHECKPOINT_FILE, BACKEND_PREFERIDO)[0]
+        print("   Arquitectura: 8 entradas → 16 ocultas → 4 salidas")
+        print(f"   Learning rate: {mlp.lr:.4f} (del checkpoint)")
+    else:
+        print("\nCreando red neuronal...")
+        mlp = MLP(n_inputs=8, n_hidden=16, n_outputs=4, lr=0.05, backend=BACKEND_PREFERIDO,
+                  optimizador="adam", perdida="entropia_cruzada")
+        print("   Arquitectura: 8 entradas → 16 ocultas → 4 salidas")
+        #! El lr se elige con un LR range test sobre los datos actuales y luego decae con coseno
+        mlp.etiquetas = [mapeo_inv[i] for i in range(4)]
+        mlp.lr = buscar_lr(mlp, X, Y)[0]
+        print(f"   Learning rate: {mlp.lr:.4f} (sugerido por buscar_lr)")
+    mlp.normalizacion = normalizacion
+    print("   Optimizador: Adam")
+    print("   Salida: softmax + entropía cruzada")
+    print(f"   Backend: {BACKEND_PREFERIDO}")
     
     #! Entrenamiento con visualización de progreso
-    epochs = 5000
-    print(f"\nEntrenando por {epochs} épocas...\n")
+    #! Mini-batches barajados + Adam, con parada temprana: se detiene cuando el loss
+    #! deja de mejorar (o se agota el tiempo) y conserva los mejores pesos vistos
+    #! Cada CHECKPOINT_CADA épocas guarda el progreso, así que se puede interrumpir sin perderlo
+    print(f"\nEntrenando hasta converger (máximo {MAX_EPOCHS} épocas / {TIEMPO_MAX_ENTRENAMIENTO}s)...\n")
     
     tiempo_inicio = time.time()
-    predicciones_correctas = 0
-    
-    for e in range(epochs):
-        loss = mlp.train_epoch(X, Y)
-        
-        #! Calcular accuracy cada 500 épocas
-        if e % 500 == 0:
-            correct = sum(1 for x, yi in zip(X, Y_idx) if mlp.predict(x) == yi)
-            acc = correct / len(X)
-            
-            #! Tiempo transcurrido
-            tiempo_transcurrido = time.time() - tiempo_inicio
-            
-            #! Estimar tiempo restante
-            if e > 0:
-                tiempo_por_epoca = tiempo_transcurrido / (e + 1)
-                epocas_restantes = epochs - (e + 1)
-                tiempo_restante = tiempo_por_epoca * epocas_restantes
-                tiempo_str = f" {tiempo_transcurrido:.2f}s / ~{tiempo_restante:.1f}s"
-            else:
-                tiempo_str = " 0.00s / ~0.0s"
-            
-            print(f"  Época {e:5d}/{epochs} | Loss: {loss:.8f} | Acc: {acc:.2%} ({correct}/{len(X)}) |{tiempo_str}")
+    resultado = entrenar_con_parada_temprana(
+        mlp, X, Y,
+        max_epochs=MAX_EPOCHS,
+        batch_size=16,
+        shuffle=True,
+        monitor="loss",
+        paciencia=20,
+        min_delta=1e-5,
+        tiempo_max=TIEMPO_MAX_ENTRENAMIENTO,
+        mostrar_cada=20,
+        planificador=CosenoLR(mlp.lr, epocas=300, lr_min=mlp.lr / 100),
+        checkpoint=CHECKPOINT_FILE,
+        checkpoint_cada=CHECKPOINT_CADA
+    )
+    print(f"\n  Parada en la época {resultado['epocas']} ({resultado['motivo']}), "
+          f"mejores pesos de la época {resultado['mejor_epoca']}")
     
     #! Evaluación final
     print("\n" + "="*70)
     print("EVALUACIÓN FINAL".center(70))
     print("="*70)
     
-    correct = sum(1 for x, yi in zip(X, Y_idx) if mlp.predict(x) == yi)
+    predicciones, _ = mlp.predict_batch(X)
+    correct = sum(1 for pred, yi in zip(predicciones, Y_idx) if pred == yi)
     acc = correct / len(X)
     print(f"\nAccuracy global: {acc:.2%} ({correct}/{len(X)})")
     
@@ -124,7 +129,7 @@ def entrenar_mlp_inicial():
     print("\nAccuracy por clase de complejidad:")
     for clase_idx in range(4):
         total = Y_idx.count(clase_idx)
-        correctos = sum(1 for yi in Y_idx if yi == clase_idx and mlp.predict(X[Y_idx.index(yi)]) == clase_idx)
+        correctos = sum(1 for pred, yi in zip(predicciones, Y_idx) if yi == clase_idx and pred == clase_idx)
         if total > 0:
             acc_clase = correctos / total
             print(f"   {mapeo_inv[clase_idx]:12s}: {acc_clase:.2%} ({correctos}/{total})")
@@ -138,16 +143,34 @@ def entrenar_mlp_inicial():
 
 #*===== CORRECCIÓN DE ERRORES EN TIEMPO REAL =====
 
+from aprendizaje_online import BufferRepeticion, CorrectorOnline
+
+#! Corrector compartido por toda la sesión; se crea en la primera corrección
+corrector = None
+
+def obtener_corrector(mlp):
+    #! El buffer de repetición empieza con el dataset de entrenamiento
+    #! y va sumando las correcciones de la sesión
+    #! Todo lo que entra al buffer está en la escala de entrenamiento de `mlp`
+    global corrector
+    if corrector is None:
+        X, Y_idx = load_data_combinado()
+        buffer = BufferRepeticion(capacidad=1000)
+        buffer.agregar_lote([mlp.normalizar_entrada(x) for x in X], [one_hot(i, 4) for i in Y_idx])
+        corrector = CorrectorOnline(buffer, max_pasos=50, margen=0.2, tamano_lote=16)
+    return corrector
+
 def corregir_en_tiempo_real(mlp, caracteristicas, complejidad_correcta):
     #! Re-entrena la MLP si el usuario indica que la predicción fue incorrecta
     #! Esto permite que el modelo aprenda de sus errores
+    #! Unos pocos mini-batches mezclan el dato corregido con muestras pasadas,
+    #! así no se olvida lo aprendido del dataset
     
     print("\n" + "="*70)
     print("AUTO-CORRECCIÓN EN TIEMPO REAL".center(70))
     print("="*70)
     print("\nSe detecto una discrepancia en la predicción")
-    print("Corrigiendo el error...")
-    print("Por favor espera unos segundos...\n")
+    print("Corrigiendo el error...\n")
     
     #! Convertir complejidad correcta a índice numérico
     mapeo = {"O(log n)": 0, "O(n)": 1, "O(n log n)": 2, "O(n^2)": 3, "O(n^3)": 4}
@@ -160,12 +183,21 @@ def corregir_en_tiempo_real(mlp, caracteristicas, complejidad_correcta):
     else:
         y_correcto = [0, 0, 0, 1]  #! Si es O(n^3), usar O(n^2) como más cercano
     
-    #! Re-entrenar con este nuevo dato
+    #! Re-entrenar con este nuevo dato, en la misma escala que el buffer y el entrenamiento
     print("Re-entrenando con el dato correcto...")
-    for _ in range(500):
-        mlp.train_epoch([caracteristicas], [y_correcto])
+    x = mlp.normalizar_entrada(caracteristicas)
+    resultado = obtener_corrector(mlp).corregir(mlp, x, y_correcto)
     
-    print("Corrección completada")
+    if resultado['corregida']:
+        print(f"Corrección completada en {resultado['pasos']} pasos ({resultado['tiempo'] * 1000:.1f} ms)")
+    else:
+        print(f"Corrección parcial: se alcanzó el máximo de {resultado['pasos']} pasos")
+    
+    #! Comprobación: la muestra normalizada ya se clasifica con la clase corregida
+    if mlp.predict(x) == y_correcto.index(1):
+        print(f"Verificado: ahora se predice {mapeo_inv[y_correcto.index(1)]}")
+    else:
+        print(f"Aviso: la muestra aún no se predice como {mapeo_inv[y_correcto.index(1)]}")
     print("Guardando conocimiento actualizado...")
     
     guardar_modelo(mlp)
@@ -255,11 +287,9 @@ def analizar_con_autocorreccion(mlp, codigo):
     caracteristicas = resultado['caracteristicas_mlp']
     complejidad_estatica = resultado['complejidad']
     
-    #! 2. Predecir con MLP
-    prediccion_idx = mlp.predict(caracteristicas)
+    #! 2. Predecir con MLP (con la normalización del entrenamiento)
+    prediccion_idx, confianza = mlp.predict_confianza(mlp.normalizar_entrada(caracteristicas))
     prediccion_mlp = mapeo_inv[prediccion_idx]
-    output = mlp.forward(caracteristicas)
-    confianza = output[prediccion_idx]
     
     #! 3. Mostrar resultado (SIEMPRE muestra comparación)
     mostrar_resultado(prediccion_mlp, complejidad_estatica, confianza)
@@ -286,10 +316,8 @@ def analizar_con_autocorreccion(mlp, codigo):
             complejidad_estatica_nuevo = resultado_nuevo['complejidad']
             
             #! Predecir con MLP CORREGIDA
-            prediccion_idx_nuevo = mlp.predict(caracteristicas_nuevo)
+            prediccion_idx_nuevo, confianza_nuevo = mlp.predict_confianza(mlp.normalizar_entrada(caracteristicas_nuevo))
             prediccion_mlp_nuevo = mapeo_inv[prediccion_idx_nuevo]
-            output_nuevo = mlp.forward(caracteristicas_nuevo)
-            confianza_nuevo = output_nuevo[prediccion_idx_nuevo]
             
             #! Mostrar resultado corregido
             mostrar_resultado(
@@ -321,8 +349,6 @@ def main():
     print("  - Ahora doy la respuesta correcta\n")
     
     #! 1. Cargar o entrenar modelo
-    MODELO_FILE = "modelo_mlp.json"
-    
     print("Cargando inteligencia artificial...")
     mlp = cargar_modelo(MODELO_FILE)
     
@@ -1,197 +1,600 @@
-
 #* ===== RED NEURONAL MULTICAPA (MLP) CON PERSISTENCIA =====
 #* Implementación de un perceptrón multicapa que permite:
 #*   - Entrenar la red neuronal desde cero
-#*   - Guardar los pesos en JSON para reutilización
+#*   - Guardar los pesos en JSON (o en binario .mlpb) para reutilización
 #*   - Cargar modelos ya entrenados sin necesidad de re-entrenar
 #*   - Re-entrenar incrementalmente con nuevas muestras
+#*   - Apilar cualquier número de capas ocultas, cada una con su activación
 
-import math 
 import random #* para inicialización aleatoria de pesos
 import json #* para persistencia de modelos
+import copy #* para copias independientes del modelo
+import formato_binario #* formato compacto .mlpb con carga mapeada en memoria
+from optimizadores import Optimizador, SGD, crear_optimizador, optimizador_desde_diccionario
+#* Funciones de activación estables (también se reexportan desde aquí)
+from activaciones import (sigmoid, dsigmoid, sigmoid_np, ACTIVACIONES,
+                          entropia_cruzada, entropia_cruzada_np, activar, activar_np)
 
+#* NumPy es opcional: si está instalado se puede usar el backend matricial
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
+NUMPY_DISPONIBLE = np is not None
+BACKENDS = ("python", "numpy")
+#! Backend más rápido disponible en esta máquina
+BACKEND_PREFERIDO = "numpy" if NUMPY_DISPONIBLE else "python"
 
-#*==================== FUNCIONES DE ACTIVACIÓN ===================
-#* Las funciones de activación introducen no-linealidad en la red
-#* permitiendo que aprenda patrones complejos
+#! Versión del formato de modelo_mlp.json que escribe `guardar`
+#! Versión 1 (sin campo 'version'): una capa oculta con w1/b1/w2/b2
+#! Versión 2: lista de capas con sus pesos y activaciones
+VERSION_FORMATO = 2
 
-def sigmoid(x):
-    #! Sigmoid: convierte cualquier valor a un rango entre 0 y 1
-    #! Fórmula: 1 / (1 + e^-x)
-    #! Ventaja: diferenciable para retropropagación
-    return 1.0 / (1.0 + math.exp(-x))
 
 
-def dsigmoid(y):
-    #! Derivada de sigmoid: necesaria para el backpropagation
-    #! Si ya tenemos y = sigmoid(x), su derivada es: y * (1 - y)
-    return y * (1 - y)
+#! Funciones de pérdida disponibles
+#! "mse": error cuadrático con salidas sigmoid (comportamiento original)
+#! "entropia_cruzada": salida softmax (probabilidades que suman 1) + entropía cruzada
+PERDIDAS = ("mse", "entropia_cruzada")
 
 #*==================== CLASE MLP ===================
 class MLP:
-    #! Red neuronal con una capa oculta
-    #! Arquitectura: entrada -> capa oculta -> salida
+    #! Red neuronal multicapa
+    #! Arquitectura: entrada -> capas ocultas -> salida
+    #! Con n_hidden entero es la red clásica de una capa oculta (w1/b1, w2/b2)
 
-    def __init__(self, n_inputs, n_hidden, n_outputs, lr=0.05, seed=42):
+    def __init__(self, n_inputs, n_hidden, n_outputs, lr=0.05, seed=42, backend="python", activaciones=None,
+                 optimizador=None, perdida="mse", inicializar_pesos=True):
         #! Inicializa la arquitectura de la red
         #! Args:
         #!   n_inputs: número de características de entrada
-        #!   n_hidden: número de neuronas en la capa oculta
+        #!   n_hidden: neuronas de la capa oculta, o lista de anchos (una por capa oculta)
         #!   n_outputs: número de clases de salida
         #!   lr: learning rate (velocidad de aprendizaje)
-        #!   seed: para reproducibilidad
+        #!   seed: para reproducibilidad (siembra los generadores de la instancia)
+        #!   backend: "python" (listas, sin dependencias) o "numpy" (productos matriciales)
+        #!   activaciones: nombre de activación por capa (ocultas + salida), por defecto sigmoid
+        #!                 (con perdida="entropia_cruzada" la salida es 'softmax')
+        #!   optimizador: nombre ('sgd', 'momentum', 'nesterov', 'rmsprop', 'adam') o instancia; por defecto SGD
+        #!   perdida: "mse" (sigmoid + error cuadrático) o "entropia_cruzada" (softmax + entropía cruzada)
+        #!   inicializar_pesos: False deja las capas vacías, para asignarlas después
+        #!                      (al cargar un modelo guardado no hace falta generarlos)
+        
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido: {backend!r} (opciones: {BACKENDS})")
+        if backend == "numpy" and not NUMPY_DISPONIBLE:
+            raise ImportError("El backend 'numpy' requiere tener NumPy instalado")
+        
+        ocultas = list(n_hidden) if isinstance(n_hidden, (list, tuple)) else [n_hidden]
+        #! Anchos de todas las capas, incluida la entrada: [8, 16, 4]
+        self.capas = [n_inputs] + ocultas + [n_outputs]
+        n_capas = len(self.capas) - 1
         
-        random.seed(seed)
+        if perdida not in PERDIDAS:
+            raise ValueError(f"Pérdida desconocida: {perdida!r} (opciones: {PERDIDAS})")
+        if activaciones is None:
+            activaciones = ['sigmoid'] * n_capas
+            if perdida == "entropia_cruzada":
+                activaciones[-1] = 'softmax'
+        if len(activaciones) != n_capas:
+            raise ValueError(f"Se esperaban {n_capas} activaciones, se recibieron {len(activaciones)}")
+        for nombre in activaciones[:-1]:
+            if nombre not in ACTIVACIONES:
+                raise ValueError(f"Activación desconocida: {nombre!r} (opciones: {list(ACTIVACIONES)})")
+        #! Softmax y entropía cruzada van siempre juntas en la capa de salida
+        if perdida == "entropia_cruzada" and activaciones[-1] != 'softmax':
+            raise ValueError("La pérdida 'entropia_cruzada' requiere 'softmax' en la capa de salida")
+        if perdida == "mse" and activaciones[-1] not in ACTIVACIONES:
+            raise ValueError(f"Activación de salida inválida para 'mse': {activaciones[-1]!r}")
+        
+        self.backend = backend
+        #! Generadores propios de la instancia: construir o entrenar una red no
+        #! toca el estado global de `random` ni el de otras redes
+        #! rng: inicialización de pesos (misma secuencia que random.seed(seed))
+        #! rng_datos: barajado de los datos en `train_epoch`
+        self.rng = random.Random(seed)
+        self.rng_datos = random.Random(seed)
         self.lr = lr
         self.n_inputs = n_inputs
         self.n_hidden = n_hidden
         self.n_outputs = n_outputs
+        self.activaciones = list(activaciones)
+        self.perdida = perdida
+        #! Nombre de cada clase de salida (opcional); se guarda junto al modelo
+        self.etiquetas = None
+        #! (mínimos, rangos) de la normalización min-max con la que se entrenó (opcional)
+        #! Se guarda junto al modelo; ver normalizar_entrada
+        self.normalizacion = None
+        
+        if optimizador is None:
+            optimizador = SGD()
+        elif not isinstance(optimizador, Optimizador):
+            optimizador = crear_optimizador(optimizador)
+        #! Su estado (velocidades, promedios) vive junto a los pesos y se guarda con ellos
+        self.optimizador = optimizador
+
+        #! Pesos de cada capa (matriz n_salida x n_entrada) y sus sesgos
+        #! Se generan capa por capa (pesos y luego sesgos), en el mismo orden
+        #! que la red original: con la misma semilla se obtienen los mismos w1/b1/w2/b2
+        self.pesos = []
+        self.sesgos = []
+        if not inicializar_pesos:
+            return
+        for n_entrada, n_salida in zip(self.capas[:-1], self.capas[1:]):
+            self.pesos.append([[self.rng.uniform(-1, 1) for _ in range(n_entrada)] for _ in range(n_salida)])
+            self.sesgos.append([self.rng.uniform(-1, 1) for _ in range(n_salida)])
+
+        #! Con el backend NumPy los mismos pesos iniciales pasan a arreglos
+        #! Así ambos backends parten del mismo punto y dan resultados equivalentes
+        if self.backend == "numpy":
+            self.pesos = [np.array(w, dtype=float) for w in self.pesos]
+            self.sesgos = [np.array(b, dtype=float) for b in self.sesgos]
+
+    #*==================== ACCESO A PESOS ===================
+    #* w1/b1 (entrada -> primera oculta) y w2/b2 (siguiente capa) se mantienen
+    #* como alias de la lista de capas para el código que los usa por nombre
+
+    @property
+    def w1(self):
+        return self.pesos[0]
+
+    @w1.setter
+    def w1(self, valor):
+        self.pesos[0] = valor
+
+    @property
+    def b1(self):
+        return self.sesgos[0]
 
-        #! Pesos de entrada a capa oculta (matriz n_hidden x n_inputs)
-        self.w1 = [[random.uniform(-1, 1) for _ in range(n_inputs)] for _ in range(n_hidden)]
-        #! Sesgos de capa oculta
-        self.b1 = [random.uniform(-1, 1) for _ in range(n_hidden)]
+    @b1.setter
+    def b1(self, valor):
+        self.sesgos[0] = valor
 
-        #! Pesos de capa oculta a salida (matriz n_outputs x n_hidden)
-        self.w2 = [[random.uniform(-1, 1) for _ in range(n_hidden)] for _ in range(n_outputs)]
-        #! Sesgos de capa de salida
-        self.b2 = [random.uniform(-1, 1) for _ in range(n_outputs)]
+    @property
+    def w2(self):
+        return self.pesos[1]
+
+    @w2.setter
+    def w2(self, valor):
+        self.pesos[1] = valor
+
+    @property
+    def b2(self):
+        return self.sesgos[1]
+
+    @b2.setter
+    def b2(self, valor):
+        self.sesgos[1] = valor
+
+    def cargar_pesos(self, pesos):
+        #! Asigna pesos desde un diccionario con listas (formato de modelo_mlp.json)
+        #! Acepta el formato por capas {'capas': [{'w', 'b'}, ...]} y el antiguo {'w1', 'b1', 'w2', 'b2'}
+        #! Los convierte a arreglos si el backend es NumPy
+        if 'capas' in pesos:
+            capas = [(capa['w'], capa['b']) for capa in pesos['capas']]
+        else:
+            capas = [(pesos['w1'], pesos['b1']), (pesos['w2'], pesos['b2'])]
+        
+        if self.backend == "numpy":
+            self.pesos = [np.array(w, dtype=float) for w, _ in capas]
+            self.sesgos = [np.array(b, dtype=float) for _, b in capas]
+        else:
+            self.pesos = [[list(fila) for fila in w] for w, _ in capas]
+            self.sesgos = [list(b) for _, b in capas]
+
+    def pesos_como_listas(self):
+        #! Devuelve los pesos como listas de Python (serializables a JSON)
+        #! Independiente del backend usado internamente
+        if self.backend == "numpy":
+            return {'capas': [{'w': w.tolist(), 'b': b.tolist()} for w, b in zip(self.pesos, self.sesgos)]}
+        return {'capas': [{'w': w, 'b': b} for w, b in zip(self.pesos, self.sesgos)]}
+
+    #*==================== PROPAGACIÓN ===================
 
     def forward(self, inputs):
         #! Forward pass: propaga la entrada hacia adelante
         #! Calcula la salida de la red dado un input
+        #! Guarda la salida de cada capa en self.salidas_capas para el backward
+        
+        if self.backend == "numpy":
+            return self._forward_np(inputs)
         
         self.inputs = inputs[:]
+        self.salidas_capas = [self.inputs]
         
-        #! Capa oculta: entrada * w1 + b1, aplicar sigmoid
-        self.h = []
-        for i in range(self.n_hidden):
-            #! Suma ponderada: cada neurona combina todas las entradas
-            s = sum(w * x for w, x in zip(self.w1[i], inputs)) + self.b1[i]
-            #! Aplica sigmoid para introducir no-linealidad
-            self.h.append(sigmoid(s))
+        entrada = self.inputs
+        for W, b, nombre in zip(self.pesos, self.sesgos, self.activaciones):
+            #! Suma ponderada: cada neurona combina todas las entradas de la capa
+            #! y aplica su activación para introducir no-linealidad
+            z = [sum(w * x for w, x in zip(fila, entrada)) + bi for fila, bi in zip(W, b)]
+            entrada = activar(nombre, z)
+            self.salidas_capas.append(entrada)
+        #! Logits de la salida: la entropía cruzada se calcula desde aquí
+        self.logits = z
+        
+        #! h: primera capa oculta, o: capa de salida
+        self.h = self.salidas_capas[1]
+        self.o = self.salidas_capas[-1]
+        return self.o
+
+    def _forward_np(self, inputs):
+        #! Forward pass con NumPy: cada capa es un producto matriz-vector
+        self.inputs = np.asarray(inputs, dtype=float)
+        self.salidas_capas = [self.inputs]
         
-        #! Capa de salida: hidden * w2 + b2, aplicar sigmoid
-        self.o = []
-        for i in range(self.n_outputs):
-            s = sum(w * hi for w, hi in zip(self.w2[i], self.h)) + self.b2[i]
-            self.o.append(sigmoid(s))
+        entrada = self.inputs
+        for W, b, nombre in zip(self.pesos, self.sesgos, self.activaciones):
+            z = W @ entrada + b
+            entrada = activar_np(nombre, z)
+            self.salidas_capas.append(entrada)
+        self.logits = z
         
+        self.h = self.salidas_capas[1]
+        self.o = self.salidas_capas[-1]
         return self.o
 
+    def _deltas(self, salidas, esperado):
+        #! Retropropaga el error desde la salida hasta la primera capa
+        #! `salidas` son las activaciones de cada capa (entrada incluida)
+        #! Retorna un delta por capa; sirve para un vector o, con NumPy, para un lote (filas)
+        
+        deltas = [None] * len(self.pesos)
+        ultima = len(self.pesos) - 1
+        
+        if self.backend == "numpy":
+            if self.perdida == "entropia_cruzada":
+                #! Softmax + entropía cruzada: la derivada combinada es (esperado - salida)
+                deltas[ultima] = esperado - salidas[-1]
+            else:
+                derivada = ACTIVACIONES[self.activaciones[ultima]][3]
+                deltas[ultima] = (esperado - salidas[-1]) * derivada(salidas[-1])
+            for l in range(ultima, 0, -1):
+                derivada = ACTIVACIONES[self.activaciones[l - 1]][3]
+                deltas[l - 1] = (deltas[l] @ self.pesos[l]) * derivada(salidas[l])
+            return deltas
+        
+        #! Delta de salida: error (esperado - predicho) * derivada de la activación
+        o = salidas[-1]
+        if self.perdida == "entropia_cruzada":
+            deltas[ultima] = [esperado[i] - o[i] for i in range(len(o))]
+        else:
+            derivada = ACTIVACIONES[self.activaciones[ultima]][1]
+            deltas[ultima] = [(esperado[i] - o[i]) * derivada(o[i]) for i in range(len(o))]
+        
+        #! Capas ocultas: suma ponderada del delta de la capa siguiente
+        for l in range(ultima, 0, -1):
+            derivada = ACTIVACIONES[self.activaciones[l - 1]][1]
+            W = self.pesos[l]
+            h = salidas[l]
+            delta_sig = deltas[l]
+            deltas[l - 1] = [
+                sum(delta_sig[i] * W[i][j] for i in range(len(delta_sig))) * derivada(h[j])
+                for j in range(len(h))
+            ]
+        return deltas
+
     def backward(self, expected):
         #! Backward pass (retropropagación)
         #! Calcula gradientes y actualiza pesos basándose en el error
+        #! Todos los deltas se calculan con los pesos previos a la actualización
         
-        #! Error en capa de salida: diferencia entre esperado y predicho
-        error_o = [expected[i] - self.o[i] for i in range(self.n_outputs)]
-        #! Delta de salida: error * derivada de sigmoid
-        delta_o = [error_o[i] * dsigmoid(self.o[i]) for i in range(self.n_outputs)]
-        
-        #! Retropropagar error hacia capa oculta
-        error_h = [0.0] * self.n_hidden
-        for j in range(self.n_hidden):
-            #! Suma ponderada del error de las neuronas de salida
-            s = 0.0
-            for i in range(self.n_outputs):
-                s += delta_o[i] * self.w2[i][j]
-            error_h[j] = s
-        
-        #! Delta de capa oculta: error * derivada de sigmoid
-        delta_h = [error_h[j] * dsigmoid(self.h[j]) for j in range(self.n_hidden)]
-        
-        #! Actualizar pesos y sesgos de capa de salida
-        for i in range(self.n_outputs):
-            for j in range(self.n_hidden):
-                self.w2[i][j] += self.lr * delta_o[i] * self.h[j]
-            self.b2[i] += self.lr * delta_o[i]
-        
-        #! Actualizar pesos y sesgos de capa oculta
-        for j in range(self.n_hidden):
-            for k in range(self.n_inputs):
-                self.w1[j][k] += self.lr * delta_h[j] * self.inputs[k]
-            self.b1[j] += self.lr * delta_h[j]
-
-    def train_epoch(self, X, Y):
+        if self.backend == "numpy":
+            deltas = self._deltas(self.salidas_capas, np.asarray(expected, dtype=float))
+            #! Producto exterior: actualiza toda la matriz de una sola vez
+            for l, delta in enumerate(deltas):
+                self.pesos[l] += self.lr * np.outer(delta, self.salidas_capas[l])
+                self.sesgos[l] += self.lr * delta
+            return
+        
+        deltas = self._deltas(self.salidas_capas, expected)
+        
+        #! Actualizar pesos y sesgos de cada capa
+        for l in range(len(self.pesos) - 1, -1, -1):
+            W, b, delta, entrada = self.pesos[l], self.sesgos[l], deltas[l], self.salidas_capas[l]
+            for i in range(len(W)):
+                fila = W[i]
+                for j in range(len(fila)):
+                    fila[j] += self.lr * delta[i] * entrada[j]
+                b[i] += self.lr * delta[i]
+
+    #*==================== ENTRENAMIENTO ===================
+
+    def train_epoch(self, X, Y, batch_size=1, shuffle=False):
         #! Entrena un época (una pasada sobre todo el dataset)
         #! Args:
         #!   X: lista de vectores de entrada
         #!   Y: lista de vectores esperados (one-hot encoded)
+        #!   batch_size: muestras por actualización (1 = SGD clásico muestra a muestra)
+        #!   shuffle: baraja el orden de las muestras en cada época (con semilla)
+        
+        indices = list(range(len(X)))
+        if shuffle:
+            #! Generador propio sembrado con `seed`: el orden es reproducible
+            self.rng_datos.shuffle(indices)
         
         total_loss = 0.0
-        for x, y in zip(X, Y):
-            #! Forward pass
-            out = self.forward(x)
-            #! Calcula error cuadrático
-            total_loss += sum((y[i] - out[i]) ** 2 for i in range(self.n_outputs))
-            #! Backward pass (retropropagación)
-            self.backward(y)
+        if batch_size <= 1 and not isinstance(self.optimizador, SGD):
+            #! Muestra a muestra con otro optimizador: gradiente de una muestra + paso del optimizador
+            for k in indices:
+                gradientes, loss = self.gradientes_lote([X[k]], [Y[k]])
+                self.aplicar_gradientes(gradientes)
+                total_loss += loss
+        elif batch_size <= 1:
+            for k in indices:
+                x, y = X[k], Y[k]
+                #! Forward pass
+                out = self.forward(x)
+                #! Calcula el error (cuadrático o entropía cruzada)
+                total_loss += self._perdida_muestra(out, y)
+                #! Backward pass (retropropagación)
+                self.backward(y)
+        else:
+            #! Mini-batch: suma los gradientes del lote y actualiza una sola vez
+            for inicio in range(0, len(indices), batch_size):
+                lote = indices[inicio:inicio + batch_size]
+                gradientes, loss = self.gradientes_lote([X[k] for k in lote], [Y[k] for k in lote])
+                self.aplicar_gradientes(gradientes)
+                total_loss += loss
         
         #! Retorna el error promedio
         return total_loss / len(X)
 
+    def _perdida_muestra(self, out, y):
+        #! Error de una muestra recién propagada con `forward` (usa self.logits)
+        if self.perdida == "entropia_cruzada":
+            if self.backend == "numpy":
+                return entropia_cruzada_np(self.logits, np.asarray(y, dtype=float))
+            return entropia_cruzada(self.logits, y)
+        if self.backend == "numpy":
+            return float(np.sum((np.asarray(y, dtype=float) - out) ** 2))
+        return sum((y[i] - out[i]) ** 2 for i in range(self.n_outputs))
+
+    def gradientes_lote(self, X, Y):
+        #! Calcula los gradientes sumados sobre un lote SIN modificar los pesos
+        #! Retorna ((gradientes de pesos por capa, gradientes de sesgos por capa), error total del lote)
+        #! Con "mse" los gradientes son de 1/2 * error cuadrático: restar lr * g equivale a `backward`
+        
+        if self.backend == "numpy":
+            return self._gradientes_lote_np(X, Y)
+        
+        g_pesos = [[[0.0] * len(fila) for fila in W] for W in self.pesos]
+        g_sesgos = [[0.0] * len(b) for b in self.sesgos]
+        total_loss = 0.0
+        
+        for x, y in zip(X, Y):
+            out = self.forward(x)
+            total_loss += self._perdida_muestra(out, y)
+            
+            #! Mismos deltas que en `backward`, pero acumulados en vez de aplicados
+            deltas = self._deltas(self.salidas_capas, y)
+            for l, delta in enumerate(deltas):
+                entrada = self.salidas_capas[l]
+                g_W, g_b = g_pesos[l], g_sesgos[l]
+                for i in range(len(delta)):
+                    fila = g_W[i]
+                    for j in range(len(entrada)):
+                        fila[j] -= delta[i] * entrada[j]
+                    g_b[i] -= delta[i]
+        
+        return (g_pesos, g_sesgos), total_loss
+
+    def _gradientes_lote_np(self, X, Y):
+        #! Versión vectorizada: todo el lote se propaga como una matriz (B x n_inputs)
+        X = np.asarray(X, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        
+        salidas, logits = self._propagar_np(X, con_logits=True)
+        deltas = self._deltas(salidas, Y)
+        
+        g_pesos = [-(delta.T @ entrada) for delta, entrada in zip(deltas, salidas)]
+        g_sesgos = [-delta.sum(axis=0) for delta in deltas]
+        if self.perdida == "entropia_cruzada":
+            loss = entropia_cruzada_np(logits, Y)
+        else:
+            loss = float(np.sum((Y - salidas[-1]) ** 2))
+        return (g_pesos, g_sesgos), loss
+
+    def parametros(self):
+        #! Lista plana de parámetros: pesos y sesgos de cada capa, en orden
+        parametros = []
+        for W, b in zip(self.pesos, self.sesgos):
+            parametros.extend([W, b])
+        return parametros
+
+    def aplicar_gradientes(self, gradientes):
+        #! Actualiza los parámetros con el optimizador de la red
+        g_pesos, g_sesgos = gradientes
+        
+        if isinstance(self.optimizador, SGD):
+            #! Descenso de gradiente clásico: parámetro -= lr * gradiente, en el lugar
+            if self.backend == "numpy":
+                for l in range(len(self.pesos)):
+                    self.pesos[l] -= self.lr * g_pesos[l]
+                    self.sesgos[l] -= self.lr * g_sesgos[l]
+                return
+            
+            for W, b, g_W, g_b in zip(self.pesos, self.sesgos, g_pesos, g_sesgos):
+                for i in range(len(W)):
+                    fila, g_fila = W[i], g_W[i]
+                    for j in range(len(fila)):
+                        fila[j] -= self.lr * g_fila[j]
+                    b[i] -= self.lr * g_b[i]
+            return
+        
+        planos = []
+        for g_W, g_b in zip(g_pesos, g_sesgos):
+            planos.extend([g_W, g_b])
+        nuevos = self.optimizador.paso(self.parametros(), planos, self.lr)
+        self.pesos = nuevos[0::2]
+        self.sesgos = nuevos[1::2]
+
     def predict(self, x):
         #! Predicción: retorna el índice de la neurona de salida con mayor activación
-        out = self.forward(x)
-        #! Argmax: índice del valor máximo
-        return max(range(len(out)), key=lambda i: out[i])
+        return self.predict_confianza(x)[0]
+
+    #*==================== INFERENCIA SIN ESTADO ===================
+    #* Estos métodos no escriben nada en la instancia (ni inputs, ni h, ni o)
+    #* Se pueden llamar en paralelo y permiten evaluar muchos vectores a la vez
+
+    def normalizar_entrada(self, x):
+        #! Aplica a un vector de características crudas la normalización del entrenamiento
+        #! Sin normalización guardada retorna `x` tal cual
+        if self.normalizacion is None:
+            return x
+        minimos, rangos = self.normalizacion
+        return [(v - m) / r for v, m, r in zip(x, minimos, rangos)]
+
+    def _propagar_np(self, X, con_logits=False):
+        #! Propaga una matriz (N x n_inputs) capa por capa
+        #! Retorna la salida de cada capa, entrada incluida (y los logits finales si se piden)
+        salidas = [X]
+        for W, b, nombre in zip(self.pesos, self.sesgos, self.activaciones):
+            z = salidas[-1] @ W.T + b
+            salidas.append(activar_np(nombre, z))
+        if con_logits:
+            return salidas, z
+        return salidas
+
+    def predict_proba(self, X):
+        #! Propaga una matriz de N vectores y retorna sus N vectores de salida
+        #! Con NumPy retorna un arreglo (N x n_outputs); sin NumPy, listas
+        
+        if self.backend == "numpy":
+            return self._propagar_np(np.asarray(X, dtype=float))[-1]
+        
+        return [self._propagar_muestra(x)[0] for x in X]
+
+    def _propagar_muestra(self, x):
+        #! Propaga un vector con listas y retorna (salida, logits de la última capa)
+        entrada = x
+        for W, b, nombre in zip(self.pesos, self.sesgos, self.activaciones):
+            z = [sum(w * xi for w, xi in zip(fila, entrada)) + bi for fila, bi in zip(W, b)]
+            entrada = activar(nombre, z)
+        return entrada, z
+
+    def perdida_lote(self, X, Y):
+        #! Error total de un lote solo con la propagación hacia adelante
+        #! Para validar: no calcula gradientes ni escribe en la instancia
+        if self.backend == "numpy":
+            Y = np.asarray(Y, dtype=float)
+            salidas, logits = self._propagar_np(np.asarray(X, dtype=float), con_logits=True)
+            if self.perdida == "entropia_cruzada":
+                return entropia_cruzada_np(logits, Y)
+            return float(np.sum((Y - salidas[-1]) ** 2))
+        
+        total_loss = 0.0
+        for x, y in zip(X, Y):
+            out, logits = self._propagar_muestra(x)
+            if self.perdida == "entropia_cruzada":
+                total_loss += entropia_cruzada(logits, y)
+            else:
+                total_loss += sum((yi - oi) ** 2 for yi, oi in zip(y, out))
+        return total_loss
+
+    def predict_batch(self, X):
+        #! Clasifica N vectores en una sola llamada
+        #! Retorna (índices de clase, salidas de la red) para todo el lote
+        
+        probas = self.predict_proba(X)
+        if self.backend == "numpy":
+            return np.argmax(probas, axis=1).tolist(), probas
+        indices = [max(range(len(o)), key=lambda i: o[i]) for o in probas]
+        return indices, probas
+
+    def predict_confianza(self, x):
+        #! Clase predicha y su confianza (activación de esa salida) en una sola pasada
+        #! Evita tener que llamar a predict y luego a forward con el mismo vector
+        
+        indices, probas = self.predict_batch([x])
+        idx = indices[0]
+        return idx, float(probas[0][idx])
+    
+    def copiar(self):
+        #! Retorna una copia independiente del modelo (pesos, backend y generador)
+        #! Entrenar la copia no afecta al original: base del copy-on-write
+        return copy.deepcopy(self)
     
     #*==================== PERSISTENCIA DEL MODELO ===================
     
-    def guardar(self, archivo="modelo_mlp.json"):
-        #! Guarda los pesos y la arquitectura en un archivo JSON
-        #! Permite cargar el modelo ya entrenado sin necesidad de re-entrenar
-        
-        modelo = {
+    def a_diccionario(self):
+        #! Representación serializable del modelo (formato versionado)
+        return {
+            'version': VERSION_FORMATO,
             'arquitectura': {
                 'n_inputs': self.n_inputs,
                 'n_hidden': self.n_hidden,
                 'n_outputs': self.n_outputs,
+                'activaciones': self.activaciones,
+                'perdida': self.perdida,
                 'lr': self.lr
             },
-            'pesos': {
-                'w1': self.w1,
-                'b1': self.b1,
-                'w2': self.w2,
-                'b2': self.b2
-            }
+            'pesos': self.pesos_como_listas(),
+            'optimizador': self.optimizador.a_diccionario(),
+            'etiquetas': self.etiquetas,
+            'normalizacion': normalizacion_a_diccionario(self.normalizacion)
         }
+    
+    @classmethod
+    def desde_diccionario(cls, modelo, backend="python"):
+        #! Reconstruye un modelo desde `a_diccionario`
+        #! Los archivos sin 'version' (formato 1) son la red de una capa oculta con sigmoid
+        version = modelo.get('version', 1)
+        if version > VERSION_FORMATO:
+            raise ValueError(f"Formato de modelo v{version} no soportado (máximo v{VERSION_FORMATO})")
+        
+        #! Crear instancia con la arquitectura guardada
+        arq = modelo['arquitectura']
+        mlp = cls(
+            n_inputs=arq['n_inputs'],
+            n_hidden=arq['n_hidden'],
+            n_outputs=arq['n_outputs'],
+            lr=arq['lr'],
+            backend=backend,
+            activaciones=arq.get('activaciones'),
+            perdida=arq.get('perdida', 'mse'),
+            inicializar_pesos=False
+        )
+        mlp.etiquetas = modelo.get('etiquetas')
+        mlp.normalizacion = normalizacion_desde_diccionario(modelo.get('normalizacion'))
+        
+        #! Cargar los pesos entrenados y, si existe, el estado del optimizador
+        mlp.cargar_pesos(modelo['pesos'])
+        if 'optimizador' in modelo:
+            mlp.optimizador = optimizador_desde_diccionario(modelo['optimizador'], backend)
+        return mlp
+    
+    def guardar(self, archivo="modelo_mlp.json", dtype="float64"):
+        #! Guarda los pesos y la arquitectura en un archivo JSON
+        #! Permite cargar el modelo ya entrenado sin necesidad de re-entrenar
+        #! Con extensión .mlpb usa el formato binario (ver formato_binario.py);
+        #! `dtype` ("float64" o "float32") solo aplica a ese formato
         
         try:
+            if archivo.endswith(formato_binario.EXTENSION_BINARIA):
+                formato_binario.guardar_binario(self, archivo, dtype=dtype)
+                return True
             with open(archivo, 'w') as f:
-                json.dump(modelo, f, indent=2)
+                json.dump(self.a_diccionario(), f, indent=2)
             return True
         except Exception as e:
             print(f"Error al guardar modelo: {e}")
             return False
     
     @classmethod
-    def cargar(cls, archivo="modelo_mlp.json"):
+    def cargar(cls, archivo="modelo_mlp.json", backend="python"):
         #! Carga un modelo previamente guardado
         #! Retorna una instancia de MLP con pesos inicializados
+        #! El mismo archivo sirve para cualquier backend
+        #! Detecta el formato binario por su número mágico (con "numpy" se mapea en memoria)
         
         try:
+            if formato_binario.es_binario(archivo):
+                return formato_binario.cargar_binario(archivo, backend=backend)
             with open(archivo, 'r') as f:
                 modelo = json.load(f)
             
-            #! Crear instancia con la arquitectura guardada
-            arq = modelo['arquitectura']
-            mlp = cls(
-                n_inputs=arq['n_inputs'],
-                n_hidden=arq['n_hidden'],
-                n_outputs=arq['n_outputs'],
-                lr=arq['lr']
-            )
-            
-            #! Cargar los pesos entrenados
-            pesos = modelo['pesos']
-            mlp.w1 = pesos['w1']
-            mlp.b1 = pesos['b1']
-            mlp.w2 = pesos['w2']
-            mlp.b2 = pesos['b2']
-            
-            return mlp
+            return cls.desde_diccionario(modelo, backend=backend)
         
         except FileNotFoundError:
             print(f"Archivo '{archivo}' no encontrado.")
@@ -225,6 +628,21 @@ def existe_modelo_guardado(archivo="modelo_mlp.json"):
     return os.path.exists(archivo)
 
 
+def normalizacion_a_diccionario(normalizacion):
+    #! (mínimos, rangos) -> forma serializable (None si no hay)
+    if normalizacion is None:
+        return None
+    minimos, rangos = normalizacion
+    return {'minimos': [float(m) for m in minimos], 'rangos': [float(r) for r in rangos]}
+
+
+def normalizacion_desde_diccionario(datos):
+    #! Inversa de normalizacion_a_diccionario (los modelos antiguos no la tienen)
+    if not datos:
+        return None
+    return list(datos['minimos']), list(datos['rangos'])
+
+
 
 
 
@@ -0,0 +1,65 @@
+#* ===== MODELO COMPARTIDO ENTRE HILOS =====
+#* Permite servir una sola MLP a muchas peticiones concurrentes (Flask con hilos)
+#* mientras se aplican correcciones en segundo plano.
+#*
+#* Estrategia copy-on-write:
+#*   - La inferencia siempre usa una "foto" del modelo que nunca se modifica
+#*   - Una corrección entrena una COPIA y al terminar reemplaza la foto
+#*   - Reemplazar la referencia es atómico: nadie ve pesos a medio actualizar
+#*
+#* Las peticiones traen características crudas (analizar_codigo): se normalizan
+#* con los mínimos y rangos guardados en la propia foto (mlp.normalizacion),
+#* los mismos con los que se entrenó, antes de predecir o de corregir.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ModeloCompartido:
+    #! Envoltorio thread-safe de una MLP
+    #! Lecturas sin bloqueo; escrituras serializadas con un lock
+
+    def __init__(self, mlp):
+        self._mlp = mlp
+        self._lock_escritura = threading.Lock()
+        #! Un único hilo de fondo: las correcciones se aplican en orden
+        self._ejecutor = ThreadPoolExecutor(max_workers=1)
+        self.version = 0
+
+    @property
+    def mlp(self):
+        #! Foto actual del modelo: NO debe modificarse directamente
+        return self._mlp
+
+    #*==================== INFERENCIA (REENTRANTE) ===================
+
+    def predict_confianza(self, x):
+        #! Usa la inferencia sin estado sobre la foto vigente (x sin normalizar)
+        mlp = self._mlp
+        return mlp.predict_confianza(mlp.normalizar_entrada(x))
+
+    def predict_batch(self, X):
+        #! Igual que predict_confianza para una lista de vectores sin normalizar
+        mlp = self._mlp
+        return mlp.predict_batch([mlp.normalizar_entrada(x) for x in X])
+
+    #*==================== ACTUALIZACIÓN (COPY-ON-WRITE) ===================
+
+    def actualizar(self, entrenar):
+        #! Aplica `entrenar(mlp)` sobre una copia y publica el resultado
+        #! Las peticiones en curso siguen usando la foto anterior hasta terminar
+        with self._lock_escritura:
+            copia = self._mlp.copiar()
+            entrenar(copia)
+            self._mlp = copia
+            self.version += 1
+            return copia
+
+    def actualizar_en_segundo_plano(self, entrenar):
+        #! Igual que `actualizar`, pero sin bloquear a quien lo llama
+        #! Retorna un Future para consultar cuándo terminó
+        return self._ejecutor.submit(self.actualizar, entrenar)
+
+    def guardar(self, archivo="modelo_mlp.json"):
+        #! Guarda la foto vigente (consistente aunque haya una corrección en curso)
+        return self._mlp.guardar(archivo)
@@ -0,0 +1,215 @@
+#* ===== OPTIMIZADORES PARA EL ENTRENAMIENTO DE LA MLP =====
+#* Reglas de actualización de pesos a partir de los gradientes:
+#*   - SGD: descenso de gradiente clásico (el comportamiento original)
+#*   - Momentum / Nesterov: acumulan una "velocidad" para avanzar más rápido
+#*   - RMSProp: adapta el paso de cada peso según la magnitud de sus gradientes
+#*   - Adam: combina momentum y RMSProp con corrección de sesgo
+#*
+#* Funcionan igual con el backend "python" (listas) y "numpy" (arreglos):
+#* las fórmulas solo usan aritmética, así que se aplican elemento a elemento
+#* sobre listas anidadas o directamente sobre arreglos completos.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+#*==================== UTILIDADES ELEMENTO A ELEMENTO ===================
+
+def _mapear(fn, *valores):
+    #! Aplica fn elemento a elemento recorriendo listas anidadas
+    #! Con arreglos de NumPy (o escalares) se llama a fn una sola vez
+    if isinstance(valores[0], list):
+        return [_mapear(fn, *elementos) for elementos in zip(*valores)]
+    return fn(*valores)
+
+
+def _ceros_como(valor):
+    #! Crea una estructura de ceros con la misma forma que `valor`
+    if isinstance(valor, list):
+        return [_ceros_como(v) for v in valor]
+    if np is not None and isinstance(valor, np.ndarray):
+        return np.zeros_like(valor)
+    return 0.0
+
+
+def _a_listas(valor):
+    #! Convierte arreglos a listas para poder guardarlos en JSON
+    if isinstance(valor, list):
+        return [_a_listas(v) for v in valor]
+    if np is not None and isinstance(valor, np.ndarray):
+        return valor.tolist()
+    return valor
+
+
+def _desde_listas(valor, backend):
+    #! Inverso de _a_listas: con el backend NumPy cada parámetro vuelve a ser un arreglo
+    #! `valor` es una lista con un elemento por parámetro de la red
+    if backend == "numpy":
+        return [np.array(v, dtype=float) for v in valor]
+    return valor
+
+
+#*==================== CLASE BASE ===================
+
+class Optimizador:
+    #! Recibe la lista de parámetros de la red (pesos y sesgos de cada capa)
+    #! junto con sus gradientes y retorna los parámetros actualizados
+    #! El estado interno (velocidades, promedios) se guarda junto al modelo
+
+    nombre = None
+
+    def __init__(self):
+        self.estado = {}
+
+    def hiperparametros(self):
+        #! Parámetros del constructor, para reconstruir el optimizador al cargar
+        return {}
+
+    def paso(self, parametros, gradientes, lr):
+        raise NotImplementedError
+
+    def _estado_para(self, clave, parametros):
+        #! Retorna (y crea con ceros si hace falta) un buffer de estado por parámetro
+        if clave not in self.estado:
+            self.estado[clave] = [_ceros_como(p) for p in parametros]
+        return self.estado[clave]
+
+    def a_diccionario(self):
+        #! Representación serializable: nombre, hiperparámetros y estado
+        return {
+            'nombre': self.nombre,
+            'hiperparametros': self.hiperparametros(),
+            'estado': {clave: _a_listas(valor) for clave, valor in self.estado.items()}
+        }
+
+    def cargar_estado(self, estado, backend="python"):
+        #! Restaura el estado guardado; los contadores (como `t`) quedan como números
+        self.estado = {
+            clave: _desde_listas(valor, backend) if isinstance(valor, list) else valor
+            for clave, valor in estado.items()
+        }
+
+
+#*==================== OPTIMIZADORES ===================
+
+class SGD(Optimizador):
+    #! Descenso de gradiente estocástico: p = p - lr * g
+
+    nombre = 'sgd'
+
+    def paso(self, parametros, gradientes, lr):
+        return [_mapear(lambda p, g: p - lr * g, p, g) for p, g in zip(parametros, gradientes)]
+
+
+class Momentum(Optimizador):
+    #! SGD con momentum: v = beta * v + g ; p = p - lr * v
+    #! Con nesterov=True el paso "mira hacia adelante": p = p - lr * (g + beta * v)
+
+    nombre = 'momentum'
+
+    def __init__(self, beta=0.9, nesterov=False):
+        super().__init__()
+        self.beta = beta
+        self.nesterov = nesterov
+
+    def hiperparametros(self):
+        return {'beta': self.beta, 'nesterov': self.nesterov}
+
+    def paso(self, parametros, gradientes, lr):
+        beta = self.beta
+        velocidades = self._estado_para('v', parametros)
+        nuevos = []
+        for k, (p, g) in enumerate(zip(parametros, gradientes)):
+            v = _mapear(lambda v, g: beta * v + g, velocidades[k], g)
+            velocidades[k] = v
+            if self.nesterov:
+                nuevos.append(_mapear(lambda p, g, v: p - lr * (g + beta * v), p, g, v))
+            else:
+                nuevos.append(_mapear(lambda p, v: p - lr * v, p, v))
+        return nuevos
+
+
+class RMSProp(Optimizador):
+    #! Divide el paso por la raíz del promedio móvil de g^2
+    #! Pesos con gradientes grandes avanzan con cautela y los pequeños más rápido
+
+    nombre = 'rmsprop'
+
+    def __init__(self, rho=0.9, eps=1e-8):
+        super().__init__()
+        self.rho = rho
+        self.eps = eps
+
+    def hiperparametros(self):
+        return {'rho': self.rho, 'eps': self.eps}
+
+    def paso(self, parametros, gradientes, lr):
+        rho, eps = self.rho, self.eps
+        cuadrados = self._estado_para('s', parametros)
+        nuevos = []
+        for k, (p, g) in enumerate(zip(parametros, gradientes)):
+            s = _mapear(lambda s, g: rho * s + (1 - rho) * g * g, cuadrados[k], g)
+            cuadrados[k] = s
+            nuevos.append(_mapear(lambda p, g, s: p - lr * g / (s ** 0.5 + eps), p, g, s))
+        return nuevos
+
+
+class Adam(Optimizador):
+    #! Adam: promedios móviles del gradiente (m) y de su cuadrado (v)
+    #! con corrección de sesgo para los primeros pasos
+
+    nombre = 'adam'
+
+    def __init__(self, beta1=0.9, beta2=0.999, eps=1e-8):
+        super().__init__()
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+
+    def hiperparametros(self):
+        return {'beta1': self.beta1, 'beta2': self.beta2, 'eps': self.eps}
+
+    def paso(self, parametros, gradientes, lr):
+        beta1, beta2, eps = self.beta1, self.beta2, self.eps
+        primeros = self._estado_para('m', parametros)
+        segundos = self._estado_para('v', parametros)
+        self.estado['t'] = t = self.estado.get('t', 0) + 1
+        #! Corrección de sesgo incluida en el tamaño de paso
+        lr_t = lr * (1 - beta2 ** t) ** 0.5 / (1 - beta1 ** t)
+
+        nuevos = []
+        for k, (p, g) in enumerate(zip(parametros, gradientes)):
+            m = _mapear(lambda m, g: beta1 * m + (1 - beta1) * g, primeros[k], g)
+            v = _mapear(lambda v, g: beta2 * v + (1 - beta2) * g * g, segundos[k], g)
+            primeros[k], segundos[k] = m, v
+            nuevos.append(_mapear(lambda p, m, v: p - lr_t * m / (v ** 0.5 + eps), p, m, v))
+        return nuevos
+
+
+#*==================== REGISTRO ===================
+
+OPTIMIZADORES = {
+    'sgd': SGD,
+    'momentum': Momentum,
+    'rmsprop': RMSProp,
+    'adam': Adam,
+}
+
+
+def crear_optimizador(nombre, **hiperparametros):
+    #! Crea un optimizador por nombre; 'nesterov' es momentum con nesterov=True
+    if nombre == 'nesterov':
+        return Momentum(nesterov=True, **hiperparametros)
+    if nombre not in OPTIMIZADORES:
+        opciones = list(OPTIMIZADORES) + ['nesterov']
+        raise ValueError(f"Optimizador desconocido: {nombre!r} (opciones: {opciones})")
+    return OPTIMIZADORES[nombre](**hiperparametros)
+
+
+def optimizador_desde_diccionario(datos, backend="python"):
+    #! Reconstruye un optimizador guardado con `a_diccionario`, estado incluido
+    optimizador = crear_optimizador(datos['nombre'], **datos.get('hiperparametros', {}))
+    optimizador.cargar_estado(datos.get('estado', {}), backend)
+    return optimizador
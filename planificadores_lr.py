@@ -0,0 +1,156 @@
+#* ===== PLANIFICADORES DEL LEARNING RATE =====
+#* Un learning rate fijo obliga a elegirlo a mano. Aquí se incluyen:
+#*   - Planificadores que cambian el lr según la época:
+#*       escalonado, exponencial, coseno y coseno con reinicios (SGDR)
+#*   - Un buscador de lr (LR range test): prueba lrs crecientes durante unos
+#*     cientos de pasos sobre el dataset y sugiere uno razonable
+
+import math
+
+
+#*==================== PLANIFICADORES ===================
+#* Todos se llaman con la época (desde 0) y retornan el lr a usar en esa época
+
+class EscalonadoLR:
+    #! Multiplica el lr por `factor` cada `cada` épocas
+    #! Ej: lr=0.1, cada=100, factor=0.5 -> 0.1, ..., 0.05 (época 100), 0.025 (época 200)
+
+    def __init__(self, lr_inicial, cada=100, factor=0.5):
+        self.lr_inicial = lr_inicial
+        self.cada = cada
+        self.factor = factor
+
+    def __call__(self, epoca):
+        return self.lr_inicial * self.factor ** (epoca // self.cada)
+
+
+class ExponencialLR:
+    #! Decae el lr de forma continua: lr_inicial * gamma^epoca
+
+    def __init__(self, lr_inicial, gamma=0.99):
+        self.lr_inicial = lr_inicial
+        self.gamma = gamma
+
+    def __call__(self, epoca):
+        return self.lr_inicial * self.gamma ** epoca
+
+
+class CosenoLR:
+    #! Baja el lr siguiendo medio coseno desde lr_inicial hasta lr_min en `epocas`
+    #! Pasado ese punto se mantiene en lr_min
+
+    def __init__(self, lr_inicial, epocas, lr_min=0.0):
+        self.lr_inicial = lr_inicial
+        self.epocas = epocas
+        self.lr_min = lr_min
+
+    def __call__(self, epoca):
+        progreso = min(epoca, self.epocas) / self.epocas
+        return self.lr_min + (self.lr_inicial - self.lr_min) * (1 + math.cos(math.pi * progreso)) / 2
+
+
+class ReiniciosCosenoLR:
+    #! Coseno con reinicios en caliente (SGDR): al terminar cada ciclo el lr vuelve
+    #! a lr_inicial; cada ciclo dura `multiplicador` veces más que el anterior
+
+    def __init__(self, lr_inicial, periodo=50, multiplicador=1, lr_min=0.0):
+        self.lr_inicial = lr_inicial
+        self.periodo = periodo
+        self.multiplicador = multiplicador
+        self.lr_min = lr_min
+
+    def __call__(self, epoca):
+        #! Ubica la época dentro de su ciclo
+        periodo = self.periodo
+        while epoca >= periodo:
+            epoca -= periodo
+            periodo *= self.multiplicador
+        progreso = epoca / periodo
+        return self.lr_min + (self.lr_inicial - self.lr_min) * (1 + math.cos(math.pi * progreso)) / 2
+
+
+PLANIFICADORES = {
+    'escalonado': EscalonadoLR,
+    'exponencial': ExponencialLR,
+    'coseno': CosenoLR,
+    'reinicios': ReiniciosCosenoLR,
+}
+
+
+def crear_planificador(nombre, lr_inicial, **parametros):
+    #! Crea un planificador por nombre
+    if nombre not in PLANIFICADORES:
+        raise ValueError(f"Planificador desconocido: {nombre!r} (opciones: {list(PLANIFICADORES)})")
+    return PLANIFICADORES[nombre](lr_inicial, **parametros)
+
+
+#*==================== BUSCADOR DE LEARNING RATE ===================
+
+def buscar_lr(mlp, X, Y, lr_min=1e-5, lr_max=10.0, n_pasos=200, batch_size=16, suavizado=0.98):
+    #! LR range test: entrena una COPIA del modelo subiendo el lr exponencialmente
+    #! de lr_min a lr_max (un mini-batch por paso) y registra el loss suavizado.
+    #! Se detiene si el loss se dispara (4 veces el mejor visto).
+    #! Sugerencia: el lr donde el loss baja más rápido (pendiente más negativa
+    #! respecto a log(lr)); si no hay curva suficiente, el lr del menor loss / 10.
+    #! Retorna (lr sugerido, historial de (lr, loss suavizado))
+
+    copia = mlp.copiar()
+    factor = (lr_max / lr_min) ** (1 / max(n_pasos - 1, 1))
+
+    indices = list(range(len(X)))
+    copia.rng_datos.shuffle(indices)
+    posicion = 0
+
+    historial = []
+    promedio = 0.0
+    mejor_loss = float("inf")
+    mejor_lr = lr_min
+    lr = lr_min
+
+    for paso in range(1, n_pasos + 1):
+        #! Siguiente mini-batch, recorriendo el dataset de forma circular
+        if posicion + batch_size > len(indices):
+            copia.rng_datos.shuffle(indices)
+            posicion = 0
+        lote = indices[posicion:posicion + batch_size]
+        posicion += batch_size
+
+        copia.lr = lr
+        gradientes, loss = copia.gradientes_lote([X[k] for k in lote], [Y[k] for k in lote])
+        copia.aplicar_gradientes(gradientes)
+
+        #! Promedio móvil con corrección de sesgo para que la curva no sea ruidosa
+        loss = loss / len(lote)
+        promedio = suavizado * promedio + (1 - suavizado) * loss
+        loss_suave = promedio / (1 - suavizado ** paso)
+
+        if not math.isfinite(loss_suave) or loss_suave > 4 * mejor_loss:
+            break
+        historial.append((lr, loss_suave))
+        if loss_suave < mejor_loss:
+            mejor_loss = loss_suave
+            mejor_lr = lr
+
+        lr *= factor
+
+    return _sugerir_lr(historial, mejor_lr), historial
+
+
+def _sugerir_lr(historial, mejor_lr):
+    #! Busca el tramo de la curva con la bajada más pronunciada
+    #! Compara puntos separados por una ventana para no reaccionar al ruido
+    ventana = max(1, len(historial) // 20)
+    if len(historial) <= ventana:
+        return mejor_lr / 10
+
+    mejor_pendiente = 0.0
+    sugerido = mejor_lr / 10
+    for i in range(len(historial) - ventana):
+        lr_a, loss_a = historial[i]
+        lr_b, loss_b = historial[i + ventana]
+        pendiente = (loss_b - loss_a) / (math.log(lr_b) - math.log(lr_a))
+        if pendiente < mejor_pendiente:
+            mejor_pendiente = pendiente
+            #! Punto medio (geométrico) del tramo
+            sugerido = math.sqrt(lr_a * lr_b)
+    return sugerido
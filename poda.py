@@ -0,0 +1,337 @@
+#* ===== PODA POR MAGNITUD E INFERENCIA DISPERSA =====
+#* Muchos pesos de la primera capa son casi cero y varias características
+#* valen 0 en casi todas las muestras. La poda:
+#*   - Pone a cero, en cada capa, la fracción de pesos de menor |w|
+#*   - Opcionalmente afina la red podada unas épocas manteniendo a cero los
+#*     pesos podados (la máscara se vuelve a aplicar tras cada lote)
+#*   - Elimina las neuronas ocultas muertas:
+#*       * sin pesos de salida: no aportan nada
+#*       * sin pesos de entrada, o (con datos) con salida constante en todo el
+#*         dataset: su aporte constante se suma a los sesgos de la capa siguiente
+#* MLPDispersa guarda cada fila de pesos solo con sus entradas distintas de
+#* cero (índices + valores) y predice desde ese formato, como MLPCuantizada
+#* (misma interfaz de predicción sin estado). Sin NumPy recorre solo los pares
+#* (índice, valor); con NumPy multiplica matrices compactadas a las columnas
+#* usadas. Se guarda y se carga en JSON sin pasar por la matriz densa, con la
+#* normalización del modelo: normalizar_entrada prepara las características crudas como MLP.
+#* El predictor de exportar_predictor.py también omite los pesos nulos:
+#* exportar la red podada da un módulo más corto y más rápido.
+#*
+#* Ejecutar: python poda.py [modelo] [fraccion] [--sin-ajuste]
+
+import os
+import sys
+import json
+import time
+from activaciones import activar, activar_np
+from crecimiento import red_con_pesos, copiar_pesos
+from mlp import normalizacion_a_diccionario, normalizacion_desde_diccionario
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+#! Fracciones de pesos podados que compara el informe de la línea de comandos
+FRACCIONES_INFORME = (0.25, 0.5, 0.75, 0.9)
+
+
+#*==================== PODA ===================
+
+def mascaras_por_magnitud(pesos, fraccion):
+    #! Por capa, máscara (listas de bool) que conserva los pesos de mayor |w|
+    #! y descarta `fraccion` de ellos (los ya nulos cuentan como los más pequeños)
+    mascaras = []
+    for W in pesos:
+        posiciones = [(i, j) for i in range(len(W)) for j in range(len(W[i]))]
+        posiciones.sort(key=lambda p: abs(W[p[0]][p[1]]))
+        mascara = [[True] * len(fila) for fila in W]
+        for i, j in posiciones[:int(len(posiciones) * fraccion)]:
+            mascara[i][j] = False
+        mascaras.append(mascara)
+    return mascaras
+
+
+def aplicar_mascaras(mlp, mascaras):
+    #! Pone a cero en el sitio los pesos descartados por las máscaras
+    for l, mascara in enumerate(mascaras):
+        if mlp.backend == "numpy":
+            mlp.pesos[l] = mlp.pesos[l] * np.asarray(mascara, dtype=float)
+            continue
+        for fila, fila_mascara in zip(mlp.pesos[l], mascara):
+            for j, conservar in enumerate(fila_mascara):
+                if not conservar:
+                    fila[j] = 0.0
+
+
+def ajustar_con_mascaras(mlp, mascaras, X, Y, epochs=50, batch_size=16):
+    #! Afina la red podada con mini-batches barajados sin reactivar los pesos podados
+    #! Retorna el error promedio de la última época
+    for _ in range(epochs):
+        indices = list(range(len(X)))
+        mlp.rng_datos.shuffle(indices)
+        total_loss = 0.0
+        for inicio in range(0, len(indices), batch_size):
+            lote = indices[inicio:inicio + batch_size]
+            gradientes, loss = mlp.gradientes_lote([X[k] for k in lote], [Y[k] for k in lote])
+            mlp.aplicar_gradientes(gradientes)
+            aplicar_mascaras(mlp, mascaras)
+            total_loss += loss
+    return total_loss / len(X)
+
+
+def _salidas_capa(W, b, nombre, entradas):
+    return [activar(nombre, [sum(w * x for w, x in zip(fila, entrada)) + bi for fila, bi in zip(W, b)])
+            for entrada in entradas]
+
+
+def eliminar_unidades_muertas(mlp, X=None, tolerancia=1e-6):
+    #! Retorna una red sin las neuronas ocultas muertas y el número de neuronas eliminadas
+    #! Con X también se eliminan las neuronas cuya salida varía menos de `tolerancia`
+    #! en todo X (su valor medio pasa a los sesgos de la capa siguiente)
+    #! Cada capa conserva al menos una neurona
+    pesos, sesgos = copiar_pesos(mlp)
+    entradas = [list(map(float, x)) for x in X] if X is not None else None
+    eliminadas = 0
+    for l in range(len(pesos) - 1):
+        W, b, W_sig, b_sig = pesos[l], sesgos[l], pesos[l + 1], sesgos[l + 1]
+        salidas = _salidas_capa(W, b, mlp.activaciones[l], entradas) if entradas is not None else None
+        conservar = []
+        for j in range(len(W)):
+            if all(fila[j] == 0.0 for fila in W_sig):
+                continue
+            if all(w == 0.0 for w in W[j]):
+                constante = activar(mlp.activaciones[l], [b[j]])[0]
+            elif salidas is not None and max(s[j] for s in salidas) - min(s[j] for s in salidas) < tolerancia:
+                constante = sum(s[j] for s in salidas) / len(salidas)
+            else:
+                conservar.append(j)
+                continue
+            for i, fila in enumerate(W_sig):
+                b_sig[i] += fila[j] * constante
+        if not conservar:
+            conservar = [0]
+        eliminadas += len(W) - len(conservar)
+        pesos[l] = [W[j] for j in conservar]
+        sesgos[l] = [b[j] for j in conservar]
+        pesos[l + 1] = [[fila[j] for j in conservar] for fila in W_sig]
+        if salidas is not None:
+            entradas = [[s[j] for j in conservar] for s in salidas]
+
+    ocultas = [len(W) for W in pesos[:-1]]
+    return red_con_pesos(mlp, ocultas, mlp.activaciones, pesos, sesgos), eliminadas
+
+
+def podar(mlp, fraccion=0.5, X=None, Y=None, epochs_ajuste=0, batch_size=16):
+    #! Retorna una copia podada de `mlp` (densa, con ceros y sin neuronas muertas)
+    #! fraccion: proporción de pesos descartados en cada capa
+    #! X, Y: datos para el ajuste fino (epochs_ajuste > 0) y para detectar neuronas constantes
+    #! El modelo original no se modifica
+    pesos, sesgos = copiar_pesos(mlp)
+    mascaras = mascaras_por_magnitud(pesos, fraccion)
+    podada = red_con_pesos(mlp, [len(W) for W in pesos[:-1]], mlp.activaciones, pesos, sesgos)
+    aplicar_mascaras(podada, mascaras)
+    if epochs_ajuste > 0 and X is not None:
+        ajustar_con_mascaras(podada, mascaras, X, Y, epochs_ajuste, batch_size)
+    podada, _ = eliminar_unidades_muertas(podada, X)
+    return podada
+
+
+#*==================== INFERENCIA DISPERSA ===================
+
+class MLPDispersa:
+    #! Versión de solo inferencia de una MLP con las filas de pesos dispersas
+    #! capas: por capa, (n_entradas, filas, sesgos) con filas = [(índices, valores), ...]
+    #! Ofrece la misma interfaz de predicción sin estado que MLP
+    #! (predict, predict_proba, predict_batch, predict_confianza, normalizar_entrada)
+    #! normalizacion: (mínimos, rangos) del entrenamiento, como MLP.normalizacion
+
+    def __init__(self, capas, activaciones, etiquetas=None, backend="python", normalizacion=None):
+        self.backend = backend
+        self.activaciones = list(activaciones)
+        self.etiquetas = etiquetas
+        self.normalizacion = normalizacion
+        self.capas = [capas[0][0]] + [len(filas) for _, filas, _ in capas]
+        self.n_outputs = self.capas[-1]
+        self.filas = [[(list(indices), list(valores)) for indices, valores in filas] for _, filas, _ in capas]
+        self.sesgos = [list(b) for _, _, b in capas]
+
+        if backend == "numpy":
+            #! Con NumPy un producto disperso elemento a elemento (CSR, reduceat) es más
+            #! lento que BLAS a estos tamaños: cada capa se compacta a una matriz densa
+            #! solo con las columnas que usa alguna fila (características y neuronas
+            #! sin ningún peso desaparecen del producto)
+            self.compactas = []
+            for n_entradas, filas, b in zip(self.capas, self.filas, self.sesgos):
+                columnas = sorted({j for indices, _ in filas for j in indices})
+                posicion = {j: k for k, j in enumerate(columnas)}
+                W = np.zeros((len(filas), len(columnas)))
+                for i, (indices, valores) in enumerate(filas):
+                    for j, w in zip(indices, valores):
+                        W[i, posicion[j]] = w
+                seleccion = None if len(columnas) == n_entradas else np.array(columnas, dtype=np.intp)
+                self.compactas.append((seleccion, W, np.asarray(b, dtype=float)))
+        else:
+            #! Pares (índice, valor) por fila, recorridos sin zip en el bucle interno
+            self.pares = [[tuple(zip(indices, valores)) for indices, valores in filas] for filas in self.filas]
+
+    def normalizar_entrada(self, x):
+        #! Misma normalización que MLP.normalizar_entrada (sin normalización retorna `x`)
+        if self.normalizacion is None:
+            return x
+        minimos, rangos = self.normalizacion
+        return [(v - m) / r for v, m, r in zip(x, minimos, rangos)]
+
+    def n_pesos(self):
+        #! Pesos almacenados (distintos de cero)
+        return sum(len(indices) for filas in self.filas for indices, _ in filas)
+
+    def predict_proba(self, X):
+        #! Propaga una matriz de N vectores y retorna sus N vectores de salida
+        if self.backend == "numpy":
+            salida = np.asarray(X, dtype=float)
+            for (seleccion, W, b), nombre in zip(self.compactas, self.activaciones):
+                if seleccion is not None:
+                    salida = salida[:, seleccion]
+                salida = activar_np(nombre, salida @ W.T + b)
+            return salida
+
+        salidas = []
+        for x in X:
+            entrada = x
+            for pares, b, nombre in zip(self.pares, self.sesgos, self.activaciones):
+                z = [sum(w * entrada[j] for j, w in fila) + bi for fila, bi in zip(pares, b)]
+                entrada = activar(nombre, z)
+            salidas.append(entrada)
+        return salidas
+
+    def predict_batch(self, X):
+        #! Retorna (índices de clase, salidas de la red) para todo el lote
+        probas = self.predict_proba(X)
+        if self.backend == "numpy":
+            return np.argmax(probas, axis=1).tolist(), probas
+        indices = [max(range(len(o)), key=lambda i: o[i]) for o in probas]
+        return indices, probas
+
+    def predict_confianza(self, x):
+        indices, probas = self.predict_batch([x])
+        idx = indices[0]
+        return idx, float(probas[0][idx])
+
+    def predict(self, x):
+        return self.predict_confianza(x)[0]
+
+    #*==================== PERSISTENCIA ===================
+
+    def a_diccionario(self):
+        return {
+            'formato': 'mlp_dispersa',
+            'activaciones': self.activaciones,
+            'etiquetas': self.etiquetas,
+            'normalizacion': normalizacion_a_diccionario(self.normalizacion),
+            'capas': [{'n_entradas': n, 'indices': [indices for indices, _ in filas],
+                       'valores': [valores for _, valores in filas], 'b': b}
+                      for n, filas, b in zip(self.capas[:-1], self.filas, self.sesgos)]
+        }
+
+    @classmethod
+    def desde_diccionario(cls, datos, backend="python"):
+        capas = [(c['n_entradas'], list(zip(c['indices'], c['valores'])), c['b']) for c in datos['capas']]
+        return cls(capas, datos['activaciones'], datos.get('etiquetas'), backend,
+                   normalizacion_desde_diccionario(datos.get('normalizacion')))
+
+    def guardar(self, archivo="modelo_mlp_disperso.json"):
+        temporal = archivo + ".tmp"
+        with open(temporal, 'w') as f:
+            json.dump(self.a_diccionario(), f)
+        os.replace(temporal, archivo)
+        return True
+
+    @classmethod
+    def cargar(cls, archivo="modelo_mlp_disperso.json", backend="python"):
+        with open(archivo, 'r') as f:
+            return cls.desde_diccionario(json.load(f), backend)
+
+
+def dispersar(mlp):
+    #! MLPDispersa con los pesos distintos de cero de `mlp`; el original no se modifica
+    pesos, sesgos = copiar_pesos(mlp)
+    capas = []
+    for W, b in zip(pesos, sesgos):
+        filas = [([j for j, w in enumerate(fila) if w != 0.0], [w for w in fila if w != 0.0]) for fila in W]
+        capas.append((len(W[0]), filas, b))
+    return MLPDispersa(capas, mlp.activaciones, mlp.etiquetas, mlp.backend, mlp.normalizacion)
+
+
+#*==================== MEDICIONES ===================
+
+def _latencia(modelo, X, repeticiones):
+    #! Microsegundos por predicción de un vector
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for x in X:
+            modelo.predict(x)
+    return (time.perf_counter() - inicio) / (repeticiones * len(X)) * 1e6
+
+
+def evaluar_poda(mlp, dispersa, X, Y, repeticiones=20):
+    #! Compara la red densa con su versión podada dispersa sobre (X, Y) en one-hot
+    #! Retorna accuracy de ambas, pesos de cada una, arquitectura podada y
+    #! latencia de una predicción (µs)
+    def acc(modelo):
+        indices, _ = modelo.predict_batch(X)
+        return sum(1 for pred, y in zip(indices, Y) if y[pred] == max(y)) / len(X)
+
+    return {
+        'accuracy_densa': acc(mlp),
+        'accuracy_dispersa': acc(dispersa),
+        'pesos_densa': sum(len(W) * len(W[0]) for W in mlp.pesos),
+        'pesos_dispersa': dispersa.n_pesos(),
+        'capas_dispersa': list(dispersa.capas),
+        'latencia_densa': _latencia(mlp, X, repeticiones),
+        'latencia_dispersa': _latencia(dispersa, X, repeticiones)
+    }
+
+
+if __name__ == "__main__":
+    #! Uso: python poda.py [modelo] [fraccion] [--sin-ajuste]
+    #! Muestra la relación accuracy/latencia para varias fracciones de poda y guarda
+    #! la red podada con `fraccion` (0.5 por defecto) en modelo_mlp_disperso.json
+    from mlp import MLP, BACKEND_PREFERIDO
+    from entrenamiento_combinado import load_data_combinado, parametros_normalizacion, one_hot
+
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    modelo = argumentos[0] if argumentos else ("modelo_mlp.mlpb" if os.path.exists("modelo_mlp.mlpb")
+                                               else "modelo_mlp.json")
+    fraccion = float(argumentos[1]) if len(argumentos) > 1 else 0.5
+    epochs_ajuste = 0 if "--sin-ajuste" in sys.argv else 50
+
+    X, Y_idx = load_data_combinado()
+    Y = [one_hot(i, 4) for i in Y_idx]
+    mlp = MLP.cargar(modelo, backend=BACKEND_PREFERIDO)
+    if mlp is None:
+        #! MLP.cargar ya mostró el motivo (archivo inexistente, corrupto, un ensemble...)
+        print(f"No se pudo cargar el modelo '{modelo}'; entrénalo primero con main.py")
+        sys.exit(1)
+    #! Ajuste y evaluación en la escala con la que predice el modelo (la guarda la red
+    #! dispersa); los modelos anteriores a guardarla la toman del recursos.csv actual
+    if mlp.normalizacion is None:
+        mlp.normalizacion = parametros_normalizacion(X)
+    X = [mlp.normalizar_entrada(x) for x in X]
+
+    print(f"\nPoda de '{modelo}' ({' -> '.join(map(str, mlp.capas))}, backend {mlp.backend}, "
+          f"ajuste fino: {epochs_ajuste} épocas)")
+    print(f"  {'fracción':>8} | {'arquitectura':>14} | {'pesos':>9} | {'accuracy':>17} | {'latencia (µs)':>17}")
+    elegida = None
+    for f in sorted(set(FRACCIONES_INFORME) | {fraccion}):
+        podada = podar(mlp, f, X, Y, epochs_ajuste)
+        dispersa = dispersar(podada)
+        r = evaluar_poda(mlp, dispersa, X, Y)
+        print(f"  {f:8.2f} | {' -> '.join(map(str, r['capas_dispersa'])):>14} | "
+              f"{r['pesos_dispersa']:4d}/{r['pesos_densa']:<4d} | "
+              f"{r['accuracy_densa']:7.2%} -> {r['accuracy_dispersa']:7.2%} | "
+              f"{r['latencia_densa']:6.1f} -> {r['latencia_dispersa']:6.1f}")
+        if f == fraccion:
+            elegida = dispersa
+    elegida.guardar()
+    print(f"\nRed podada ({fraccion:.0%} de los pesos) guardada en 'modelo_mlp_disperso.json'")
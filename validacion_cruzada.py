@@ -0,0 +1,193 @@
+#* ===== VALIDACIÓN CRUZADA ESTRATIFICADA (K-FOLD) =====
+#* La accuracy medida sobre el mismo dataset de entrenamiento no dice cuánto
+#* generaliza la red. Aquí el dataset se parte en k pliegues; cada pliegue se
+#* evalúa con una red entrenada en los k-1 restantes.
+#*   - Estratificado: cada pliegue mantiene la proporción de clases
+#*   - Agrupado por algoritmo (opcional): todas las muestras de un mismo
+#*     algoritmo caen en el mismo pliegue. Como todas comparten las mismas
+#*     características de código, separarlas en entrenamiento y prueba
+#*     mediría memoria, no generalización a algoritmos nuevos.
+#*   - La normalización se ajusta solo con el pliegue de entrenamiento
+#*   - Cada pliegue se entrena en su propio proceso
+#*   - Métricas agregadas por clase: precisión, recall, F1 y matriz de confusión
+#*
+#* Ejecutar: python validacion_cruzada.py
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from mlp import MLP, BACKEND_PREFERIDO
+from entrenador import entrenar_con_parada_temprana
+from entrenamiento_combinado import parametros_normalizacion
+
+
+#*==================== PLIEGUES ===================
+
+def pliegues_estratificados(Y_idx, k=5, grupos=None, seed=0):
+    #! Reparte los índices de las muestras en k pliegues (listas de índices de prueba)
+    #! Sin grupos: las muestras de cada clase se barajan y se reparten por turnos
+    #! Con grupos (ej. nombre del algoritmo): se reparten grupos enteros, cada uno al
+    #! pliegue con menos muestras de su clase (a igualdad, el de menos muestras en total)
+    rng = random.Random(seed)
+    if grupos is None:
+        grupos = list(range(len(Y_idx)))
+
+    #! Índices de cada grupo; la clase de un grupo es la de su primera muestra
+    miembros = {}
+    for i, g in enumerate(grupos):
+        miembros.setdefault(g, []).append(i)
+    n_grupos = len(miembros)
+    if k > n_grupos:
+        raise ValueError(f"No se pueden formar {k} pliegues con {n_grupos} grupos")
+
+    orden = list(miembros)
+    rng.shuffle(orden)
+    #! Grupos grandes primero: el reparto queda más equilibrado
+    orden.sort(key=lambda g: len(miembros[g]), reverse=True)
+
+    pliegues = [[] for _ in range(k)]
+    por_clase = [{} for _ in range(k)]
+    for g in orden:
+        clase = Y_idx[miembros[g][0]]
+        destino = min(range(k), key=lambda f: (por_clase[f].get(clase, 0), len(pliegues[f])))
+        pliegues[destino].extend(miembros[g])
+        por_clase[destino][clase] = por_clase[destino].get(clase, 0) + len(miembros[g])
+    return [sorted(p) for p in pliegues]
+
+
+def _normalizar(X_ent, X_prueba):
+    #! Escala cada característica a [0, 1] con el mínimo y el rango del entrenamiento
+    #! (los mismos parámetros que normalize y el modelo servido, sin mirar los datos de prueba)
+    minimos, rangos = parametros_normalizacion(X_ent)
+
+    def escalar(X):
+        return [[(v - m) / r for v, m, r in zip(x, minimos, rangos)] for x in X]
+
+    return escalar(X_ent), escalar(X_prueba)
+
+
+#*==================== ENTRENAMIENTO DE UN PLIEGUE ===================
+
+def _evaluar_pliegue(X, Y_idx, prueba, n_clases, configuracion, opciones):
+    #! Entrena con todo lo que no está en `prueba` y predice `prueba`
+    #! Se ejecuta en un proceso del pool; retorna (índices de prueba, predicciones)
+    en_prueba = set(prueba)
+    entrenamiento = [i for i in range(len(X)) if i not in en_prueba]
+    X_ent, X_prueba = _normalizar([X[i] for i in entrenamiento], [X[i] for i in prueba])
+    Y_ent = [[1 if c == Y_idx[i] else 0 for c in range(n_clases)] for i in entrenamiento]
+
+    mlp = MLP(**configuracion)
+    entrenar_con_parada_temprana(mlp, X_ent, Y_ent, **opciones)
+    predicciones, _ = mlp.predict_batch(X_prueba)
+    return prueba, predicciones
+
+
+#*==================== VALIDACIÓN CRUZADA ===================
+
+def validacion_cruzada(X, Y_idx, k=5, grupos=None, configuracion=None, procesos=None, seed=0, **opciones):
+    #! Ejecuta la validación cruzada y agrega las métricas
+    #! Args:
+    #!   X: características SIN normalizar (cada pliegue se normaliza con su entrenamiento)
+    #!   Y_idx: índice de clase de cada muestra
+    #!   grupos: etiqueta de grupo por muestra (ej. nombre del algoritmo) o None
+    #!   configuracion: argumentos de MLP (n_inputs y n_outputs se deducen si faltan)
+    #!   procesos: tamaño del pool (por defecto, uno por núcleo y como máximo k)
+    #!   opciones: se pasan a entrenar_con_parada_temprana
+    #! Retorna un diccionario con accuracy global, accuracy por pliegue, métricas
+    #! por clase, matriz de confusión (filas = real, columnas = predicho) y predicciones
+    n_clases = max(Y_idx) + 1
+    configuracion = dict(configuracion or {})
+    configuracion.setdefault('n_inputs', len(X[0]))
+    configuracion.setdefault('n_outputs', n_clases)
+    configuracion.setdefault('n_hidden', 16)
+    configuracion.setdefault('backend', BACKEND_PREFERIDO)
+
+    pliegues = pliegues_estratificados(Y_idx, k, grupos, seed)
+    if procesos is None:
+        procesos = min(k, os.cpu_count() or 1)
+    argumentos = [(X, Y_idx, prueba, n_clases, configuracion, opciones) for prueba in pliegues]
+
+    if procesos <= 1:
+        resultados = [_evaluar_pliegue(*a) for a in argumentos]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(_evaluar_pliegue, *zip(*argumentos)))
+
+    predicciones = [None] * len(X)
+    accuracy_pliegues = []
+    for prueba, predichas in resultados:
+        aciertos = 0
+        for i, pred in zip(prueba, predichas):
+            predicciones[i] = pred
+            aciertos += pred == Y_idx[i]
+        accuracy_pliegues.append(aciertos / len(prueba))
+
+    return dict(metricas(Y_idx, predicciones, n_clases),
+                accuracy_pliegues=accuracy_pliegues,
+                pliegues=pliegues,
+                predicciones=predicciones)
+
+
+def metricas(Y_idx, predicciones, n_clases):
+    #! Accuracy, matriz de confusión y precisión / recall / F1 / soporte por clase
+    confusion = [[0] * n_clases for _ in range(n_clases)]
+    for real, pred in zip(Y_idx, predicciones):
+        confusion[real][pred] += 1
+
+    por_clase = []
+    for c in range(n_clases):
+        verdaderos = confusion[c][c]
+        soporte = sum(confusion[c])
+        predichos = sum(fila[c] for fila in confusion)
+        precision = verdaderos / predichos if predichos else 0.0
+        recall = verdaderos / soporte if soporte else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        por_clase.append({'precision': precision, 'recall': recall, 'f1': f1, 'soporte': soporte})
+
+    return {
+        'accuracy': sum(confusion[c][c] for c in range(n_clases)) / len(Y_idx),
+        'por_clase': por_clase,
+        'confusion': confusion
+    }
+
+
+def mostrar_resultados(resultado, nombres_clases, titulo="VALIDACIÓN CRUZADA"):
+    #! Imprime el resumen de validacion_cruzada
+    print("\n" + "="*70)
+    print(titulo.center(70))
+    print("="*70)
+
+    pliegues = resultado['accuracy_pliegues']
+    media = sum(pliegues) / len(pliegues)
+    desviacion = (sum((a - media) ** 2 for a in pliegues) / len(pliegues)) ** 0.5
+    print(f"\n Accuracy global: {resultado['accuracy']:.2%}")
+    print(f" Por pliegue: {' '.join(f'{a:.0%}' for a in pliegues)} (media {media:.2%} ± {desviacion:.2%})")
+
+    print(f"\n {'Clase':12s} {'Precisión':>10s} {'Recall':>8s} {'F1':>8s} {'Soporte':>8s}")
+    for c, m in enumerate(resultado['por_clase']):
+        print(f" {nombres_clases[c]:12s} {m['precision']:10.2%} {m['recall']:8.2%} {m['f1']:8.2%} {m['soporte']:8d}")
+
+    print("\n Matriz de confusión (filas = real, columnas = predicho):")
+    print(" " + " " * 12 + "".join(f"{nombres_clases[c]:>12s}" for c in range(len(nombres_clases))))
+    for c, fila in enumerate(resultado['confusion']):
+        print(f" {nombres_clases[c]:12s}" + "".join(f"{v:12d}" for v in fila))
+
+
+if __name__ == "__main__":
+    from entrenamiento_combinado import load_data_combinado, mapeo_inv
+
+    #! Características ya extraídas por load_data_combinado (una vez por algoritmo)
+    X, Y_idx, nombres = load_data_combinado(con_nombres=True)
+    nombres_clases = [mapeo_inv[c] for c in range(len(mapeo_inv))]
+
+    configuracion = dict(n_hidden=16, lr=0.01, optimizador="adam", perdida="entropia_cruzada")
+    opciones = dict(max_epochs=500, batch_size=16, shuffle=True, paciencia=20, min_delta=1e-5)
+
+    resultado = validacion_cruzada(X, Y_idx, k=5, configuracion=configuracion, **opciones)
+    mostrar_resultados(resultado, nombres_clases, "5-FOLD ESTRATIFICADO POR CLASE")
+
+    #! Algoritmos nunca vistos: la medida honesta para código nuevo
+    resultado = validacion_cruzada(X, Y_idx, k=5, grupos=nombres, configuracion=configuracion, **opciones)
+    mostrar_resultados(resultado, nombres_clases, "5-FOLD ESTRATIFICADO POR CLASE Y ALGORITMO")
+    print("\n Con agrupación, una clase con un solo algoritmo queda fuera del")
+    print(" entrenamiento en su pliegue: su recall mide si se reconoce sin haberla visto.")